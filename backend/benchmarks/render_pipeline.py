@@ -0,0 +1,248 @@
+"""Microbenchmarks for the contract rendering pipeline.
+
+Times each stage of generate_contract (docx read, mammoth conversion, variable
+extraction, substitution, base64 encoding, compression, file write) and the
+end-to-end path through build_contract, cold and with the render caches warm,
+on the templates in uploads/templates and on synthetic large templates. Reports median time and peak traced memory per stage and compares
+against a stored baseline.
+
+    python benchmarks/render_pipeline.py
+    python benchmarks/render_pipeline.py --update-baseline
+    python benchmarks/render_pipeline.py --fail-on-regression --tolerance 0.25
+"""
+import argparse
+import base64
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+import server  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "render_baseline.json"
+STAGES = [
+    "read", "convert", "convert_cached", "extract", "substitute", "encode", "compress", "write",
+    "end_to_end", "end_to_end_cached",
+]
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def synthetic_docx(variable_count: int, paragraphs: int) -> bytes:
+    # Minimal docx: every paragraph mixes filler text with a few placeholders
+    filler = "Le prestataire s'engage a executer la mission conformement aux conditions generales. "
+    body = []
+    for i in range(paragraphs):
+        placeholder = " ".join(f"{{{{Var{(i * 3 + j) % variable_count}}}}}" for j in range(3))
+        body.append(f'<w:p><w:r><w:t xml:space="preserve">{filler * 2}{placeholder}</w:t></w:r></w:p>')
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", CONTENT_TYPES)
+        docx.writestr("_rels/.rels", ROOT_RELS)
+        docx.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def measure(func, repeat: int):
+    # Median wall time over the repeats, then one extra run under tracemalloc for peak memory.
+    # The collector is paused while timing, as timeit does, so collections triggered by
+    # earlier stages are not billed to this one
+    timings = []
+    result = None
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"median_ms": statistics.median(timings) * 1000, "min_ms": min(timings) * 1000, "peak_kb": peak / 1024}
+
+
+def clear_render_caches():
+    server._convert_docx_file.cache_clear()
+    server._render_contract_cached.cache_clear()
+
+
+def bench_template(path: Path, repeat: int):
+    encoding = server.CONTRACT_COMPRESSION if server.CONTRACT_COMPRESSION in server.CONTENT_ENCODING_SUFFIXES else None
+    key = str(path)
+    results = {}
+
+    data, results["read"] = measure(lambda: server.storage.read_bytes(key), repeat)
+
+    def convert_cold():
+        clear_render_caches()
+        return server.convert_template_to_html(key)
+
+    html_content, results["convert"] = measure(convert_cold, repeat)
+    _, results["convert_cached"] = measure(lambda: server.convert_template_to_html(key), repeat)
+    variables, results["extract"] = measure(lambda: server.extract_variables(html_content), repeat)
+    values = {name: f"Value for {name}" for name in variables}
+    rendered, results["substitute"] = measure(lambda: server.substitute_variables(html_content, values), repeat)
+    _, results["encode"] = measure(lambda: base64.b64encode(rendered.encode()).decode(), repeat)
+    if encoding:
+        stored, results["compress"] = measure(lambda: server.compress_content(rendered.encode(), encoding), repeat)
+    else:
+        stored = rendered.encode()
+    _, results["write"] = measure(lambda: server.storage.write_bytes(f"contracts/{path.stem}.html", stored), repeat)
+
+    # generate_contract without the database, through the same function and caches
+    version = {"file_path": key, "version": 1}
+
+    def end_to_end_cold():
+        clear_render_caches()
+        return server.build_contract("bench-supplier", "bench-template", version, values)
+
+    _, results["end_to_end"] = measure(end_to_end_cold, repeat)
+    _, results["end_to_end_cached"] = measure(
+        lambda: server.build_contract("bench-supplier", "bench-template", version, values), repeat
+    )
+    return results, {"bytes": len(data), "variables": len(variables), "html_bytes": len(html_content)}
+
+
+def compare(results, baseline, tolerance: float, min_ms: float):
+    # Ratios of the fastest run against the baseline's, which is far less sensitive to
+    # scheduler noise than the median; stages faster than min_ms never regress
+    ratios, regressions = {}, []
+    for name, stages in results.items():
+        for stage, figures in stages.items():
+            reference = baseline.get(name, {}).get(stage)
+            if not reference:
+                continue
+            ratio = figures["min_ms"] / reference["min_ms"] if reference["min_ms"] else 1.0
+            ratios[name, stage] = ratio
+            if ratio > 1 + tolerance and max(figures["min_ms"], reference["min_ms"]) >= min_ms:
+                regressions.append((name, stage, ratio))
+    return ratios, regressions
+
+
+def print_report(results, info, ratios):
+    header = f"{'template':<44} {'stage':<18} {'median ms':>10} {'min ms':>9} {'peak KiB':>10} {'min vs base':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, stages in results.items():
+        label = f"{name[:32]} ({info[name]['variables']} vars)"
+        for stage in STAGES:
+            figures = stages.get(stage)
+            if not figures:
+                continue
+            ratio = f"{ratios[name, stage]:.2f}x" if (name, stage) in ratios else "-"
+            print(f"{label:<44} {stage:<18} {figures['median_ms']:>10.2f} {figures['min_ms']:>9.2f} {figures['peak_kb']:>10.1f} {ratio:>12}")
+            label = ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--templates-dir", type=Path, default=BACKEND_DIR / "uploads" / "templates")
+    parser.add_argument("--synthetic", default="200x500,2000x5000",
+                        help="Synthetic templates as VARIABLESxPARAGRAPHS, comma separated")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before a stage is a regression")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Stages faster than this are not compared")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", type=Path, help="Also write the raw results to this file")
+    args = parser.parse_args()
+
+    results, info = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        # Contract files land in the temporary directory; template paths are absolute
+        server.storage = server.LocalStorage(tmp_dir)
+        samples = sorted(args.templates_dir.glob("*.docx")) if args.templates_dir.exists() else []
+        for spec in filter(None, args.synthetic.split(",")):
+            variable_count, paragraphs = (int(part) for part in spec.lower().split("x"))
+            path = tmp_dir / f"synthetic_{variable_count}v_{paragraphs}p.docx"
+            path.write_bytes(synthetic_docx(variable_count, paragraphs))
+            samples.append(path)
+
+        seen = set()
+        for path in samples:
+            # The same template is often uploaded several times: bench each content once
+            digest = server.hash_content(path.read_bytes())
+            if digest in seen:
+                continue
+            seen.add(digest)
+            # Upload names are prefixed with a uuid; strip it so baselines match across machines
+            name = path.name.split("_", 1)[1] if path.parent == args.templates_dir and "_" in path.name else path.name
+            if name in results:
+                name = f"{Path(name).stem}-{digest[:8]}{Path(name).suffix}"
+            try:
+                results[name], info[name] = bench_template(path, args.repeat)
+            except Exception as e:
+                print(f"Skipping {path.name}: {e}", file=sys.stderr)
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = stored.get("results", {})
+    if stored and (stored.get("python"), stored.get("machine")) != (platform.python_version(), platform.machine()):
+        print(f"Baseline was recorded on Python {stored.get('python')} / {stored.get('machine')}; "
+              "ratios are only meaningful on the same machine", file=sys.stderr)
+    ratios, regressions = compare(results, baseline, args.tolerance, args.min_ms)
+    print_report(results, info, ratios)
+
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "compression": server.CONTRACT_COMPRESSION,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(payload, indent=2))
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(payload, indent=2))
+        print(f"\nBaseline written to {args.baseline}")
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for name, stage, ratio in regressions:
+            print(f"  {name} / {stage}: {ratio:.2f}x")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
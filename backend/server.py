@@ -1,9 +1,9 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, UploadFile, Form, Body
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, UploadFile, Form, Body, Request, Response, BackgroundTasks
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, RedirectResponse
 from starlette.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from motor.motor_asyncio import AsyncIOMotorClient
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, ValidationError
 from typing import List, Optional, Dict, Any, Union
 from dotenv import load_dotenv
 from pathlib import Path
@@ -15,8 +15,36 @@ import re
 import json
 import io
 import base64
+import hashlib
+import zlib
+import gzip
+import csv
+import tempfile
+import asyncio
+import threading
+import time
+import importlib
+import itertools
+import ipaddress
+import socket
+import zipfile
+import multiprocessing
+import smtplib
+import queue
+from email.message import EmailMessage
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from datetime import datetime, timedelta
 import mammoth
+import pandas as pd
+import numpy as np
+from pymongo import monitoring, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError, OperationFailure
+from bson import json_util
+from template_conversion import convert_template_bytes, extract_variables
 import jwt
 from passlib.context import CryptContext
 
@@ -24,20 +52,584 @@ from passlib.context import CryptContext
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Identifies this process when several uvicorn workers share the database
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+STARTUP_LOCK_TTL_SECONDS = int(os.environ.get("STARTUP_LOCK_TTL_SECONDS", "60"))
+
+# Slow query monitoring
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "100"))
+SLOW_QUERY_MAX_ENTRIES = int(os.environ.get("SLOW_QUERY_MAX_ENTRIES", "500"))
+SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN", "false").lower() in ("1", "true", "yes")
+
+def redact_query_shape(value: Any) -> Any:
+    # Keep field names and operators, drop the values they are compared against
+    if isinstance(value, dict):
+        return {key: redact_query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact_query_shape(item) for item in value[:1]]
+    return "?"
+
+def find_plan_stages(plan: Any) -> List[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stage = plan["stage"]
+            if plan.get("indexName"):
+                stage = f"{stage}({plan['indexName']})"
+            stages.append(stage)
+        for item in plan.values():
+            stages.extend(find_plan_stages(item))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(find_plan_stages(item))
+    return stages
+
+# Records MongoDB commands slower than the threshold, grouped by redacted filter shape
+class SlowQueryRecorder(monitoring.CommandListener):
+
+    WATCHED_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+    def __init__(self, threshold_ms: float, max_entries: int, explain: bool = False):
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, tuple] = {}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loop = None
+        self._explainer = None
+
+    def attach(self, loop, explainer):
+        # Explains run on the event loop, never inside the pymongo callback thread
+        self._loop = loop
+        self._explainer = explainer
+
+    def started(self, event):
+        if event.command_name not in self.WATCHED_COMMANDS:
+            return
+        with self._lock:
+            self._inflight[(event.connection_id, event.request_id)] = (
+                event.database_name, event.command_name, dict(event.command)
+            )
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        with self._lock:
+            started = self._inflight.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        duration_ms = event.duration_micros / 1000.0
+        if duration_ms < self.threshold_ms:
+            return
+        database_name, command_name, command = started
+        self.record(database_name, command_name, command, duration_ms)
+
+    @staticmethod
+    def command_shape(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+        if command_name == "find":
+            return {"filter": redact_query_shape(command.get("filter", {})), "sort": command.get("sort")}
+        if command_name == "aggregate":
+            return {"pipeline": [redact_query_shape(stage) for stage in command.get("pipeline", [])]}
+        if command_name == "count":
+            return {"filter": redact_query_shape(command.get("query", {}))}
+        if command_name == "distinct":
+            return {"key": command.get("key"), "filter": redact_query_shape(command.get("query", {}))}
+        if command_name == "update":
+            updates = command.get("updates", [])
+            return {"filter": redact_query_shape(updates[0].get("q", {})) if updates else {}}
+        if command_name == "delete":
+            deletes = command.get("deletes", [])
+            return {"filter": redact_query_shape(deletes[0].get("q", {})) if deletes else {}}
+        if command_name == "findAndModify":
+            return {"filter": redact_query_shape(command.get("query", {})), "sort": command.get("sort")}
+        return {}
+
+    def record(self, database_name: str, command_name: str, command: Dict[str, Any], duration_ms: float):
+        namespace = f"{database_name}.{command.get(command_name)}"
+        shape = self.command_shape(command_name, command)
+        key = json.dumps([namespace, command_name, shape], sort_keys=True, default=str)
+        now = datetime.utcnow()
+        first_sighting = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                first_sighting = True
+                entry = {
+                    "worker": WORKER_ID,
+                    "namespace": namespace,
+                    "command": command_name,
+                    "shape": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "first_seen": now,
+                    "collscan": None,
+                    "plan": None,
+                }
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["last_ms"] = duration_ms
+            entry["last_seen"] = now
+        logging.getLogger(__name__).warning(
+            f"Slow query ({duration_ms:.1f} ms) on {namespace}: {command_name} {json.dumps(shape, default=str)}"
+        )
+        if first_sighting and self.explain and self._loop is not None:
+            explain_command = {
+                k: v for k, v in command.items()
+                if not k.startswith("$") and k not in ("lsid", "txnNumber")
+            }
+            if command_name in ("update", "delete"):
+                statements = "updates" if command_name == "update" else "deletes"
+                explain_command[statements] = explain_command.get(statements, [])[:1]
+            self._loop.call_soon_threadsafe(
+                lambda: spawn(self._explainer(key, database_name, explain_command))
+            )
+
+    def set_plan(self, key: str, stages: List[str]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["plan"] = stages
+                entry["collscan"] = "COLLSCAN" in stages
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+slow_query_recorder = SlowQueryRecorder(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_MAX_ENTRIES, SLOW_QUERY_EXPLAIN)
+
+# Identifier storage: "string" keeps 36-character strings, "binary" stores BSON binary
+# UUIDs (16 bytes), "dual" writes binary but matches both forms while the migration
+# converts existing documents. The API always sees canonical strings.
+ID_STORAGE = os.environ.get("ID_STORAGE", "string")
+ID_FIELDS = {"id", "supplier_id", "template_id", "gc_id", "user_id", "entity_id", "actor_id", "document_type_id"}
+
+def to_binary_id(value: Any) -> Any:
+    # Only the canonical lowercase form converts: decoding always yields that form,
+    # so anything else (uppercase, no hyphens, braces) stays a plain string and
+    # matches exactly what it would match under ID_STORAGE=string
+    if isinstance(value, str) and len(value) == 36:
+        try:
+            parsed = uuid.UUID(value)
+        except ValueError:
+            return value
+        return parsed if str(parsed) == value else value
+    return value
+
+def id_forms(value: Any, match_both: bool) -> List[Any]:
+    binary = to_binary_id(value)
+    if match_both and binary is not value:
+        return [binary, value]
+    return [binary]
+
+def encode_id_field(value: Any, match_both: bool) -> Any:
+    if isinstance(value, dict):
+        encoded = {}
+        for operator, operand in value.items():
+            if operator in ("$in", "$nin") and isinstance(operand, list):
+                encoded[operator] = [form for item in operand for form in id_forms(item, match_both)]
+            elif operator in ("$eq", "$ne"):
+                forms = id_forms(operand, match_both)
+                if len(forms) > 1:
+                    encoded["$in" if operator == "$eq" else "$nin"] = forms
+                else:
+                    encoded[operator] = forms[0]
+            else:
+                encoded[operator] = operand
+        return encoded
+    if isinstance(value, list):
+        return [to_binary_id(item) for item in value]
+    forms = id_forms(value, match_both)
+    return forms[0] if len(forms) == 1 else {"$in": forms}
+
+def encode_ids(value: Any, match_both: bool = False) -> Any:
+    # Filters use match_both in "dual" mode; documents and updates never do
+    if isinstance(value, dict):
+        return {
+            key: encode_id_field(item, match_both) if key in ID_FIELDS else encode_ids(item, match_both)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [encode_ids(item, match_both) for item in value]
+    return value
+
+def decode_ids(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: decode_ids(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_ids(item) for item in value]
+    return value
+
+class IdCodecCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, *args):
+        self._cursor.skip(*args)
+        return self
+
+    def limit(self, *args):
+        self._cursor.limit(*args)
+        return self
+
+    async def to_list(self, length):
+        return [decode_ids(doc) for doc in await self._cursor.to_list(length)]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return decode_ids(await self._cursor.__anext__())
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class IdCodecChangeStream(IdCodecCursor):
+    async def __aenter__(self):
+        await self._cursor.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._cursor.__aexit__(*exc)
+
+# Converts id fields on the way in and out, so handlers keep working with strings
+class IdCodecCollection:
+    def __init__(self, collection, match_both: bool):
+        self._collection = collection
+        self._match_both = match_both
+
+    def _filter(self, query):
+        return encode_ids(query, self._match_both) if query else query
+
+    def find(self, filter=None, *args, **kwargs):
+        return IdCodecCursor(self._collection.find(self._filter(filter), *args, **kwargs))
+
+    async def find_one(self, filter=None, *args, **kwargs):
+        return decode_ids(await self._collection.find_one(self._filter(filter), *args, **kwargs))
+
+    async def find_one_and_update(self, filter, update, *args, **kwargs):
+        return decode_ids(await self._collection.find_one_and_update(self._filter(filter), encode_ids(update), *args, **kwargs))
+
+    async def find_one_and_delete(self, filter, *args, **kwargs):
+        return decode_ids(await self._collection.find_one_and_delete(self._filter(filter), *args, **kwargs))
+
+    async def insert_one(self, document, *args, **kwargs):
+        return await self._collection.insert_one(encode_ids(document), *args, **kwargs)
+
+    async def insert_many(self, documents, *args, **kwargs):
+        return await self._collection.insert_many([encode_ids(doc) for doc in documents], *args, **kwargs)
+
+    async def update_one(self, filter, update, *args, **kwargs):
+        return await self._collection.update_one(self._filter(filter), encode_ids(update), *args, **kwargs)
+
+    async def update_many(self, filter, update, *args, **kwargs):
+        return await self._collection.update_many(self._filter(filter), encode_ids(update), *args, **kwargs)
+
+    async def delete_one(self, filter, *args, **kwargs):
+        return await self._collection.delete_one(self._filter(filter), *args, **kwargs)
+
+    async def delete_many(self, filter, *args, **kwargs):
+        return await self._collection.delete_many(self._filter(filter), *args, **kwargs)
+
+    async def count_documents(self, filter, *args, **kwargs):
+        return await self._collection.count_documents(self._filter(filter), *args, **kwargs)
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        return IdCodecCursor(self._collection.aggregate(encode_ids(pipeline, self._match_both), *args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+class IdCodecDatabase:
+    def __init__(self, database, match_both: bool):
+        self._database = database
+        self._match_both = match_both
+        self._collections: Dict[str, IdCodecCollection] = {}
+
+    def __getitem__(self, name: str) -> IdCodecCollection:
+        if name not in self._collections:
+            self._collections[name] = IdCodecCollection(self._database[name], self._match_both)
+        return self._collections[name]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def watch(self, pipeline=None, *args, **kwargs):
+        return IdCodecChangeStream(self._database.watch(pipeline, *args, **kwargs))
+
 # Configure MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ.get('DB_NAME', 'prism_finance_db')]
+# Pool and timeouts sized per worker; wire compression trades a little CPU for smaller replies
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+# 0 means no socket timeout: exports, change streams and migrations legitimately
+# wait longer than any fixed value, and a timeout mid-reply poisons the connection
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get("MONGO_SOCKET_TIMEOUT_MS", "0"))
+# Comma separated, in order of preference: "zstd" (needs zstandard), "snappy" (needs python-snappy), "zlib"
+MONGO_COMPRESSORS = os.environ.get("MONGO_COMPRESSORS", "zstd,zlib")
+
+def mongo_client_options() -> Dict[str, Any]:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS or None,
+    }
+    # pymongo warns about and skips compressors whose library is missing; the server picks the first it supports
+    compressors = [name.strip() for name in MONGO_COMPRESSORS.split(",") if name.strip() and name.strip() != "none"]
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+# "standard" maps uuid.UUID to BSON binary subtype 4 and back
+client = AsyncIOMotorClient(
+    mongo_url,
+    uuidRepresentation="standard",
+    event_listeners=[slow_query_recorder],
+    **mongo_client_options()
+)
+raw_db = client[os.environ.get('DB_NAME', 'prism_finance_db')]
+db = raw_db if ID_STORAGE == "string" else IdCodecDatabase(raw_db, match_both=ID_STORAGE == "dual")
+
+async def require_uniform_ids():
+    # $lookup joins compare localField and foreignField as stored, so in "dual" mode
+    # they miss string ids joined against binary ones until the migration is complete
+    if ID_STORAGE != "dual":
+        return
+    state = await raw_db.migrations.find_one({"_id": ID_MIGRATION_ID}, {"status": 1})
+    if not state or state.get("status") != "complete":
+        raise HTTPException(
+            status_code=503,
+            detail="Unavailable while identifiers are migrated to binary, retry once the migration is complete",
+            headers={"Retry-After": "60"}
+        )
 
 # Create storage directories if they don't exist
 UPLOAD_DIR = ROOT_DIR / 'uploads'
 TEMPLATES_DIR = UPLOAD_DIR / 'templates'
 DOCUMENTS_DIR = UPLOAD_DIR / 'documents'
 CONTRACTS_DIR = UPLOAD_DIR / 'contracts'
+INVOICES_DIR = UPLOAD_DIR / 'invoices'
 
-for directory in [UPLOAD_DIR, TEMPLATES_DIR, DOCUMENTS_DIR, CONTRACTS_DIR]:
+for directory in [UPLOAD_DIR, TEMPLATES_DIR, DOCUMENTS_DIR, CONTRACTS_DIR, INVOICES_DIR]:
     directory.mkdir(exist_ok=True, parents=True)
 
+# Thread pool for blocking work outside admission classes (startup, background tasks, light routes)
+DOCUMENT_WORKERS = int(os.environ.get("DOCUMENT_WORKERS", "4"))
+document_executor: Optional[ThreadPoolExecutor] = None
+
+# Contract storage: "materialized" keeps the rendered HTML on disk and in Mongo,
+# "render" keeps only variables and the pinned template version and renders on read
+CONTRACT_STORAGE_MODE = os.environ.get("CONTRACT_STORAGE_MODE", "materialized")
+CONTRACT_SNAPSHOT_ON_SIGN = os.environ.get("CONTRACT_SNAPSHOT_ON_SIGN", "true").lower() in ("1", "true", "yes")
+# Materialized contract files are stored compressed: "gzip", "zstd" (needs zstandard) or "none"
+CONTRACT_COMPRESSION = os.environ.get("CONTRACT_COMPRESSION", "gzip")
+CONTRACT_COMPRESSION_LEVELS = {"gzip": 9, "zstd": 10}
+CONTENT_ENCODING_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# Bulk supplier import
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", "500"))
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+# Bulk template import from a zip archive, converted in a process pool
+TEMPLATE_IMPORT_PROCESSES = int(os.environ.get("TEMPLATE_IMPORT_PROCESSES", str(os.cpu_count() or 2)))
+TEMPLATE_IMPORT_MAX_FILES = int(os.environ.get("TEMPLATE_IMPORT_MAX_FILES", "500"))
+TEMPLATE_IMPORT_MAX_FILE_BYTES = int(os.environ.get("TEMPLATE_IMPORT_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+# Whole archive, uncompressed: every accepted entry is held in memory until it is stored
+TEMPLATE_IMPORT_MAX_TOTAL_BYTES = int(os.environ.get("TEMPLATE_IMPORT_MAX_TOTAL_BYTES", str(200 * 1024 * 1024)))
+
+# Accounting exports
+EXPORT_DEFAULT_BATCH_SIZE = 1000
+EXPORT_MAX_BATCH_SIZE = 10000
+
+# Server-sent events: "local" publishes from the handlers of this process and is only
+# correct with a single worker; "changestream" follows a Mongo change stream so every
+# worker sees every change (entrypoint.sh switches to it when UVICORN_WORKERS > 1)
+EVENT_SOURCE = os.environ.get("EVENT_SOURCE", "local")
+EVENT_QUEUE_SIZE = 100
+EVENT_HEARTBEAT_SECONDS = 15
+
+# Resumable uploads
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_SECONDS = int(os.environ.get("UPLOAD_SESSION_TTL_SECONDS", str(24 * 3600)))
+UPLOAD_CHUNK_LOCK_SECONDS = 300
+# A finalize that has not finished within this lease (crashed worker) goes back to open
+UPLOAD_FINALIZE_LOCK_SECONDS = 300
+UPLOAD_SWEEP_INTERVAL_SECONDS = int(os.environ.get("UPLOAD_SWEEP_INTERVAL_SECONDS", "600"))
+
+# File storage: "local" keeps files under UPLOAD_DIR, "s3" uses an S3-compatible bucket
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "local")
+S3_BUCKET = os.environ.get("S3_BUCKET")
+S3_PREFIX = os.environ.get("S3_PREFIX", "")
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")  # e.g. a local MinIO for testing
+S3_REGION = os.environ.get("S3_REGION")
+S3_PRESIGNED_DOWNLOADS = os.environ.get("S3_PRESIGNED_DOWNLOADS", "true").lower() in ("1", "true", "yes")
+S3_PRESIGN_EXPIRY_SECONDS = int(os.environ.get("S3_PRESIGN_EXPIRY_SECONDS", "300"))
+
+# Write-behind audit log
+AUDIT_QUEUE_SIZE = int(os.environ.get("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.environ.get("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+# Failed batches are retried with backoff, then spilled to disk and replayed on the next start
+AUDIT_WRITE_ATTEMPTS = int(os.environ.get("AUDIT_WRITE_ATTEMPTS", "5"))
+AUDIT_RETRY_BASE_SECONDS = float(os.environ.get("AUDIT_RETRY_BASE_SECONDS", "0.5"))
+AUDIT_SPILL_DIR = Path(os.environ.get("AUDIT_SPILL_DIR", str(ROOT_DIR / "audit_spill")))
+
+# Proxies whose X-Forwarded-For is trusted, as addresses or CIDR ranges; empty
+# means the header is ignored and the peer address is recorded
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(item.strip(), strict=False)
+    for item in os.environ.get("TRUSTED_PROXIES", "").split(",") if item.strip()
+]
+
+# Cash-flow forecast
+FORECAST_CACHE_SIZE = 64
+FORECAST_MAX_HORIZON_DAYS = 730
+
+# Upload layout: new files go to two levels of hash-prefix subdirectories
+UPLOAD_FANOUT = os.environ.get("UPLOAD_FANOUT", "true").lower() in ("1", "true", "yes")
+
+# Orphan file garbage collection; the periodic run is opt-in (0 disables it)
+ORPHAN_GC_INTERVAL_SECONDS = int(os.environ.get("ORPHAN_GC_INTERVAL_SECONDS", "0"))
+ORPHAN_GC_MIN_AGE_SECONDS = int(os.environ.get("ORPHAN_GC_MIN_AGE_SECONDS", "3600"))
+ORPHAN_GC_GRACE_SECONDS = int(os.environ.get("ORPHAN_GC_GRACE_SECONDS", str(24 * 3600)))
+ORPHAN_GC_BATCH_SIZE = int(os.environ.get("ORPHAN_GC_BATCH_SIZE", "500"))
+
+# Contract previews
+PREVIEW_CACHE_SIZE = int(os.environ.get("PREVIEW_CACHE_SIZE", "256"))
+
+# Admission control: per route class "concurrency:queue", requests beyond the
+# queue get a 429 and requests still queued after ADMISSION_WAIT_SECONDS a 503
+ADMISSION_LIMITS = os.environ.get("ADMISSION_LIMITS", "auth=8:32,render=4:8,upload=8:16,import=1:2")
+ADMISSION_WAIT_SECONDS = float(os.environ.get("ADMISSION_WAIT_SECONDS", "5"))
+ADMISSION_WAIT_SAMPLES = 1000
+
+# Supplier email notifications: outbox messages are always written with the domain
+# change, SMTP_HOST enables delivery (a local sink: python -m aiosmtpd -n -l localhost:1025)
+SMTP_HOST = os.environ.get("SMTP_HOST")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_USERNAME = os.environ.get("SMTP_USERNAME")
+SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD")
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes")
+SMTP_FROM = os.environ.get("SMTP_FROM", "noreply@prismfinance.com")
+SMTP_CONNECTIONS = int(os.environ.get("SMTP_CONNECTIONS", "2"))
+SMTP_TIMEOUT_SECONDS = 30
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_SECONDS = float(os.environ.get("OUTBOX_POLL_SECONDS", "5"))
+# Across all workers: send slots are handed out from one shared document
+OUTBOX_RATE_PER_SECOND = float(os.environ.get("OUTBOX_RATE_PER_SECOND", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_LEASE_SECONDS = 300
+# Multi-document transactions need a replica set: "auto" detects it at startup
+MONGO_TRANSACTIONS = os.environ.get("MONGO_TRANSACTIONS", "auto")
+
+# Startup warm-up configuration
+WARMUP_MODULES = ["mammoth", "passlib.handlers.bcrypt"]
+WARMUP_TEMPLATE_COUNT = int(os.environ.get("WARMUP_TEMPLATE_COUNT", "20"))
+
+# Filtered list queries: whitelisted sort fields, each backed by (sort, id),
+# (status, sort, id) and (supplier_id, sort, id) indexes. A supplier's lists are
+# small enough that its status filter is applied while walking the last one
+LIST_SORT_FIELDS = {
+    "invoices": ["due_date", "upload_date", "amount"],
+    "contracts": ["created_at", "signed_at"],
+}
+LIST_STATUSES = {
+    "invoices": ["pending", "paid", "rejected"],
+    "contracts": ["draft", "sent", "signed", "expired"],
+}
+LIST_MAX_LIMIT = 1000
+
+def list_query_indexes(collection: str) -> List[tuple]:
+    indexes = []
+    for field in LIST_SORT_FIELDS[collection]:
+        for prefix in ([], ["status"], ["supplier_id"]):
+            indexes.append(([(key, 1) for key in prefix + [field, "id"]], {}))
+    return indexes
+
+# Readiness flags, flipped by the startup sequence
+startup_state = {
+    "indexes_applied": False,
+    "executors_started": False,
+    "warmup_complete": False,
+    "transactions": False,
+}
+
+# Indexes applied at startup: collection -> list of (keys, options)
+INDEXES = {
+    "users": [([("id", 1)], {"unique": True}), ([("email", 1)], {})],
+    "suppliers": [
+        ([("id", 1)], {"unique": True}),
+        # Enforced by the database so concurrent creates and imports cannot both insert a SIRET
+        ([("siret", 1)], {"unique": True, "name": "siret_1_unique", "partialFilterExpression": {"siret": {"$gt": ""}}}),
+        ([("name", 1), ("id", 1)], {}),
+    ],
+    "contract_templates": [([("id", 1)], {"unique": True}), ([("created_at", -1), ("id", -1)], {})],
+    "contract_template_versions": [([("template_id", 1), ("version", 1)], {"unique": True})],
+    "contracts": [
+        ([("id", 1)], {"unique": True}),
+        *list_query_indexes("contracts"),
+    ],
+    "general_conditions": [([("id", 1)], {"unique": True}), ([("is_active", 1)], {})],
+    "gc_acceptances": [([("supplier_id", 1), ("gc_id", 1)], {})],
+    "audit_log": [([("id", 1)], {"unique": True}), ([("entity_type", 1), ("entity_id", 1), ("at", -1)], {}), ([("supplier_id", 1), ("at", -1)], {})],
+    "gc_quarantine": [([("quarantined_at", 1)], {})],
+    "upload_sessions": [([("id", 1)], {"unique": True}), ([("expires_at", 1)], {})],
+    "outbox": [([("id", 1)], {"unique": True}), ([("status", 1), ("next_attempt_at", 1)], {})],
+    "invoices": [
+        ([("id", 1)], {"unique": True}),
+        *list_query_indexes("invoices"),
+    ],
+}
+
+# Superseded by the list query indexes (or the unique SIRET one), or never picked by
+# the planner once the supplier-scoped ones exist; dropped at startup where they still exist
+OBSOLETE_INDEXES = {
+    "suppliers": ["siret_1"],
+    "invoices": [
+        "supplier_id_1_upload_date_-1",
+        "supplier_id_1_status_1",
+        "supplier_id_1_status_1_due_date_1_id_1",
+        "supplier_id_1_status_1_upload_date_1_id_1",
+        "supplier_id_1_status_1_amount_1_id_1",
+    ],
+    "contracts": [
+        "supplier_id_1_created_at_-1",
+        "supplier_id_1_status_1_created_at_1_id_1",
+        "supplier_id_1_status_1_signed_at_1_id_1",
+    ],
+}
+
 # JWT Configuration
 SECRET_KEY = os.environ.get("SECRET_KEY", "mysecretkey")
 ALGORITHM = "HS256"
@@ -106,6 +698,109 @@ class Supplier(SupplierBase):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class SupplierImportError(BaseModel):
+    row: int
+    siret: Optional[str] = None
+    errors: List[str]
+
+class SupplierImportReport(BaseModel):
+    total_rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[SupplierImportError] = []
+    errors_truncated: bool = False
+
+class SupplierComplianceOverview(BaseModel):
+    supplier_id: str
+    name: str
+    siret: str
+    gc_accepted: bool = False
+    total_contracts: int = 0
+    unsigned_contracts: int = 0
+    has_unsigned_contracts: bool = False
+    pending_invoices: int = 0
+    pending_amount: float = 0.0
+    has_pending_invoices: bool = False
+
+class SupplierOverviewPage(BaseModel):
+    total: int
+    items: List[SupplierComplianceOverview]
+
+class UploadSessionCreate(BaseModel):
+    kind: str  # 'invoice' or 'template'
+    filename: str
+    total_size: int
+    # Invoice fields
+    supplier_id: Optional[str] = None
+    amount: Optional[float] = None
+    due_date: Optional[str] = None
+    notes: Optional[str] = None
+    # Template fields
+    name: Optional[str] = None
+
+class UploadPart(BaseModel):
+    offset: int
+    size: int
+    sha256: str
+    etag: Optional[str] = None
+
+class UploadSession(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    kind: str
+    filename: str
+    total_size: int
+    offset: int = 0
+    parts: List[UploadPart] = []
+    status: str = "open"  # 'open', 'finalizing', 'finalized'
+    upload_hash: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+class AuditEvent(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    entity_type: str  # 'contract', 'gc_acceptance', 'invoice'
+    entity_id: str
+    action: str
+    actor_id: Optional[str] = None
+    supplier_id: Optional[str] = None
+    ip_address: Optional[str] = None
+    data: Dict[str, Any] = {}
+    at: datetime = Field(default_factory=datetime.utcnow)
+
+class OutboxMessage(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    kind: str  # 'contract.generated', 'invoice.status'
+    supplier_id: str
+    entity_id: str
+    subject: str
+    body: str
+    status: str = "pending"  # 'pending', 'sending', 'sent', 'failed'
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+    recipients: List[str] = []  # Resolved from the supplier when sent
+    last_error: Optional[str] = None
+
+class SupplierCashFlow(BaseModel):
+    supplier_id: str
+    name: Optional[str] = None
+    payment_rule: Optional[str] = None
+    total: float
+    series: List[float]
+
+class CashFlowForecast(BaseModel):
+    start_date: str
+    bucket: str  # 'day' or 'week'
+    buckets: List[str]
+    totals: List[float]
+    total: float
+    overdue_total: float
+    beyond_horizon_total: float
+    invoice_count: int
+    suppliers: List[SupplierCashFlow] = []
+
 class DocumentType(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -131,23 +826,73 @@ class ContractTemplate(BaseModel):
     name: str
     file_path: str
     variables: List[str] = []
+    version: int = 1
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class ContractTemplateVersion(BaseModel):
+    template_id: str
+    version: int
+    file_path: str
+    file_hash: str
+    variables: List[str] = []
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
 class ContractTemplateCreate(BaseModel):
     name: str
 
+class TemplateImportError(BaseModel):
+    filename: str
+    error: str
+
+class TemplateImportReport(BaseModel):
+    total_files: int = 0
+    imported: int = 0
+    failed: int = 0
+    skipped: List[str] = []  # Entries that are not .docx files
+    templates: List[ContractTemplate] = []
+    errors: List[TemplateImportError] = []
+
 class Contract(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     supplier_id: str
     template_id: str
-    file_path: str
+    template_version: Optional[int] = None
+    file_path: Optional[str] = None
     variables: Dict[str, Any] = {}
     status: str = "draft"  # 'draft', 'sent', 'signed', 'expired'
     created_at: datetime = Field(default_factory=datetime.utcnow)
     signed_at: Optional[datetime] = None
+    storage_mode: str = "materialized"  # 'materialized' or 'render'
+    content_hash: Optional[str] = None  # SHA-256 of the rendered HTML
+    content_encoding: Optional[str] = None  # 'gzip' or 'zstd' when the file is stored compressed
     content: Optional[str] = None  # Base64 encoded content
 
+class ContractListEntry(Contract):
+    # Resolved for the page being listed, so clients need not load every supplier and template
+    supplier_name: Optional[str] = None
+    template_name: Optional[str] = None
+
+class ContractPreviewRequest(BaseModel):
+    template_id: str
+    variables: Dict[str, Any] = {}
+    template_version: Optional[int] = None
+    # When set, only the blocks using these variables are rendered and returned
+    changed_variables: Optional[List[str]] = None
+
+class PreviewBlock(BaseModel):
+    index: int
+    html: str
+
+class ContractPreview(BaseModel):
+    template_id: str
+    template_version: int
+    block_count: int
+    missing_variables: List[str] = []
+    content: Optional[str] = None  # Base64 encoded content, full previews only
+    content_hash: Optional[str] = None
+    blocks: Optional[List[PreviewBlock]] = None  # Partial previews only
+
 class GeneralConditions(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     version: str
@@ -173,6 +918,681 @@ class Invoice(BaseModel):
     payment_date: Optional[datetime] = None
     notes: Optional[str] = None
 
+class SlowQuery(BaseModel):
+    worker: str
+    namespace: str
+    command: str
+    shape: Dict[str, Any]
+    count: int
+    total_ms: float
+    max_ms: float
+    last_ms: float
+    first_seen: datetime
+    last_seen: datetime
+    collscan: Optional[bool] = None
+    plan: Optional[List[str]] = None
+
+# Data access: one repository per collection. Reads project the fields of the
+# response model (or the few fields a caller names) instead of whole documents
+def model_projection(model) -> Dict[str, int]:
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+class Repository:
+    def __init__(self, name: str, model=None, extra_fields: tuple = ()):
+        self.name = name
+        self.projection = {**model_projection(model), **{field: 1 for field in extra_fields}} if model else {"_id": 0}
+
+    @property
+    def collection(self):
+        # Looked up per call so the id codec wrapper applies
+        return db[self.name]
+
+    def _projection(self, fields) -> Dict[str, int]:
+        return {"_id": 0, **{field: 1 for field in fields}} if fields else self.projection
+
+    async def get(self, query: Dict[str, Any], *fields: str, **kwargs) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one(query, self._projection(fields), **kwargs)
+
+    async def get_by_id(self, id: str, *fields: str) -> Optional[Dict[str, Any]]:
+        return await self.get({"id": id}, *fields)
+
+    async def exists(self, query: Dict[str, Any]) -> bool:
+        return await self.collection.find_one(query, {"_id": 1}) is not None
+
+    def find(self, query: Optional[Dict[str, Any]] = None, *fields: str, **kwargs):
+        return self.collection.find(query or {}, self._projection(fields), **kwargs)
+
+    async def update_by_id(self, id: str, update: Dict[str, Any], *fields: str, **kwargs) -> Optional[Dict[str, Any]]:
+        # Update and read back in one round trip; None when the id does not exist
+        return await self.collection.find_one_and_update(
+            {"id": id}, update, projection=self._projection(fields), return_document=ReturnDocument.AFTER, **kwargs
+        )
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs):
+        return self.collection.aggregate(pipeline, **kwargs)
+
+    # Writes go through the repository too, so every access to a collection is in one place
+    async def insert_one(self, document: Dict[str, Any], **kwargs):
+        return await self.collection.insert_one(document, **kwargs)
+
+    async def insert_many(self, documents: List[Dict[str, Any]], **kwargs):
+        return await self.collection.insert_many(documents, **kwargs)
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], **kwargs):
+        return await self.collection.update_one(query, update, **kwargs)
+
+    async def update_many(self, query: Dict[str, Any], update: Dict[str, Any], **kwargs):
+        return await self.collection.update_many(query, update, **kwargs)
+
+    async def delete_one(self, query: Dict[str, Any], **kwargs):
+        return await self.collection.delete_one(query, **kwargs)
+
+    async def find_one_and_update(self, query: Dict[str, Any], update: Dict[str, Any], **kwargs) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one_and_update(query, update, projection=self.projection, **kwargs)
+
+    async def find_one_and_delete(self, query: Dict[str, Any], **kwargs) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one_and_delete(query, projection=self.projection, **kwargs)
+
+user_repo = Repository("users", User)
+supplier_repo = Repository("suppliers", Supplier)
+document_type_repo = Repository("document_types", DocumentType)
+document_repo = Repository("documents", Document)
+template_repo = Repository("contract_templates", ContractTemplate)
+template_version_repo = Repository("contract_template_versions", ContractTemplateVersion)
+# The signed snapshot is needed to serve render-mode contracts
+contract_repo = Repository("contracts", Contract, extra_fields=("snapshot",))
+# Lists never carry contract bodies
+CONTRACT_LIST_FIELDS = [name for name in Contract.model_fields if name != "content"]
+gc_repo = Repository("general_conditions", GeneralConditions)
+gc_acceptance_repo = Repository("gc_acceptances", SupplierGCAcceptance)
+invoice_repo = Repository("invoices", Invoice)
+# Sessions carry storage bookkeeping beyond the response model
+upload_session_repo = Repository("upload_sessions")
+# For code that works across collections (exports, file references); migrations and
+# index maintenance address raw documents by _id and stay on db
+repositories = {repo.name: repo for repo in [
+    user_repo, supplier_repo, document_type_repo, document_repo, template_repo, template_version_repo,
+    contract_repo, gc_repo, gc_acceptance_repo, invoice_repo, upload_session_repo,
+]}
+
+async def active_gc_id() -> Optional[str]:
+    gc = await gc_repo.get({"is_active": True}, "id")
+    return gc["id"] if gc else None
+
+async def has_accepted_active_gc(supplier_id: str) -> Optional[bool]:
+    # None when no general conditions are active
+    gc_id = await active_gc_id()
+    if gc_id is None:
+        return None
+    return await gc_acceptance_repo.exists({"supplier_id": supplier_id, "gc_id": gc_id})
+
+# In-process pub/sub feeding the event stream
+class EventBroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event: Dict[str, Any]):
+        for subscriber in list(self._subscribers):
+            if subscriber.full():
+                # A slow client loses its oldest event rather than blocking the publisher
+                subscriber.get_nowait()
+            subscriber.put_nowait(event)
+
+event_broker = EventBroker(EVENT_QUEUE_SIZE)
+
+def publish_event(event_type: str, supplier_id: Optional[str], **data):
+    # With the change stream source, events come from Mongo instead of the handlers
+    if EVENT_SOURCE != "local":
+        return
+    event_broker.publish({"type": event_type, "supplier_id": supplier_id, **data})
+
+# Fire-and-forget tasks: the event loop only keeps weak references, so they are
+# held here until done, failures are logged, and shutdown cancels what is left
+background_tasks: set = set()
+
+def spawn(coro) -> asyncio.Task:
+    task = asyncio.ensure_future(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_task_done)
+    return task
+
+def background_task_done(task: asyncio.Task):
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logging.getLogger(__name__).error(
+            f"Background task {task.get_coro().__qualname__} failed", exc_info=task.exception()
+        )
+
+async def cancel_background_tasks():
+    tasks = list(background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+# Batches audit events into insert_many off the request path
+class AuditLogWriter:
+    def __init__(self, queue_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._unflushed: List[Dict[str, Any]] = []
+        self._direct_writes: set = set()
+        self._task = None
+
+    def record(self, event: AuditEvent):
+        try:
+            self._queue.put_nowait(event.dict())
+        except asyncio.QueueFull:
+            # Never drop an audit record: fall back to a direct write
+            logging.getLogger(__name__).warning("Audit queue full, writing event directly")
+            task = spawn(self._write([event.dict()]))
+            # Also tracked here so stop() waits for them instead of cancelling
+            self._direct_writes.add(task)
+            task.add_done_callback(self._direct_writes.discard)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    def _claim_spilled(self) -> List[Path]:
+        # Every worker replays at startup, so a file is renamed before it is read and only
+        # one rename succeeds. A claim left by a worker that died is taken over once stale
+        stale_before = time.time() - STARTUP_LOCK_TTL_SECONDS
+        claimed = []
+        for path in sorted([*AUDIT_SPILL_DIR.glob("*.jsonl"), *AUDIT_SPILL_DIR.glob("*.replaying")]):
+            try:
+                if path.suffix == ".replaying" and path.stat().st_mtime > stale_before:
+                    continue
+                target = path.with_name(f"{spill_file_base(path)}.{uuid.uuid4().hex}.replaying")
+                path.rename(target)
+                os.utime(target)
+            except FileNotFoundError:
+                # Claimed by another worker
+                continue
+            claimed.append(target)
+        return claimed
+
+    async def replay_spilled(self):
+        # Batches spilled by this or an earlier process; the unique id index absorbs repeats
+        for path in await run_blocking(self._claim_spilled):
+            lines = (await run_blocking(path.read_text)).splitlines()
+            batch = [json_util.loads(line) for line in lines if line]
+            if await self._write(batch, attempts=1, spill=False):
+                path.unlink(missing_ok=True)
+            else:
+                # Left for the next start
+                path.rename(path.with_name(f"{spill_file_base(path)}.jsonl"))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.gather(*self._direct_writes, return_exceptions=True)
+        # Flush the interrupted batch and whatever is still queued, spilling
+        # straight to disk rather than retrying while shutting down
+        await self._write(self._unflushed, attempts=1)
+        self._unflushed = []
+        while not self._queue.empty():
+            await self._write(self._drain(self.batch_size), attempts=1)
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                # Wait for the first event, then collect until the batch is full or the interval passes
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._write(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # Keep the batch for stop(); the unique id index absorbs a partially written one
+            self._unflushed = batch
+            raise
+
+    async def _write(self, batch: List[Dict[str, Any]], attempts: int = AUDIT_WRITE_ATTEMPTS, spill: bool = True) -> bool:
+        if not batch:
+            return True
+        delay = AUDIT_RETRY_BASE_SECONDS
+        for attempt in range(1, attempts + 1):
+            try:
+                await db.audit_log.insert_many(batch, ordered=False)
+                return True
+            except BulkWriteError as e:
+                # Duplicates were written by an earlier attempt; anything else is retried
+                if not e.details.get("writeConcernErrors") and all(
+                    error.get("code") == 11000 for error in e.details.get("writeErrors", [])
+                ):
+                    return True
+                error = e
+            except Exception as e:
+                error = e
+            logging.getLogger(__name__).warning(f"Error writing {len(batch)} audit events (attempt {attempt}): {str(error)}")
+            if attempt < attempts:
+                await asyncio.sleep(delay)
+                delay *= 2
+        if spill:
+            await run_blocking(self._spill, batch)
+        return False
+
+    def _spill(self, batch: List[Dict[str, Any]]):
+        AUDIT_SPILL_DIR.mkdir(parents=True, exist_ok=True)
+        path = AUDIT_SPILL_DIR / f"{WORKER_ID.replace(':', '-')}-{uuid.uuid4().hex}.jsonl"
+        path.write_text("".join(json_util.dumps(event) + "\n" for event in batch))
+        logging.getLogger(__name__).error(f"Spilled {len(batch)} audit events to {path}")
+
+def spill_file_base(path: Path) -> str:
+    # <base>.jsonl while spilled, <base>.<claim>.replaying while a worker replays it
+    return path.name[:-len(".jsonl")] if path.suffix == ".jsonl" else path.name.rsplit(".", 2)[0]
+
+audit_writer = AuditLogWriter(AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL_SECONDS)
+
+# Admission control
+class AdmissionGate:
+    def __init__(self, name: str, concurrency: int, queue_size: int, wait_seconds: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.wait_seconds = wait_seconds
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.wait_samples = deque(maxlen=ADMISSION_WAIT_SAMPLES)
+        self.avg_hold_seconds = 0.0
+        # Started with the other executors, one thread per admitted request
+        self.executor: Optional[ThreadPoolExecutor] = None
+    
+    def retry_after(self) -> str:
+        # Rough time for the current queue to drain
+        estimate = self.avg_hold_seconds * (self.waiting + 1) / self.concurrency
+        return str(max(1, int(estimate + 0.999)))
+    
+    async def acquire(self) -> float:
+        # Counted synchronously, the semaphore only updates once the waiter runs
+        if self.in_flight + self.waiting >= self.concurrency + self.queue_size:
+            self.rejected_full += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many concurrent {self.name} requests, retry later",
+                headers={"Retry-After": self.retry_after()}
+            )
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_seconds)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"Server busy with {self.name} requests, retry later",
+                headers={"Retry-After": self.retry_after()}
+            )
+        finally:
+            self.waiting -= 1
+        self.wait_samples.append(time.monotonic() - started)
+        self.in_flight += 1
+        self.admitted += 1
+        return time.monotonic()
+    
+    def release(self, admitted_at: float):
+        self.in_flight -= 1
+        held = time.monotonic() - admitted_at
+        self.avg_hold_seconds = held if not self.avg_hold_seconds else 0.9 * self.avg_hold_seconds + 0.1 * held
+        self._semaphore.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self.wait_samples)
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_hold_ms": round(self.avg_hold_seconds * 1000, 1),
+            "wait_ms": {
+                "p50": round(waits[len(waits) // 2] * 1000, 1) if waits else 0.0,
+                "p95": round(waits[int(len(waits) * 0.95)] * 1000, 1) if waits else 0.0,
+                "max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            },
+        }
+
+def parse_admission_limits(value: str) -> Dict[str, AdmissionGate]:
+    gates = {}
+    for item in value.split(","):
+        name, _, limits = item.strip().partition("=")
+        concurrency, _, queue_size = limits.partition(":")
+        gates[name] = AdmissionGate(name, int(concurrency), int(queue_size or 0), ADMISSION_WAIT_SECONDS)
+    return gates
+
+admission_gates = parse_admission_limits(ADMISSION_LIMITS)
+
+# Executor of the admission class the current request was admitted under; run_blocking
+# uses it so password hashing never waits behind renders in a shared pool
+admission_executor: ContextVar[Optional[ThreadPoolExecutor]] = ContextVar("admission_executor", default=None)
+
+def admission(route_class: str):
+    # Route dependency holding a slot of the class for the duration of the handler;
+    # light endpoints such as /users/me are not gated and never queue behind heavy work
+    gate = admission_gates[route_class]
+    async def admit():
+        admitted_at = await gate.acquire()
+        admission_executor.set(gate.executor)
+        try:
+            yield
+        finally:
+            gate.release(admitted_at)
+    return admit
+
+# FastAPI reads multipart bodies before route dependencies run, so uploads are
+# gated in AdmissionMiddleware instead, before any of the body is received
+MULTIPART_ADMISSION = [
+    ("POST", re.compile(r'^/api/suppliers/import$'), "import"),
+    ("POST", re.compile(r'^/api/contract-templates$'), "render"),
+    ("POST", re.compile(r'^/api/contract-templates/import$'), "import"),
+    ("POST", re.compile(r'^/api/contract-templates/[^/]+/versions$'), "render"),
+    ("POST", re.compile(r'^/api/invoices$'), "upload"),
+]
+
+class AdmissionMiddleware:
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        route_class = None
+        if scope["type"] == "http":
+            route_class = next(
+                (name for method, pattern, name in MULTIPART_ADMISSION
+                 if scope["method"] == method and pattern.match(scope["path"])),
+                None
+            )
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+        
+        gate = admission_gates[route_class]
+        try:
+            admitted_at = await gate.acquire()
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+        admission_executor.set(gate.executor)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release(admitted_at)
+
+# Transactional outbox for supplier emails
+async def in_transaction(callback):
+    # Runs callback(session) in a transaction when the deployment supports it,
+    # otherwise with no session (the writes are then only ordered, not atomic)
+    if not startup_state["transactions"]:
+        return await callback(None)
+    async with await client.start_session() as session:
+        return await session.with_transaction(callback)
+
+async def detect_transaction_support() -> bool:
+    if MONGO_TRANSACTIONS != "auto":
+        return MONGO_TRANSACTIONS.lower() in ("1", "true", "yes")
+    hello = await client.admin.command("hello")
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+def contract_generated_message(contract) -> OutboxMessage:
+    return OutboxMessage(
+        kind="contract.generated",
+        supplier_id=contract.supplier_id,
+        entity_id=contract.id,
+        subject="A new contract is available",
+        body=(
+            "Hello,\n\n"
+            f"A new contract (reference {contract.id}) has been generated for you on Prism'Finance.\n"
+            "Please sign in to review and sign it.\n"
+        )
+    )
+
+def invoice_status_message(invoice: Dict[str, Any], status: str) -> OutboxMessage:
+    return OutboxMessage(
+        kind="invoice.status",
+        supplier_id=invoice["supplier_id"],
+        entity_id=invoice["id"],
+        subject=f"Invoice {status}",
+        body=(
+            "Hello,\n\n"
+            f"The status of your invoice of {invoice.get('amount')} (reference {invoice['id']}) is now: {status}.\n"
+        )
+    )
+
+# Blocking smtplib connections reused across sends, one per executor thread
+class SMTPPool:
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: "queue.Queue[smtplib.SMTP]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="smtp")
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        if SMTP_STARTTLS:
+            connection.starttls()
+        if SMTP_USERNAME:
+            connection.login(SMTP_USERNAME, SMTP_PASSWORD or "")
+        return connection
+
+    def _send(self, message: EmailMessage):
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            try:
+                connection.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                # Idle connections get dropped by the server, reconnect once
+                connection = self._connect()
+                connection.send_message(message)
+        except Exception:
+            self._close(connection)
+            raise
+        self._idle.put(connection)
+
+    def _close(self, connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except Exception:
+            pass
+
+    async def send(self, message: EmailMessage):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._send, message)
+
+    def close(self):
+        while not self._idle.empty():
+            self._close(self._idle.get_nowait())
+        self._executor.shutdown(wait=False)
+
+class OutboxDispatcher:
+    def __init__(self, batch_size: int, rate_per_second: float):
+        self.batch_size = batch_size
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.pool: Optional[SMTPPool] = None
+        self._task = None
+
+    def start(self):
+        if not SMTP_HOST:
+            logging.getLogger(__name__).info("SMTP_HOST not set, outbox messages are kept but not sent")
+            return
+        self.pool = SMTPPool(SMTP_CONNECTIONS)
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self.pool is not None:
+            self.pool.close()
+
+    async def _run(self):
+        while True:
+            try:
+                sent = await self.dispatch_batch()
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Outbox dispatch failed: {str(e)}")
+                sent = 0
+            if sent < self.batch_size:
+                await asyncio.sleep(OUTBOX_POLL_SECONDS)
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        # Each message is leased by one worker; an expired lease (crashed worker)
+        # makes it due again through next_attempt_at. The claim counts as an attempt,
+        # so a message that keeps crashing its worker still ends up dead-lettered
+        now = datetime.utcnow()
+        claimed = []
+        for _ in range(self.batch_size):
+            doc = await db.outbox.find_one_and_update(
+                {"status": {"$in": ["pending", "sending"]}, "next_attempt_at": {"$lte": now}},
+                {
+                    "$set": {
+                        "status": "sending",
+                        "claimed_by": WORKER_ID,
+                        "next_attempt_at": now + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+                    },
+                    "$inc": {"attempts": 1},
+                },
+                sort=[("next_attempt_at", 1)],
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+            if not doc:
+                break
+            if doc["attempts"] > OUTBOX_MAX_ATTEMPTS:
+                await db.outbox.update_one({"id": doc["id"]}, {"$set": {
+                    "status": "failed",
+                    "last_error": doc.get("last_error") or "Delivery was interrupted too many times",
+                }})
+                continue
+            claimed.append(doc)
+        return claimed
+
+    async def _throttle(self):
+        # The next free slot lives in Mongo, so the rate holds for all workers together
+        if not self.interval:
+            return
+        now = datetime.utcnow()
+        previous = await db.rate_limits.find_one_and_update(
+            {"_id": "outbox"},
+            [{"$set": {"next_slot": {"$add": [
+                {"$max": [{"$ifNull": ["$next_slot", now]}, now]},
+                int(self.interval * 1000),
+            ]}}}],
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+        slot = max(previous["next_slot"], now) if previous else now
+        delay = (slot - now).total_seconds()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def dispatch_batch(self) -> int:
+        messages = await self._claim()
+        if not messages:
+            return 0
+        supplier_ids = list({message["supplier_id"] for message in messages})
+        suppliers = await supplier_repo.find({"id": {"$in": supplier_ids}}, "id", "emails").to_list(None)
+        emails = {supplier["id"]: supplier.get("emails") or [] for supplier in suppliers}
+        await asyncio.gather(*(self._deliver(message, emails.get(message["supplier_id"], [])) for message in messages))
+        return len(messages)
+
+    async def _deliver(self, message: Dict[str, Any], recipients: List[str]):
+        if not recipients:
+            await db.outbox.update_one(
+                {"id": message["id"]},
+                {"$set": {"status": "failed", "last_error": "Supplier has no email address"}}
+            )
+            return
+        
+        email = EmailMessage()
+        email["From"] = SMTP_FROM
+        email["To"] = ", ".join(recipients)
+        email["Subject"] = message["subject"]
+        # Stable id, so a resend after a lost acknowledgement can be deduplicated
+        email["Message-ID"] = f"<{message['id']}@prismfinance>"
+        email.set_content(message["body"])
+        
+        await self._throttle()
+        try:
+            await self.pool.send(email)
+        except Exception as e:
+            attempts = message["attempts"]
+            failed = attempts >= OUTBOX_MAX_ATTEMPTS
+            backoff = min(30 * 2 ** (attempts - 1), 3600)
+            await db.outbox.update_one({"id": message["id"]}, {"$set": {
+                "status": "failed" if failed else "pending",
+                "attempts": attempts,
+                "next_attempt_at": datetime.utcnow() + timedelta(seconds=backoff),
+                "last_error": str(e),
+            }})
+            logging.getLogger(__name__).warning(f"Email {message['id']} failed (attempt {attempts}): {str(e)}")
+            return
+        
+        await db.outbox.update_one({"id": message["id"]}, {"$set": {
+            "status": "sent",
+            "sent_at": datetime.utcnow(),
+            "recipients": recipients,
+            "last_error": None,
+        }})
+
+outbox_dispatcher = OutboxDispatcher(OUTBOX_BATCH_SIZE, OUTBOX_RATE_PER_SECOND)
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+def client_ip(request: Request) -> Optional[str]:
+    peer = request.client.host if request.client else None
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or peer is None or not is_trusted_proxy(peer):
+        return peer
+    # Each trusted proxy appends the address it saw; the first untrusted one from
+    # the right is the client, anything left of it could be forged
+    for address in reversed([item.strip() for item in forwarded.split(",")]):
+        if not is_trusted_proxy(address):
+            return address
+    return peer
+
 # Auth Functions
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -181,19 +1601,19 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 async def get_user(email: str):
-    user = await db.users.find_one({"email": email})
+    user = await user_repo.get({"email": email})
     if user:
         return User(**user)
     return None
 
 async def authenticate_user(email: str, password: str):
-    user = await get_user(email)
+    # One read for both the profile and the hash
+    user = await user_repo.get({"email": email}, *User.model_fields, "password")
     if not user:
         return False
-    user_dict = await db.users.find_one({"email": email})
-    if not verify_password(password, user_dict["password"]):
+    if not await run_blocking(verify_password, password, user.pop("password")):
         return False
-    return user
+    return User(**user)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -219,7 +1639,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         token_data = TokenData(user_id=user_id)
     except jwt.PyJWTError:
         raise credentials_exception
-    user = await db.users.find_one({"id": token_data.user_id})
+    user = await user_repo.get_by_id(token_data.user_id)
     if user is None:
         raise credentials_exception
     return User(**user)
@@ -229,48 +1649,411 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
-# Function to extract variables from template content
-def extract_variables(content: str) -> List[str]:
-    pattern = r'\{\{([^}]+)\}\}'
-    matches = re.findall(pattern, content)
-    return list(set(matches))
+async def run_blocking(func, *args):
+    executor = admission_executor.get() or document_executor
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
 
-# Auth Endpoints
-@api_router.post("/auth/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = await authenticate_user(form_data.username, form_data.password)
-    if not user:
-        raise HTTPException(
-            status_code=401,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
-    return {
-        "access_token": access_token,
+# Storage backends. Documents store a storage key in file_path: new files use keys
+# relative to the upload root ("templates/<name>"), older records hold absolute local paths.
+class LocalStorage:
+    min_part_size = 0
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, key: str) -> Path:
+        path = Path(key)
+        return path if path.is_absolute() else self.root / path
+
+    def save(self, key: str, fileobj):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as buffer:
+            shutil.copyfileobj(fileobj, buffer)
+
+    def write_bytes(self, key: str, data: bytes):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def read_bytes(self, key: str) -> bytes:
+        return self.path(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def delete(self, key: str):
+        self.path(key).unlink(missing_ok=True)
+
+    def copy(self, source: str, destination: str):
+        # A hard link makes the copy free on the same filesystem
+        destination_path = self.path(destination)
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        destination_path.unlink(missing_ok=True)
+        try:
+            os.link(self.path(source), destination_path)
+        except OSError:
+            shutil.copy2(self.path(source), destination_path)
+
+    def iter_files(self, prefix: str):
+        # Yields (key, size, modified) for every file under the prefix
+        for directory, _, filenames in os.walk(self.root / prefix):
+            for filename in filenames:
+                path = Path(directory) / filename
+                stat = path.stat()
+                yield str(path.relative_to(self.root)), stat.st_size, datetime.utcfromtimestamp(stat.st_mtime)
+
+    def version_token(self, key: str) -> str:
+        # mtime and size, so a file rewritten in place is not served from cache
+        stat = self.path(key).stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def begin_upload(self, key: str) -> Optional[str]:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        return None
+
+    async def write_part(self, key: str, upload_token: Optional[str], part_number: int, offset: int, chunks) -> Optional[str]:
+        # Appends straight to the destination, dropping any partial write of a failed attempt
+        with open(self.path(key), "r+b") as f:
+            f.seek(offset)
+            f.truncate()
+            async for data in chunks:
+                await run_blocking(f.write, data)
+        return None
+
+    def complete_upload(self, key: str, upload_token: Optional[str], parts: List[Dict[str, Any]]):
+        pass
+
+    def abort_upload(self, key: str, upload_token: Optional[str]):
+        self.delete(key)
+
+    async def download_response(self, key: str, filename: str, media_type: str, request: Request) -> Response:
+        return FileResponse(path=self.path(key), filename=filename, media_type=media_type)
+
+class S3Storage:
+    # S3 rejects multipart parts below 5 MiB, except the last one
+    min_part_size = 5 * 1024 * 1024
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None, region: Optional[str] = None):
+        import boto3
+        from botocore.exceptions import ClientError
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client_error = ClientError
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def object_key(self, key: str) -> str:
+        path = Path(key)
+        if path.is_absolute():
+            # Legacy absolute paths map onto the same layout as the local upload tree
+            try:
+                key = str(path.relative_to(UPLOAD_DIR))
+            except ValueError:
+                key = str(path).lstrip("/")
+        return f"{self.prefix}{key}"
+
+    def save(self, key: str, fileobj):
+        # upload_fileobj streams large files as a multipart upload
+        self.client.upload_fileobj(fileobj, self.bucket, self.object_key(key))
+
+    def write_bytes(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self.object_key(key), Body=data)
+
+    def read_bytes(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except self.client_error as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+
+    def copy(self, source: str, destination: str):
+        self.client.copy(
+            {"Bucket": self.bucket, "Key": self.object_key(source)}, self.bucket, self.object_key(destination)
+        )
+
+    def iter_files(self, prefix: str):
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.object_key(f"{prefix}/")):
+            for obj in page.get("Contents", []):
+                modified = obj["LastModified"].replace(tzinfo=None)
+                yield obj["Key"][len(self.prefix):], obj["Size"], modified
+
+    def version_token(self, key: str) -> str:
+        # Objects are written once under unique keys and never overwritten
+        return self.object_key(key)
+
+    def begin_upload(self, key: str) -> Optional[str]:
+        upload = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.object_key(key))
+        return upload["UploadId"]
+
+    async def write_part(self, key: str, upload_token: Optional[str], part_number: int, offset: int, chunks) -> Optional[str]:
+        # A part needs a known length, so it is spooled (to disk past 8 MiB) before upload
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+            async for data in chunks:
+                spool.write(data)
+            size = spool.tell()
+            spool.seek(0)
+            part = await run_blocking(lambda: self.client.upload_part(
+                Bucket=self.bucket,
+                Key=self.object_key(key),
+                UploadId=upload_token,
+                PartNumber=part_number,
+                Body=spool,
+                ContentLength=size
+            ))
+        return part["ETag"]
+
+    def complete_upload(self, key: str, upload_token: Optional[str], parts: List[Dict[str, Any]]):
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.object_key(key),
+                UploadId=upload_token,
+                MultipartUpload={"Parts": [
+                    {"ETag": part["etag"], "PartNumber": number} for number, part in enumerate(parts, start=1)
+                ]}
+            )
+        except self.client_error as e:
+            # A retried finalize: the first attempt completed the upload, so the id is gone
+            if e.response.get("Error", {}).get("Code") == "NoSuchUpload" and self.exists(key):
+                return
+            raise
+
+    def abort_upload(self, key: str, upload_token: Optional[str]):
+        try:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.object_key(key), UploadId=upload_token)
+        except self.client_error as e:
+            logging.warning(f"Could not abort multipart upload {upload_token}: {str(e)}")
+
+    async def download_response(self, key: str, filename: str, media_type: str, request: Request) -> Response:
+        if S3_PRESIGNED_DOWNLOADS:
+            # The client fetches the bytes from the bucket directly
+            url = self.client.generate_presigned_url(
+                "get_object",
+                Params={
+                    "Bucket": self.bucket,
+                    "Key": self.object_key(key),
+                    "ResponseContentType": media_type,
+                    "ResponseContentDisposition": f'attachment; filename="{filename}"',
+                },
+                ExpiresIn=S3_PRESIGN_EXPIRY_SECONDS
+            )
+            return RedirectResponse(url, status_code=307)
+        
+        # Otherwise proxy the object, passing Range through so clients can resume
+        params = {"Bucket": self.bucket, "Key": self.object_key(key)}
+        if request.headers.get("range"):
+            params["Range"] = request.headers["range"]
+        obj = await run_blocking(lambda: self.client.get_object(**params))
+        headers = {
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(obj["ContentLength"]),
+            "Accept-Ranges": "bytes",
+        }
+        if obj.get("ContentRange"):
+            headers["Content-Range"] = obj["ContentRange"]
+        return StreamingResponse(
+            obj["Body"].iter_chunks(64 * 1024),
+            status_code=206 if obj.get("ContentRange") else 200,
+            media_type=media_type,
+            headers=headers
+        )
+
+def create_storage():
+    if STORAGE_BACKEND == "s3":
+        if not S3_BUCKET:
+            raise RuntimeError("S3_BUCKET must be set when STORAGE_BACKEND is 's3'")
+        return S3Storage(S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL, S3_REGION)
+    return LocalStorage(UPLOAD_DIR)
+
+storage = create_storage()
+
+SHARDED_KEY_PATTERN = re.compile(r'^[^/]+/[0-9a-f]{2}/[0-9a-f]{2}/[^/]+$')
+
+def storage_key(prefix: str, filename: str) -> str:
+    # templates/<name> becomes templates/ab/cd/<name>, ab and cd taken from a hash of the name
+    if not UPLOAD_FANOUT:
+        return f"{prefix}/{filename}"
+    digest = hashlib.sha1(filename.encode()).hexdigest()
+    return f"{prefix}/{digest[:2]}/{digest[2:4]}/{filename}"
+
+def sharded_key_for(key: str) -> Optional[str]:
+    # None when the key already uses the fan-out layout
+    if SHARDED_KEY_PATTERN.match(key):
+        return None
+    path = Path(key)
+    digest = hashlib.sha1(path.name.encode()).hexdigest()
+    return f"{path.parent.name}/{digest[:2]}/{digest[2:4]}/{path.name}"
+
+@lru_cache(maxsize=64)
+def _convert_docx_file(file_path: str, version_token: str) -> str:
+    # The version token is part of the cache key so a rewritten file is converted again
+    return mammoth.convert_to_html(io.BytesIO(storage.read_bytes(file_path))).value
+
+def convert_template_to_html(file_path: str) -> str:
+    return _convert_docx_file(str(file_path), storage.version_token(file_path))
+
+def substitute_variables(html_content: str, variables: Dict[str, Any]) -> str:
+    # Single pass, so the result does not depend on the order of the variables
+    return re.sub(
+        r'\{\{([^}]+)\}\}',
+        lambda match: str(variables[match.group(1)]) if match.group(1) in variables else match.group(0),
+        html_content
+    )
+
+@lru_cache(maxsize=256)
+def _render_contract_cached(file_path: str, variables_json: str) -> str:
+    return substitute_variables(convert_template_to_html(file_path), json.loads(variables_json))
+
+def render_contract_html(file_path: str, variables: Dict[str, Any]) -> str:
+    # Template version files are immutable, so a render is fully determined by its inputs
+    return _render_contract_cached(str(file_path), json.dumps(variables, sort_keys=True, default=str))
+
+def hash_content(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+async def get_template_version(template: Dict[str, Any], version: Optional[int] = None) -> Dict[str, Any]:
+    version = version or template.get("version", 1)
+    version_doc = await template_version_repo.get({"template_id": template["id"], "version": version})
+    if version_doc:
+        return version_doc
+    if version == template.get("version", 1):
+        # Templates uploaded before versioning only have their current file
+        return {"template_id": template["id"], "version": version, "file_path": template["file_path"]}
+    raise HTTPException(status_code=404, detail=f"Template version {version} not found")
+
+def compress_content(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=CONTRACT_COMPRESSION_LEVELS["zstd"]).compress(data)
+    return gzip.compress(data, compresslevel=CONTRACT_COMPRESSION_LEVELS["gzip"], mtime=0)
+
+def decompress_content(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    # An entry naming the encoding wins over "*", whatever the order; q=0 refuses
+    qualities = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+async def load_contract_content(contract: Dict[str, Any]) -> Optional[str]:
+    # Base64 HTML of a contract, whatever its storage mode. Render mode covers HTML
+    # only: contracts have no DOCX form, see build_contract
+    if contract.get("storage_mode", "materialized") != "render":
+        # Older contracts keep their content in the document, compressed ones only on disk
+        if contract.get("content") is not None or not contract.get("content_encoding"):
+            return contract.get("content")
+        data = await run_blocking(storage.read_bytes, contract["file_path"])
+        html_content = (await run_blocking(decompress_content, data, contract["content_encoding"])).decode()
+    elif contract.get("snapshot"):
+        html_content = zlib.decompress(contract["snapshot"]).decode()
+    else:
+        template = await template_repo.get_by_id(contract["template_id"], "id", "version", "file_path")
+        if not template:
+            raise HTTPException(status_code=404, detail="Contract template not found")
+        version = await get_template_version(template, contract.get("template_version"))
+        html_content = await run_blocking(render_contract_html, version["file_path"], contract.get("variables", {}))
+    
+    if contract.get("content_hash") and hash_content(html_content.encode()) != contract["content_hash"]:
+        logger.error(f"Content hash mismatch for contract {contract['id']}")
+        raise HTTPException(status_code=500, detail="Contract content failed its integrity check")
+    return base64.b64encode(html_content.encode()).decode()
+
+# Collection version stamps for conditional GET; every write to one of these
+# collections must bump its version, including migrations
+VERSIONED_COLLECTIONS = {
+    "suppliers", "contract_templates", "contracts", "general_conditions", "gc_acceptances", "invoices",
+}
+
+async def get_collection_versions(*names: str) -> Dict[str, int]:
+    docs = await db.collection_versions.find({"_id": {"$in": list(names)}}).to_list(len(names))
+    versions = {name: 0 for name in names}
+    versions.update({doc["_id"]: doc["version"] for doc in docs})
+    return versions
+
+async def bump_collection_version(*names: str):
+    # Increments the version counters that list and item ETags are built from, so
+    # cached responses stop matching. Call it after the write, never before
+    for name in names:
+        await db.collection_versions.update_one({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+
+async def check_not_modified(request: Request, response: Response, current_user: User, *collections: str) -> Optional[Response]:
+    # The ETag covers the collection versions, the URL and who is asking,
+    # since list contents depend on the caller's permissions
+    versions = await get_collection_versions(*collections)
+    stamp = json.dumps(
+        [versions, request.url.path, str(request.url.query), current_user.id, current_user.supplier_id],
+        sort_keys=True
+    )
+    etag = f'W/"{hashlib.sha1(stamp.encode()).hexdigest()}"'
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return None
+
+# Auth Endpoints
+@api_router.post("/auth/token", response_model=Token, dependencies=[Depends(admission("auth"))])
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await authenticate_user(form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=401,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.id}, expires_delta=access_token_expires
+    )
+    return {
+        "access_token": access_token,
         "token_type": "bearer",
         "user_id": user.id,
         "is_admin": user.is_admin,
         "name": user.name
     }
 
-@api_router.post("/users", response_model=User)
+@api_router.post("/users", response_model=User, dependencies=[Depends(admission("auth"))])
 async def create_user(user: UserCreate):
-    db_user = await get_user(user.email)
-    if db_user:
+    if await user_repo.exists({"email": user.email}):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await run_blocking(get_password_hash, user.password)
     user_data = user.dict()
     user_data.pop("password")
     user_obj = User(**user_data)
     user_dict = user_obj.dict()
     user_dict["password"] = hashed_password
     
-    await db.users.insert_one(user_dict)
+    await user_repo.insert_one(user_dict)
     return user_obj
 
 @api_router.get("/users/me", response_model=User)
@@ -284,32 +2067,149 @@ async def create_supplier(supplier: SupplierCreate, current_user: User = Depends
     supplier_obj = Supplier(**supplier_dict)
     
     # Check if supplier with SIRET already exists
-    existing = await db.suppliers.find_one({"siret": supplier.siret})
-    if existing:
+    if await supplier_repo.exists({"siret": supplier.siret}):
         raise HTTPException(status_code=400, detail="Supplier with this SIRET already exists")
     
-    await db.suppliers.insert_one(supplier_obj.dict())
+    try:
+        await supplier_repo.insert_one(supplier_obj.dict())
+    except DuplicateKeyError:
+        # Created concurrently since the check above
+        raise HTTPException(status_code=400, detail="Supplier with this SIRET already exists")
+    await bump_collection_version("suppliers")
     return supplier_obj
 
+def name_prefix_query(q: Optional[str]) -> Dict[str, Any]:
+    # Case-insensitive name search for pickers; the input is matched literally
+    return {"name": {"$regex": f"^{re.escape(q)}", "$options": "i"}} if q else {}
+
 @api_router.get("/suppliers", response_model=List[Supplier])
-async def get_suppliers(current_user: User = Depends(get_current_user)):
+async def get_suppliers(
+    request: Request,
+    response: Response,
+    q: Optional[str] = None,
+    skip: int = 0,
+    limit: int = LIST_MAX_LIMIT,
+    current_user: User = Depends(get_current_user)
+):
+    not_modified = await check_not_modified(request, response, current_user, "suppliers")
+    if not_modified:
+        return not_modified
+    
     if current_user.is_admin:
-        suppliers = await db.suppliers.find().to_list(1000)
+        # Stable order so pages fetched with skip/limit do not overlap
+        limit = max(1, min(limit, LIST_MAX_LIMIT))
+        cursor = supplier_repo.find(name_prefix_query(q)).sort([("name", 1), ("id", 1)]).skip(max(skip, 0)).limit(limit)
+        suppliers = await cursor.to_list(limit)
     else:
         # If not admin, only return the supplier associated with this user
         if not current_user.supplier_id:
             return []
-        suppliers = await db.suppliers.find({"id": current_user.supplier_id}).to_list(1)
+        suppliers = await supplier_repo.find({"id": current_user.supplier_id, **name_prefix_query(q)}).to_list(1)
     
     return [Supplier(**supplier) for supplier in suppliers]
 
+OVERVIEW_SORT_FIELDS = {
+    "name", "siret", "gc_accepted", "total_contracts", "unsigned_contracts",
+    "has_unsigned_contracts", "pending_invoices", "pending_amount", "has_pending_invoices",
+}
+
+@api_router.get("/suppliers/overview", response_model=SupplierOverviewPage, dependencies=[Depends(require_uniform_ids)])
+async def get_suppliers_overview(
+    skip: int = 0,
+    limit: int = 50,
+    sort_by: str = "name",
+    sort_order: str = "asc",
+    current_user: User = Depends(get_current_user)
+):
+    if sort_by not in OVERVIEW_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort field. Use one of {sorted(OVERVIEW_SORT_FIELDS)}")
+    if sort_order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid sort order. Use 'asc' or 'desc'")
+    limit = max(1, min(limit, 500))
+    
+    match = {}
+    if not current_user.is_admin:
+        if not current_user.supplier_id:
+            return SupplierOverviewPage(total=0, items=[])
+        match["id"] = current_user.supplier_id
+    
+    gc_id = await active_gc_id()
+    
+    # One pass over suppliers with per-supplier lookups instead of N+1 requests
+    pipeline = [
+        {"$match": match},
+        {"$lookup": {
+            "from": "gc_acceptances",
+            "localField": "id",
+            "foreignField": "supplier_id",
+            "pipeline": [{"$match": {"gc_id": gc_id}}, {"$limit": 1}, {"$project": {"_id": 1}}],
+            "as": "gc_acceptance",
+        }},
+        {"$lookup": {
+            "from": "contracts",
+            "localField": "id",
+            "foreignField": "supplier_id",
+            "pipeline": [{"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "unsigned": {"$sum": {"$cond": [{"$ne": ["$status", "signed"]}, 1, 0]}},
+            }}],
+            "as": "contract_counts",
+        }},
+        {"$lookup": {
+            "from": "invoices",
+            "localField": "id",
+            "foreignField": "supplier_id",
+            "pipeline": [
+                {"$match": {"status": "pending"}},
+                {"$group": {"_id": None, "count": {"$sum": 1}, "amount": {"$sum": "$amount"}}},
+            ],
+            "as": "invoice_counts",
+        }},
+        {"$project": {
+            "_id": 0,
+            "supplier_id": "$id",
+            "name": 1,
+            "siret": 1,
+            "gc_accepted": {"$gt": [{"$size": "$gc_acceptance"}, 0]},
+            "total_contracts": {"$ifNull": [{"$first": "$contract_counts.total"}, 0]},
+            "unsigned_contracts": {"$ifNull": [{"$first": "$contract_counts.unsigned"}, 0]},
+            "pending_invoices": {"$ifNull": [{"$first": "$invoice_counts.count"}, 0]},
+            "pending_amount": {"$ifNull": [{"$first": "$invoice_counts.amount"}, 0]},
+        }},
+        {"$addFields": {
+            "has_unsigned_contracts": {"$gt": ["$unsigned_contracts", 0]},
+            "has_pending_invoices": {"$gt": ["$pending_invoices", 0]},
+        }},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "items": [
+                {"$sort": {sort_by: 1 if sort_order == "asc" else -1, "supplier_id": 1}},
+                {"$skip": max(skip, 0)},
+                {"$limit": limit},
+            ],
+        }},
+    ]
+    
+    result = await supplier_repo.aggregate(pipeline, allowDiskUse=True).to_list(1)
+    page = result[0] if result else {"total": [], "items": []}
+    total = page["total"][0]["count"] if page["total"] else 0
+    return SupplierOverviewPage(
+        total=total,
+        items=[SupplierComplianceOverview(**item) for item in page["items"]]
+    )
+
 @api_router.get("/suppliers/{supplier_id}", response_model=Supplier)
-async def get_supplier(supplier_id: str, current_user: User = Depends(get_current_user)):
+async def get_supplier(supplier_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
     # Check permissions - admin can view any supplier, non-admin only their own
     if not current_user.is_admin and current_user.supplier_id != supplier_id:
         raise HTTPException(status_code=403, detail="Not authorized to view this supplier")
     
-    supplier = await db.suppliers.find_one({"id": supplier_id})
+    not_modified = await check_not_modified(request, response, current_user, "suppliers")
+    if not_modified:
+        return not_modified
+    
+    supplier = await supplier_repo.get_by_id(supplier_id)
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return Supplier(**supplier)
@@ -320,21 +2220,159 @@ async def update_supplier(supplier_id: str, supplier: SupplierCreate, current_us
     if not current_user.is_admin and current_user.supplier_id != supplier_id:
         raise HTTPException(status_code=403, detail="Not authorized to update this supplier")
     
-    existing = await db.suppliers.find_one({"id": supplier_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Supplier not found")
-    
     supplier_dict = supplier.dict()
     supplier_dict["updated_at"] = datetime.utcnow()
     
-    await db.suppliers.update_one(
-        {"id": supplier_id},
-        {"$set": supplier_dict}
-    )
-    
-    updated = await db.suppliers.find_one({"id": supplier_id})
+    try:
+        updated = await supplier_repo.update_by_id(supplier_id, {"$set": supplier_dict})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Supplier with this SIRET already exists")
+    if not updated:
+        raise HTTPException(status_code=404, detail="Supplier not found")
+    await bump_collection_version("suppliers")
     return Supplier(**updated)
 
+SUPPLIER_LIST_FIELDS = {"emails", "vat_rates"}
+# Spreadsheets turn these codes into numbers, losing their leading zeros
+SUPPLIER_CODE_WIDTHS = {"siret": 14, "postal_code": 5, "insee_code": 5}
+
+def normalize_import_header(header: Any) -> str:
+    return str(header).strip().lower().replace(" ", "_")
+
+def import_cell_text(key: str, value: Any) -> str:
+    # "" for empty cells
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Numeric XLSX cells come back as 12345678900012.0
+        value = int(value)
+    if isinstance(value, int) and key in SUPPLIER_CODE_WIDTHS:
+        return str(value).zfill(SUPPLIER_CODE_WIDTHS[key])
+    return str(value).strip()
+
+def parse_supplier_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    data = {}
+    for key, value in row.items():
+        value = import_cell_text(key, value)
+        if value == "":
+            continue
+        if key in SUPPLIER_LIST_FIELDS:
+            items = [item.strip() for item in re.split(r'[;,]', value) if item.strip()]
+            data[key] = [float(item) for item in items] if key == "vat_rates" else items
+        elif key == "contract_variables":
+            data[key] = json.loads(value)
+        else:
+            data[key] = value
+    return data
+
+def iter_supplier_import_chunks(file, filename: str, chunk_size: int):
+    # Yields lists of raw rows without ever holding the whole file in memory
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [normalize_import_header(h) for h in next(rows, [])]
+            chunk = []
+            for values in rows:
+                chunk.append(dict(zip(headers, values)))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            workbook.close()
+    else:
+        reader = pd.read_csv(file, chunksize=chunk_size, dtype=str, keep_default_na=False, sep=None, engine="python")
+        for frame in reader:
+            frame.columns = [normalize_import_header(c) for c in frame.columns]
+            yield frame.to_dict("records")
+
+def add_import_error(report: SupplierImportReport, row: int, siret: Optional[str], errors: List[str]):
+    report.failed += 1
+    if len(report.errors) < IMPORT_MAX_REPORTED_ERRORS:
+        report.errors.append(SupplierImportError(row=row, siret=siret, errors=errors))
+    else:
+        report.errors_truncated = True
+
+@api_router.post("/suppliers/import", response_model=SupplierImportReport)
+async def import_suppliers(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_admin_user)
+):
+    if not file.filename.lower().endswith((".csv", ".txt", ".xlsx", ".xlsm")):
+        raise HTTPException(status_code=400, detail="Unsupported file type. Use CSV or XLSX")
+    
+    report = SupplierImportReport()
+    chunks = iter_supplier_import_chunks(file.file, file.filename, IMPORT_CHUNK_SIZE)
+    # Spreadsheet line numbers, the header being line 1
+    line = 1
+    
+    try:
+        while True:
+            rows = await run_blocking(next, chunks, None)
+            if rows is None:
+                break
+            
+            # Validate the chunk
+            valid = []
+            for row in rows:
+                line += 1
+                report.total_rows += 1
+                siret = import_cell_text("siret", row.get("siret")) or None
+                try:
+                    supplier = SupplierCreate(**parse_supplier_row(row))
+                except ValidationError as e:
+                    add_import_error(report, line, siret, [
+                        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                    ])
+                    continue
+                except ValueError as e:
+                    add_import_error(report, line, siret, [str(e)])
+                    continue
+                valid.append((line, supplier))
+            
+            # Dedupe against the database with one query per chunk, and within the chunk
+            sirets = [supplier.siret for _, supplier in valid]
+            existing = {
+                doc["siret"] async for doc in supplier_repo.find({"siret": {"$in": sirets}}, "siret")
+            }
+            to_insert = []
+            for row_line, supplier in valid:
+                if supplier.siret in existing:
+                    report.duplicates += 1
+                    continue
+                existing.add(supplier.siret)
+                to_insert.append((row_line, Supplier(**supplier.dict())))
+            
+            if not to_insert:
+                continue
+            try:
+                result = await supplier_repo.insert_many(
+                    [supplier.dict() for _, supplier in to_insert], ordered=False
+                )
+                report.inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                report.inserted += e.details.get("nInserted", 0)
+                for write_error in write_errors:
+                    row_line, supplier = to_insert[write_error["index"]]
+                    if write_error.get("code") == 11000:
+                        # Inserted by a concurrent import or create since the dedupe query
+                        report.duplicates += 1
+                    else:
+                        add_import_error(report, row_line, supplier.siret, [write_error.get("errmsg", "Write failed")])
+    except (ValueError, pd.errors.ParserError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read import file: {str(e)}")
+    finally:
+        chunks.close()
+    
+    if report.inserted:
+        await bump_collection_version("suppliers")
+    logger.info(f"Supplier import: {report.inserted} inserted, {report.duplicates} duplicates, {report.failed} failed")
+    return report
+
 # Contract Template Endpoints
 @api_router.post("/contract-templates", response_model=ContractTemplate)
 async def create_contract_template(
@@ -344,67 +2382,414 @@ async def create_contract_template(
 ):
     # Create a unique filename
     filename = f"{uuid.uuid4()}_{file.filename}"
-    file_path = TEMPLATES_DIR / filename
+    file_path = storage_key("templates", filename)
     
     # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    await run_blocking(storage.save, file_path, file.file)
+    
+    return await save_contract_template(name, file_path)
+
+async def process_template_file(file_path: str):
+    file_hash = hash_content(await run_blocking(storage.read_bytes, file_path))
     
     # Extract variables using mammoth (convert docx to html)
     try:
-        # Read file content
-        with open(file_path, "rb") as f:
-            content_bytes = f.read()
-        
-        # Convert docx to html
-        result = mammoth.convert_to_html(io.BytesIO(content_bytes))
-        html_content = result.value
+        html_content = await run_blocking(convert_template_to_html, file_path)
         
         # Extract variables from HTML
         variables = extract_variables(html_content)
     except Exception as e:
         logging.error(f"Error processing template: {str(e)}")
         variables = []
+    return variables, file_hash
+
+async def save_contract_template(name: str, file_path: str) -> ContractTemplate:
+    variables, file_hash = await process_template_file(file_path)
     
     template = ContractTemplate(
         name=name,
-        file_path=str(file_path),
+        file_path=file_path,
+        variables=variables
+    )
+    version = ContractTemplateVersion(
+        template_id=template.id,
+        version=template.version,
+        file_path=template.file_path,
+        file_hash=file_hash,
         variables=variables
     )
     
-    await db.contract_templates.insert_one(template.dict())
+    await template_repo.insert_one(template.dict())
+    await template_version_repo.insert_one(version.dict())
+    await bump_collection_version("contract_templates")
     return template
 
+# Bulk template import
+template_import_pool: Optional[ProcessPoolExecutor] = None
+
+def get_template_import_pool() -> ProcessPoolExecutor:
+    # Spawned rather than forked: the parent has Motor and executor threads running
+    global template_import_pool
+    if template_import_pool is None:
+        template_import_pool = ProcessPoolExecutor(
+            max_workers=TEMPLATE_IMPORT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return template_import_pool
+
+def reset_template_import_pool(broken: ProcessPoolExecutor):
+    # One crashed worker (e.g. out of memory on a hostile docx) breaks the whole pool
+    global template_import_pool
+    if template_import_pool is broken:
+        template_import_pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+async def convert_in_pool(data: bytes):
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = get_template_import_pool()
+        try:
+            return await loop.run_in_executor(pool, convert_template_bytes, data)
+        except BrokenProcessPool:
+            # Retried once on a fresh pool: entries in flight alongside the culprit fail too
+            reset_template_import_pool(pool)
+            if attempt:
+                raise
+
+def read_template_archive(archive) -> tuple:
+    entries, skipped, errors = [], [], []
+    total_bytes = 0
+    try:
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                filename = Path(info.filename).name
+                if info.is_dir() or not filename or filename.startswith(".") or "__MACOSX" in info.filename:
+                    continue
+                if not filename.lower().endswith(".docx"):
+                    skipped.append(info.filename)
+                    continue
+                if len(entries) >= TEMPLATE_IMPORT_MAX_FILES:
+                    errors.append(TemplateImportError(filename=info.filename, error=f"More than {TEMPLATE_IMPORT_MAX_FILES} templates in the archive"))
+                    continue
+                # Declared size is checked first, then the actual read is capped
+                if info.file_size > TEMPLATE_IMPORT_MAX_FILE_BYTES:
+                    errors.append(TemplateImportError(filename=info.filename, error="File is too large"))
+                    continue
+                if total_bytes + info.file_size > TEMPLATE_IMPORT_MAX_TOTAL_BYTES:
+                    errors.append(TemplateImportError(filename=info.filename, error="Archive is too large to import at once"))
+                    continue
+                try:
+                    with zip_file.open(info) as entry:
+                        data = entry.read(TEMPLATE_IMPORT_MAX_FILE_BYTES + 1)
+                except (zipfile.BadZipFile, RuntimeError, zlib.error) as e:
+                    errors.append(TemplateImportError(filename=info.filename, error=f"Could not extract file: {str(e)}"))
+                    continue
+                if len(data) > TEMPLATE_IMPORT_MAX_FILE_BYTES:
+                    errors.append(TemplateImportError(filename=info.filename, error="File is too large"))
+                    continue
+                if total_bytes + len(data) > TEMPLATE_IMPORT_MAX_TOTAL_BYTES:
+                    errors.append(TemplateImportError(filename=info.filename, error="Archive is too large to import at once"))
+                    continue
+                total_bytes += len(data)
+                entries.append((info.filename, filename, data))
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+    return entries, skipped, errors
+
+@api_router.post("/contract-templates/import", response_model=TemplateImportReport)
+async def import_contract_templates(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_admin_user)
+):
+    entries, skipped, errors = await run_blocking(read_template_archive, file.file)
+    report = TemplateImportReport(total_files=len(entries) + len(errors), skipped=skipped, errors=errors)
+    
+    # Convert in parallel, with no more payloads in flight than there are worker processes
+    semaphore = asyncio.Semaphore(TEMPLATE_IMPORT_PROCESSES)
+    
+    async def convert(data: bytes):
+        async with semaphore:
+            return await convert_in_pool(data)
+    
+    results = await asyncio.gather(*(convert(data) for _, _, data in entries), return_exceptions=True)
+    
+    templates, versions, writes = [], [], []
+    for (entry_name, filename, data), result in zip(entries, results):
+        if isinstance(result, Exception):
+            report.errors.append(TemplateImportError(filename=entry_name, error=f"Could not convert template: {str(result)}"))
+            continue
+        variables, file_hash = result
+        file_path = storage_key("templates", f"{uuid.uuid4()}_{filename}")
+        template = ContractTemplate(name=Path(filename).stem, file_path=file_path, variables=variables)
+        templates.append(template)
+        versions.append(ContractTemplateVersion(
+            template_id=template.id,
+            version=template.version,
+            file_path=file_path,
+            file_hash=file_hash,
+            variables=variables
+        ))
+        writes.append(run_blocking(storage.write_bytes, file_path, data))
+    
+    # Files first, so no record ever points at a missing file; files left by a
+    # failed insert are unreferenced and reclaimed by the orphan GC
+    await asyncio.gather(*writes)
+    if templates:
+        await template_repo.insert_many([template.dict() for template in templates])
+        await template_version_repo.insert_many([version.dict() for version in versions])
+        await bump_collection_version("contract_templates")
+    
+    report.imported = len(templates)
+    report.failed = len(report.errors)
+    report.templates = templates
+    return report
+
+@api_router.post("/contract-templates/{template_id}/versions", response_model=ContractTemplate)
+async def upload_contract_template_version(
+    template_id: str,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_admin_user)
+):
+    template = await template_repo.get_by_id(template_id)
+    if not template:
+        raise HTTPException(status_code=404, detail="Contract template not found")
+    
+    # Record the current file as an immutable version before superseding it
+    current = await get_template_version(template)
+    if "file_hash" not in current:
+        exists = await run_blocking(storage.exists, current["file_path"])
+        try:
+            await template_version_repo.insert_one(ContractTemplateVersion(
+                template_id=template_id,
+                version=current["version"],
+                file_path=current["file_path"],
+                file_hash=hash_content(await run_blocking(storage.read_bytes, current["file_path"])) if exists else "",
+                variables=template.get("variables", [])
+            ).dict())
+        except DuplicateKeyError:
+            # A concurrent upload recorded it first
+            pass
+    
+    filename = f"{uuid.uuid4()}_{file.filename}"
+    file_path = storage_key("templates", filename)
+    await run_blocking(storage.save, file_path, file.file)
+    variables, file_hash = await process_template_file(file_path)
+    
+    version = ContractTemplateVersion(
+        template_id=template_id,
+        version=current["version"] + 1,
+        file_path=file_path,
+        file_hash=file_hash,
+        variables=variables
+    )
+    try:
+        await template_version_repo.insert_one(version.dict())
+    except DuplicateKeyError:
+        await run_blocking(storage.delete, file_path)
+        raise HTTPException(status_code=409, detail="Template was updated concurrently, please retry")
+    
+    updated = await template_repo.update_by_id(template_id, {"$set": {
+        "file_path": version.file_path,
+        "variables": variables,
+        "version": version.version,
+        "updated_at": datetime.utcnow()
+    }})
+    if not updated:
+        # Deleted while the upload was processed
+        raise HTTPException(status_code=404, detail="Contract template not found")
+    await bump_collection_version("contract_templates")
+    return ContractTemplate(**updated)
+
+@api_router.get("/contract-templates/{template_id}/versions", response_model=List[ContractTemplateVersion])
+async def get_contract_template_versions(template_id: str, current_user: User = Depends(get_current_user)):
+    if not await template_repo.exists({"id": template_id}):
+        raise HTTPException(status_code=404, detail="Contract template not found")
+    
+    versions = await template_version_repo.find({"template_id": template_id}).sort("version", 1).to_list(1000)
+    return [ContractTemplateVersion(**version) for version in versions]
+
 @api_router.get("/contract-templates", response_model=List[ContractTemplate])
-async def get_contract_templates(current_user: User = Depends(get_current_user)):
-    templates = await db.contract_templates.find().to_list(1000)
+async def get_contract_templates(
+    request: Request,
+    response: Response,
+    q: Optional[str] = None,
+    skip: int = 0,
+    limit: int = LIST_MAX_LIMIT,
+    current_user: User = Depends(get_current_user)
+):
+    not_modified = await check_not_modified(request, response, current_user, "contract_templates")
+    if not_modified:
+        return not_modified
+    
+    limit = max(1, min(limit, LIST_MAX_LIMIT))
+    cursor = template_repo.find(name_prefix_query(q)).sort([("created_at", -1), ("id", -1)]).skip(max(skip, 0)).limit(limit)
+    templates = await cursor.to_list(limit)
     return [ContractTemplate(**template) for template in templates]
 
 @api_router.get("/contract-templates/{template_id}", response_model=ContractTemplate)
-async def get_contract_template(template_id: str, current_user: User = Depends(get_current_user)):
-    template = await db.contract_templates.find_one({"id": template_id})
+async def get_contract_template(template_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    not_modified = await check_not_modified(request, response, current_user, "contract_templates")
+    if not_modified:
+        return not_modified
+    
+    template = await template_repo.get_by_id(template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Contract template not found")
     return ContractTemplate(**template)
 
 @api_router.get("/contract-templates/{template_id}/download")
-async def download_contract_template(template_id: str, current_user: User = Depends(get_current_user)):
-    template = await db.contract_templates.find_one({"id": template_id})
+async def download_contract_template(template_id: str, request: Request, current_user: User = Depends(get_current_user)):
+    template = await template_repo.get_by_id(template_id, "file_path")
     if not template:
         raise HTTPException(status_code=404, detail="Contract template not found")
     
-    file_path = Path(template["file_path"])
-    if not file_path.exists():
+    if not await run_blocking(storage.exists, template["file_path"]):
         raise HTTPException(status_code=404, detail="Template file not found")
     
-    return FileResponse(
-        path=file_path, 
-        filename=file_path.name, 
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    return await storage.download_response(
+        template["file_path"],
+        Path(template["file_path"]).name,
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        request
+    )
+
+# Contract Preview Endpoint
+HTML_TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)[^>]*?(/?)>')
+HTML_VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "col", "area", "base", "wbr"}
+preview_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+preview_cache_lock = threading.Lock()
+
+def split_html_blocks(html_content: str) -> List[str]:
+    # Splits mammoth output into its top-level elements
+    blocks = []
+    depth = 0
+    start = 0
+    for match in HTML_TAG_PATTERN.finditer(html_content):
+        closing, tag, self_closing = match.group(1), match.group(2).lower(), match.group(3)
+        if tag in HTML_VOID_TAGS or self_closing:
+            if depth == 0:
+                blocks.append(html_content[start:match.end()])
+                start = match.end()
+            continue
+        depth += -1 if closing else 1
+        if depth == 0:
+            blocks.append(html_content[start:match.end()])
+            start = match.end()
+    if start < len(html_content):
+        blocks.append(html_content[start:])
+    return blocks
+
+@lru_cache(maxsize=64)
+def _compile_template(file_path: str, version_token: str):
+    # Each block becomes [literal, variable, literal, ...] so a render is a join
+    blocks = []
+    for block in split_html_blocks(convert_template_to_html(file_path)):
+        parts = re.split(r'\{\{([^}]+)\}\}', block)
+        blocks.append((tuple(parts), frozenset(parts[1::2])))
+    return tuple(blocks)
+
+def compile_template(file_path: str):
+    return _compile_template(str(file_path), storage.version_token(file_path))
+
+def render_block(parts: tuple, variables: Dict[str, Any]) -> str:
+    return "".join(
+        part if i % 2 == 0 else (str(variables[part]) if part in variables else f"{{{{{part}}}}}")
+        for i, part in enumerate(parts)
+    )
+
+def render_preview(file_path: str, template_key: str, variables: Dict[str, Any], changed_variables: Optional[List[str]]):
+    compiled = compile_template(file_path)
+    used = set().union(*(block_vars for _, block_vars in compiled)) if compiled else set()
+    missing = sorted(used - set(variables))
+    
+    if changed_variables is not None:
+        changed = set(changed_variables)
+        blocks = [
+            PreviewBlock(index=i, html=render_block(parts, variables))
+            for i, (parts, block_vars) in enumerate(compiled) if block_vars & changed
+        ]
+        return len(compiled), missing, None, None, blocks
+    
+    variables_hash = hash_content(json.dumps(variables, sort_keys=True, default=str).encode())
+    cache_key = (template_key, variables_hash)
+    with preview_cache_lock:
+        cached = preview_cache.get(cache_key)
+        if cached is not None:
+            preview_cache.move_to_end(cache_key)
+    if cached is None:
+        html_content = "".join(render_block(parts, variables) for parts, _ in compiled)
+        cached = (base64.b64encode(html_content.encode()).decode(), hash_content(html_content.encode()))
+        with preview_cache_lock:
+            preview_cache[cache_key] = cached
+            while len(preview_cache) > PREVIEW_CACHE_SIZE:
+                preview_cache.popitem(last=False)
+    return len(compiled), missing, cached[0], cached[1], None
+
+@api_router.post("/contracts/preview", response_model=ContractPreview, dependencies=[Depends(admission("render"))])
+async def preview_contract(preview: ContractPreviewRequest, current_user: User = Depends(get_current_user)):
+    # Renders in memory only: no file is written and no contract is stored
+    template = await template_repo.get_by_id(preview.template_id, "id", "version", "file_path")
+    if not template:
+        raise HTTPException(status_code=404, detail="Contract template not found")
+    version = await get_template_version(template, preview.template_version)
+    template_key = version.get("file_hash") or f"{version['file_path']}:{version['version']}"
+    
+    try:
+        block_count, missing, content, content_hash, blocks = await run_blocking(
+            render_preview, version["file_path"], template_key, preview.variables, preview.changed_variables
+        )
+    except Exception as e:
+        logging.error(f"Error rendering preview: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error rendering preview: {str(e)}")
+    
+    return ContractPreview(
+        template_id=preview.template_id,
+        template_version=version["version"],
+        block_count=block_count,
+        missing_variables=missing,
+        content=content,
+        content_hash=content_hash,
+        blocks=blocks
     )
 
 # Contract Generation Endpoint
-@api_router.post("/contracts/generate", response_model=Contract)
+def build_contract(supplier_id: str, template_id: str, version: Dict[str, Any], variables: Dict[str, Any]) -> tuple:
+    # Blocking part of generate_contract: render, hash and, when materialized, store the file.
+    # Contracts only exist as HTML. The .docx is the template, stored once per immutable
+    # version and shared by every contract pinned to it; no per-contract DOCX is written
+    # (there is no docx writer in the tree), so render mode has no DOCX copy to drop
+    html_content = render_contract_html(version["file_path"], variables)
+    data = html_content.encode()
+    
+    # Store as base64 for display in frontend
+    contract = Contract(
+        supplier_id=supplier_id,
+        template_id=template_id,
+        template_version=version["version"],
+        variables=variables,
+        storage_mode=CONTRACT_STORAGE_MODE,
+        content_hash=hash_content(data),
+        content=base64.b64encode(data).decode()
+    )
+    
+    if CONTRACT_STORAGE_MODE == "render":
+        # Only variables and the pinned version are persisted
+        return contract, contract.dict(exclude={"content"})
+    
+    # Create contract file, compressed once here and served as stored
+    contract_filename = f"contract_{supplier_id}_{template_id}_{contract.id}.html"
+    encoding = CONTRACT_COMPRESSION if CONTRACT_COMPRESSION in CONTENT_ENCODING_SUFFIXES else None
+    if encoding:
+        contract_filename += CONTENT_ENCODING_SUFFIXES[encoding]
+        data = compress_content(data, encoding)
+    contract.file_path = storage_key("contracts", contract_filename)
+    contract.content_encoding = encoding
+    storage.write_bytes(contract.file_path, data)
+    
+    # Compressed contracts are not duplicated as base64 in the document
+    return contract, contract.dict(exclude={"content"} if encoding else None)
+
+@api_router.post("/contracts/generate", response_model=Contract, dependencies=[Depends(admission("render"))])
 async def generate_contract(
     supplier_id: str = Form(...),
     template_id: str = Form(...),
@@ -416,10 +2801,10 @@ async def generate_contract(
         raise HTTPException(status_code=403, detail="Not authorized to generate contracts for this supplier")
     
     # Validate supplier and template exist
-    supplier = await db.suppliers.find_one({"id": supplier_id})
-    template = await db.contract_templates.find_one({"id": template_id})
+    supplier_exists = await supplier_repo.exists({"id": supplier_id})
+    template = await template_repo.get_by_id(template_id, "id", "version", "file_path")
     
-    if not supplier:
+    if not supplier_exists:
         raise HTTPException(status_code=404, detail="Supplier not found")
     if not template:
         raise HTTPException(status_code=404, detail="Contract template not found")
@@ -432,45 +2817,93 @@ async def generate_contract(
     
     # Read template content
     try:
-        with open(template["file_path"], "rb") as f:
-            template_content = f.read()
-        
-        # Convert to HTML
-        result = mammoth.convert_to_html(io.BytesIO(template_content))
-        html_content = result.value
-        
-        # Replace variables in HTML
-        for var_name, var_value in variables_dict.items():
-            html_content = html_content.replace(f"{{{{{var_name}}}}}", str(var_value))
+        # Render the template version the contract is pinned to
+        version = await get_template_version(template)
+        contract, contract_doc = await run_blocking(build_contract, supplier_id, template_id, version, variables_dict)
         
-        # Store as base64 for display in frontend
-        content_b64 = base64.b64encode(html_content.encode()).decode()
-        
-        # Create contract file
-        contract_filename = f"contract_{supplier_id}_{template_id}_{uuid.uuid4()}.html"
-        contract_path = str(CONTRACTS_DIR / contract_filename)
-        
-        with open(CONTRACTS_DIR / contract_filename, "w") as f:
-            f.write(html_content)
-        
-        contract = Contract(
-            supplier_id=supplier_id,
-            template_id=template_id,
-            file_path=contract_path,
-            variables=variables_dict,
-            content=content_b64
-        )
+        # The notification is queued with the contract and sent later by the dispatcher
+        notification = contract_generated_message(contract)
+        async def write(session):
+            await contract_repo.insert_one(contract_doc, session=session)
+            await db.outbox.insert_one(notification.dict(), session=session)
+        await in_transaction(write)
         
-        await db.contracts.insert_one(contract.dict())
+        await bump_collection_version("contracts")
+        publish_event("contract.created", supplier_id, id=contract.id, status=contract.status)
         return contract
     
+    except HTTPException:
+        raise
+    
     except Exception as e:
         logging.error(f"Error generating contract: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating contract: {str(e)}")
 
-@api_router.get("/contracts", response_model=List[Contract])
-async def get_contracts(supplier_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
-    query = {}
+# Filtered list queries
+def parse_range(field: str, low: Any, high: Any, parse=None) -> Dict[str, Any]:
+    # Half-open range like the exports: low <= value < high
+    condition = {}
+    try:
+        if low is not None and low != "":
+            condition["$gte"] = parse(low) if parse else low
+        if high is not None and high != "":
+            condition["$lt"] = parse(high) if parse else high
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field} range. Use ISO format (YYYY-MM-DD)")
+    return condition
+
+def build_list_query(
+    collection: str,
+    supplier_id: Optional[str],
+    status: Optional[str],
+    ranges: Dict[str, Dict[str, Any]],
+    sort: str
+) -> tuple:
+    direction = -1 if sort.startswith("-") else 1
+    sort_field = sort.lstrip("-")
+    if sort_field not in LIST_SORT_FIELDS[collection]:
+        raise HTTPException(status_code=400, detail=f"Invalid sort field. Use one of {LIST_SORT_FIELDS[collection]}")
+    if status and status not in LIST_STATUSES[collection]:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Use one of {LIST_STATUSES[collection]}")
+    
+    # Equality fields first, then the sort, then ranges, so the planner walks one
+    # index in sort order. Without a status filter there is no status condition at
+    # all: documents with a missing or legacy status must still be listed
+    query: Dict[str, Any] = {}
+    if supplier_id:
+        query["supplier_id"] = supplier_id
+    if status:
+        query["status"] = status
+    for field, condition in ranges.items():
+        if condition:
+            query[field] = condition
+    return query, [(sort_field, direction), ("id", direction)]
+
+def list_query_index_name(collection: str, supplier_id: Optional[str], status: Optional[str], sort: str) -> str:
+    # Name of the index the planner is expected to pick, checked in tests
+    prefix = ["supplier_id"] if supplier_id else ["status"] if status else []
+    keys = prefix + [sort.lstrip("-"), "id"]
+    return "_".join(f"{key}_1" for key in keys)
+
+@api_router.get("/contracts", response_model=List[ContractListEntry])
+async def get_contracts(
+    request: Request,
+    response: Response,
+    supplier_id: Optional[str] = None,
+    status: Optional[str] = None,
+    signed_from: Optional[str] = None,
+    signed_to: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    sort: str = "-created_at",
+    skip: int = 0,
+    limit: int = LIST_MAX_LIMIT,
+    current_user: User = Depends(get_current_user)
+):
+    # Names are part of the response, so renaming a supplier or template changes the ETag
+    not_modified = await check_not_modified(request, response, current_user, "contracts", "suppliers", "contract_templates")
+    if not_modified:
+        return not_modified
     
     # Enforce permissions:
     # - Admin can view all contracts or filter by supplier
@@ -478,16 +2911,42 @@ async def get_contracts(supplier_id: Optional[str] = None, current_user: User =
     if not current_user.is_admin:
         if not current_user.supplier_id:
             return []
-        query["supplier_id"] = current_user.supplier_id
-    elif supplier_id:
-        query["supplier_id"] = supplier_id
+        supplier_id = current_user.supplier_id
+    
+    query, sort_spec = build_list_query("contracts", supplier_id, status, {
+        "signed_at": parse_range("signed date", signed_from, signed_to, datetime.fromisoformat),
+        "created_at": parse_range("creation date", created_from, created_to, datetime.fromisoformat),
+    }, sort)
     
-    contracts = await db.contracts.find(query).to_list(1000)
-    return [Contract(**contract) for contract in contracts]
+    limit = max(1, min(limit, LIST_MAX_LIMIT))
+    cursor = contract_repo.find(query, *CONTRACT_LIST_FIELDS).sort(sort_spec).skip(max(skip, 0)).limit(limit)
+    contracts = await cursor.to_list(limit)
+    
+    # One batched lookup per collection for the ids on this page
+    supplier_ids = list({contract["supplier_id"] for contract in contracts})
+    template_ids = list({contract["template_id"] for contract in contracts})
+    supplier_names = {
+        doc["id"]: doc.get("name") for doc in await supplier_repo.find(
+            {"id": {"$in": supplier_ids}}, "id", "name"
+        ).to_list(None)
+    }
+    template_names = {
+        doc["id"]: doc.get("name") for doc in await template_repo.find(
+            {"id": {"$in": template_ids}}, "id", "name"
+        ).to_list(None)
+    }
+    return [
+        ContractListEntry(
+            **contract,
+            supplier_name=supplier_names.get(contract["supplier_id"]),
+            template_name=template_names.get(contract["template_id"]),
+        )
+        for contract in contracts
+    ]
 
 @api_router.get("/contracts/{contract_id}", response_model=Contract)
-async def get_contract(contract_id: str, current_user: User = Depends(get_current_user)):
-    contract = await db.contracts.find_one({"id": contract_id})
+async def get_contract(contract_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    contract = await contract_repo.get_by_id(contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     
@@ -495,11 +2954,49 @@ async def get_contract(contract_id: str, current_user: User = Depends(get_curren
     if not current_user.is_admin and current_user.supplier_id != contract["supplier_id"]:
         raise HTTPException(status_code=403, detail="Not authorized to view this contract")
     
+    # Only after the 404/403 checks, so a cached ETag can't skip them
+    not_modified = await check_not_modified(request, response, current_user, "contracts")
+    if not_modified:
+        return not_modified
+    
+    contract["content"] = await load_contract_content(contract)
     return Contract(**contract)
 
+@api_router.get("/contracts/{contract_id}/content")
+async def get_contract_html(contract_id: str, request: Request, current_user: User = Depends(get_current_user)):
+    contract = await contract_repo.get_by_id(contract_id)
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    
+    # Check permissions - admin can view any contract, non-admin only their supplier's
+    if not current_user.is_admin and current_user.supplier_id != contract["supplier_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to view this contract")
+    
+    encoding = contract.get("content_encoding")
+    stored_encoded = contract.get("storage_mode", "materialized") != "render" and encoding and contract.get("content") is None
+    send_encoded = stored_encoded and accepts_encoding(request, encoding)
+    
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "private, no-cache"}
+    if contract.get("content_hash"):
+        # Encoded and identity bodies differ byte for byte, so each gets its own strong ETag
+        headers["ETag"] = f'"{contract["content_hash"]}-{encoding}"' if send_encoded else f'"{contract["content_hash"]}"'
+        if headers["ETag"] in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers=headers)
+    
+    if stored_encoded:
+        data = await run_blocking(storage.read_bytes, contract["file_path"])
+        if send_encoded:
+            # The stored bytes go out untouched
+            headers["Content-Encoding"] = encoding
+            return Response(content=data, media_type="text/html; charset=utf-8", headers=headers)
+        data = await run_blocking(decompress_content, data, encoding)
+    else:
+        data = base64.b64decode(await load_contract_content(contract) or "")
+    return Response(content=data, media_type="text/html; charset=utf-8", headers=headers)
+
 @api_router.post("/contracts/{contract_id}/sign", response_model=Contract)
-async def sign_contract(contract_id: str, current_user: User = Depends(get_current_user)):
-    contract = await db.contracts.find_one({"id": contract_id})
+async def sign_contract(contract_id: str, request: Request, current_user: User = Depends(get_current_user)):
+    contract = await contract_repo.get_by_id(contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     
@@ -509,12 +3006,29 @@ async def sign_contract(contract_id: str, current_user: User = Depends(get_curre
     
     # Update contract
     now = datetime.utcnow()
-    await db.contracts.update_one(
-        {"id": contract_id},
-        {"$set": {"status": "signed", "signed_at": now}}
-    )
+    update_data = {"status": "signed", "signed_at": now}
     
-    updated = await db.contracts.find_one({"id": contract_id})
+    # Freeze what was signed so later template changes can never alter it
+    if contract.get("storage_mode") == "render" and CONTRACT_SNAPSHOT_ON_SIGN and not contract.get("snapshot"):
+        content_b64 = await load_contract_content(contract)
+        update_data["snapshot"] = zlib.compress(base64.b64decode(content_b64), 9)
+    
+    updated = await contract_repo.update_by_id(contract_id, {"$set": update_data})
+    if not updated:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    await bump_collection_version("contracts")
+    publish_event("contract.status", contract["supplier_id"], id=contract_id, status="signed")
+    audit_writer.record(AuditEvent(
+        entity_type="contract",
+        entity_id=contract_id,
+        action="signed",
+        actor_id=current_user.id,
+        supplier_id=contract["supplier_id"],
+        ip_address=client_ip(request),
+        data={"previous_status": contract.get("status"), "content_hash": contract.get("content_hash")}
+    ))
+    
+    updated["content"] = await load_contract_content(updated)
     return Contract(**updated)
 
 # General Conditions Endpoints
@@ -522,17 +3036,23 @@ async def sign_contract(contract_id: str, current_user: User = Depends(get_curre
 async def create_general_conditions(gc: GeneralConditions, current_user: User = Depends(get_current_admin_user)):
     if gc.is_active:
         # Deactivate all other general conditions if this one is active
-        await db.general_conditions.update_many(
+        await gc_repo.update_many(
             {"is_active": True},
             {"$set": {"is_active": False}}
         )
     
-    await db.general_conditions.insert_one(gc.dict())
+    await gc_repo.insert_one(gc.dict())
+    await bump_collection_version("general_conditions")
+    publish_event("gc.published", None, id=gc.id, version=gc.version, is_active=gc.is_active)
     return gc
 
 @api_router.get("/general-conditions/active", response_model=GeneralConditions)
-async def get_active_general_conditions(current_user: User = Depends(get_current_user)):
-    gc = await db.general_conditions.find_one({"is_active": True})
+async def get_active_general_conditions(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    not_modified = await check_not_modified(request, response, current_user, "general_conditions")
+    if not_modified:
+        return not_modified
+    
+    gc = await gc_repo.get({"is_active": True})
     if not gc:
         raise HTTPException(status_code=404, detail="No active general conditions found")
     return GeneralConditions(**gc)
@@ -540,6 +3060,7 @@ async def get_active_general_conditions(current_user: User = Depends(get_current
 @api_router.post("/suppliers/{supplier_id}/accept-gc", response_model=SupplierGCAcceptance)
 async def accept_general_conditions(
     supplier_id: str,
+    request: Request,
     gc_id: str = Body(...),
     ip_address: Optional[str] = Body(None),
     current_user: User = Depends(get_current_user)
@@ -549,41 +3070,48 @@ async def accept_general_conditions(
         raise HTTPException(status_code=403, detail="Not authorized to accept for this supplier")
     
     # Validate supplier and GC exist
-    supplier = await db.suppliers.find_one({"id": supplier_id})
-    gc = await db.general_conditions.find_one({"id": gc_id})
+    supplier_exists = await supplier_repo.exists({"id": supplier_id})
+    gc = await gc_repo.get_by_id(gc_id, "version")
     
-    if not supplier:
+    if not supplier_exists:
         raise HTTPException(status_code=404, detail="Supplier not found")
     if not gc:
         raise HTTPException(status_code=404, detail="General conditions not found")
     
+    # The address is the one the request came from; a client-supplied one is only kept as a claim
+    observed_ip = client_ip(request)
     acceptance = SupplierGCAcceptance(
         supplier_id=supplier_id,
         gc_id=gc_id,
-        ip_address=ip_address
+        ip_address=observed_ip
     )
     
-    await db.gc_acceptances.insert_one(acceptance.dict())
+    await gc_acceptance_repo.insert_one(acceptance.dict())
+    await bump_collection_version("gc_acceptances")
+    publish_event("gc.accepted", supplier_id, id=acceptance.id, gc_id=gc_id)
+    audit_writer.record(AuditEvent(
+        entity_type="gc_acceptance",
+        entity_id=acceptance.id,
+        action="accepted",
+        actor_id=current_user.id,
+        supplier_id=supplier_id,
+        ip_address=observed_ip,
+        data={"gc_id": gc_id, "gc_version": gc.get("version"), "claimed_ip_address": ip_address}
+    ))
     return acceptance
 
 @api_router.get("/suppliers/{supplier_id}/gc-status", response_model=bool)
-async def check_gc_acceptance(supplier_id: str, current_user: User = Depends(get_current_user)):
+async def check_gc_acceptance(supplier_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
     # Check permissions - admin or supplier's own user can check
     if not current_user.is_admin and current_user.supplier_id != supplier_id:
         raise HTTPException(status_code=403, detail="Not authorized to check for this supplier")
     
-    # Get most recent active GC
-    gc = await db.general_conditions.find_one({"is_active": True})
-    if not gc:
-        return False
-    
-    # Check if supplier has accepted this GC
-    acceptance = await db.gc_acceptances.find_one({
-        "supplier_id": supplier_id,
-        "gc_id": gc["id"]
-    })
+    not_modified = await check_not_modified(request, response, current_user, "general_conditions", "gc_acceptances")
+    if not_modified:
+        return not_modified
     
-    return acceptance is not None
+    # Accepted the most recent active GC; False when none is active
+    return bool(await has_accepted_active_gc(supplier_id))
 
 # Invoice Endpoints
 @api_router.post("/invoices", response_model=Invoice)
@@ -595,56 +3123,79 @@ async def create_invoice(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
+    await check_invoice_upload_allowed(supplier_id, current_user)
+    due_date_obj = parse_due_date(due_date)
+    
+    # Save the file
+    filename = f"invoice_{supplier_id}_{uuid.uuid4()}_{file.filename}"
+    file_path = storage_key("invoices", filename)
+    await run_blocking(storage.save, file_path, file.file)
+    
+    return await save_invoice(supplier_id, file_path, amount, due_date_obj, notes)
+
+async def check_invoice_upload_allowed(supplier_id: str, current_user: User):
     # Check permissions - admin or supplier's own user can upload invoices
     if not current_user.is_admin and current_user.supplier_id != supplier_id:
         raise HTTPException(status_code=403, detail="Not authorized to upload invoices for this supplier")
     
     # Check if supplier exists
-    supplier = await db.suppliers.find_one({"id": supplier_id})
-    if not supplier:
+    if not await supplier_repo.exists({"id": supplier_id}):
         raise HTTPException(status_code=404, detail="Supplier not found")
     
     # Check if supplier has accepted general conditions
-    gc = await db.general_conditions.find_one({"is_active": True})
-    if gc:
-        acceptance = await db.gc_acceptances.find_one({
-            "supplier_id": supplier_id,
-            "gc_id": gc["id"]
-        })
-        if not acceptance and not current_user.is_admin:
+    if not current_user.is_admin:
+        if await has_accepted_active_gc(supplier_id) is False:
             raise HTTPException(
                 status_code=400, 
                 detail="Supplier must accept the general conditions before uploading invoices"
             )
-    
-    # Save the file
-    filename = f"invoice_{supplier_id}_{uuid.uuid4()}_{file.filename}"
-    file_path = UPLOAD_DIR / "invoices"
-    file_path.mkdir(exist_ok=True)
-    
-    file_path = file_path / filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
+
+def parse_due_date(due_date: str) -> datetime:
     try:
-        due_date_obj = datetime.fromisoformat(due_date)
+        return datetime.fromisoformat(due_date)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid due date format. Use ISO format (YYYY-MM-DD)")
-    
+
+async def save_invoice(
+    supplier_id: str,
+    file_path: str,
+    amount: float,
+    due_date_obj: datetime,
+    notes: Optional[str]
+) -> Invoice:
     invoice = Invoice(
         supplier_id=supplier_id,
-        file_path=str(file_path),
+        file_path=file_path,
         amount=amount,
         due_date=due_date_obj,
         notes=notes
     )
     
-    await db.invoices.insert_one(invoice.dict())
+    await invoice_repo.insert_one(invoice.dict())
+    await bump_collection_version("invoices")
+    publish_event("invoice.created", supplier_id, id=invoice.id, status=invoice.status)
     return invoice
 
 @api_router.get("/invoices", response_model=List[Invoice])
-async def get_invoices(supplier_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
-    query = {}
+async def get_invoices(
+    request: Request,
+    response: Response,
+    supplier_id: Optional[str] = None,
+    status: Optional[str] = None,
+    due_from: Optional[str] = None,
+    due_to: Optional[str] = None,
+    uploaded_from: Optional[str] = None,
+    uploaded_to: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    sort: str = "-upload_date",
+    skip: int = 0,
+    limit: int = LIST_MAX_LIMIT,
+    current_user: User = Depends(get_current_user)
+):
+    not_modified = await check_not_modified(request, response, current_user, "invoices")
+    if not_modified:
+        return not_modified
     
     # Enforce permissions:
     # - Admin can view all invoices or filter by supplier
@@ -652,16 +3203,22 @@ async def get_invoices(supplier_id: Optional[str] = None, current_user: User = D
     if not current_user.is_admin:
         if not current_user.supplier_id:
             return []
-        query["supplier_id"] = current_user.supplier_id
-    elif supplier_id:
-        query["supplier_id"] = supplier_id
+        supplier_id = current_user.supplier_id
     
-    invoices = await db.invoices.find(query).to_list(1000)
+    query, sort_spec = build_list_query("invoices", supplier_id, status, {
+        "due_date": parse_range("due date", due_from, due_to, datetime.fromisoformat),
+        "upload_date": parse_range("upload date", uploaded_from, uploaded_to, datetime.fromisoformat),
+        "amount": parse_range("amount", min_amount, max_amount),
+    }, sort)
+    
+    limit = max(1, min(limit, LIST_MAX_LIMIT))
+    cursor = invoice_repo.find(query).sort(sort_spec).skip(max(skip, 0)).limit(limit)
+    invoices = await cursor.to_list(limit)
     return [Invoice(**invoice) for invoice in invoices]
 
 @api_router.get("/invoices/{invoice_id}", response_model=Invoice)
-async def get_invoice(invoice_id: str, current_user: User = Depends(get_current_user)):
-    invoice = await db.invoices.find_one({"id": invoice_id})
+async def get_invoice(invoice_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    invoice = await invoice_repo.get_by_id(invoice_id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
@@ -669,16 +3226,22 @@ async def get_invoice(invoice_id: str, current_user: User = Depends(get_current_
     if not current_user.is_admin and current_user.supplier_id != invoice["supplier_id"]:
         raise HTTPException(status_code=403, detail="Not authorized to view this invoice")
     
+    # Only after the 404/403 checks, so a cached ETag can't skip them
+    not_modified = await check_not_modified(request, response, current_user, "invoices")
+    if not_modified:
+        return not_modified
+    
     return Invoice(**invoice)
 
 @api_router.put("/invoices/{invoice_id}/status", response_model=Invoice)
 async def update_invoice_status(
     invoice_id: str, 
+    request: Request,
     status: str = Body(...),
     payment_date: Optional[str] = Body(None),
     current_user: User = Depends(get_current_admin_user)
 ):
-    invoice = await db.invoices.find_one({"id": invoice_id})
+    invoice = await invoice_repo.get_by_id(invoice_id, "id", "supplier_id", "status", "amount")
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
@@ -694,17 +3257,37 @@ async def update_invoice_status(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid payment date format. Use ISO format (YYYY-MM-DD)")
     
-    await db.invoices.update_one(
-        {"id": invoice_id},
-        {"$set": update_data}
-    )
+    async def write(session):
+        updated = await invoice_repo.update_by_id(invoice_id, {"$set": update_data}, session=session)
+        # No notification for an invoice deleted in the meantime
+        if updated is not None and status != invoice.get("status"):
+            await db.outbox.insert_one(invoice_status_message(invoice, status).dict(), session=session)
+        return updated
+    updated = await in_transaction(write)
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    await bump_collection_version("invoices")
+    publish_event("invoice.status", invoice["supplier_id"], id=invoice_id, status=status)
+    audit_writer.record(AuditEvent(
+        entity_type="invoice",
+        entity_id=invoice_id,
+        action="status_changed",
+        actor_id=current_user.id,
+        supplier_id=invoice["supplier_id"],
+        ip_address=client_ip(request),
+        data={
+            "previous_status": invoice.get("status"),
+            "status": status,
+            "amount": invoice.get("amount"),
+            "payment_date": update_data.get("payment_date"),
+        }
+    ))
     
-    updated = await db.invoices.find_one({"id": invoice_id})
     return Invoice(**updated)
 
 @api_router.delete("/invoices/{invoice_id}")
-async def delete_invoice(invoice_id: str, current_user: User = Depends(get_current_user)):
-    invoice = await db.invoices.find_one({"id": invoice_id})
+async def delete_invoice(invoice_id: str, background_tasks: BackgroundTasks, current_user: User = Depends(get_current_user)):
+    invoice = await invoice_repo.get_by_id(invoice_id, "supplier_id", "status", "file_path")
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
@@ -715,19 +3298,1109 @@ async def delete_invoice(invoice_id: str, current_user: User = Depends(get_curre
         if invoice["status"] != "pending":
             raise HTTPException(status_code=400, detail="Cannot delete invoices that are not in 'pending' status")
     
-    # Delete the file if it exists
-    file_path = Path(invoice["file_path"])
-    if file_path.exists():
-        file_path.unlink()
-    
     # Delete the database record
-    await db.invoices.delete_one({"id": invoice_id})
+    await invoice_repo.delete_one({"id": invoice_id})
+    
+    # The file is removed after the response; anything left behind is reclaimed by the orphan GC
+    background_tasks.add_task(run_blocking, storage.delete, invoice["file_path"])
+    await bump_collection_version("invoices")
+    publish_event("invoice.deleted", invoice["supplier_id"], id=invoice_id)
     
     return {"message": "Invoice deleted successfully"}
 
+# Resumable Upload Endpoints
+async def get_upload_session(upload_id: str, current_user: User) -> Dict[str, Any]:
+    session = await upload_session_repo.get_by_id(upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if not current_user.is_admin and session["user_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this upload")
+    return session
+
+@api_router.post("/uploads", response_model=UploadSession)
+async def create_upload_session(session_data: UploadSessionCreate, current_user: User = Depends(get_current_user)):
+    # Validate everything up front so no bytes are sent for an upload that would be rejected
+    if session_data.total_size <= 0 or session_data.total_size > UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=400, detail=f"Upload size must be between 1 and {UPLOAD_MAX_BYTES} bytes")
+    filename = Path(session_data.filename).name
+    
+    if session_data.kind == "invoice":
+        if not session_data.supplier_id or session_data.amount is None or not session_data.due_date:
+            raise HTTPException(status_code=400, detail="Invoice uploads require supplier_id, amount and due_date")
+        await check_invoice_upload_allowed(session_data.supplier_id, current_user)
+        parse_due_date(session_data.due_date)
+        file_path = storage_key("invoices", f"invoice_{session_data.supplier_id}_{uuid.uuid4()}_{filename}")
+    elif session_data.kind == "template":
+        if not current_user.is_admin:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        if not session_data.name:
+            raise HTTPException(status_code=400, detail="Template uploads require a name")
+        file_path = storage_key("templates", f"{uuid.uuid4()}_{filename}")
+    else:
+        raise HTTPException(status_code=400, detail="Invalid upload kind. Use 'invoice' or 'template'")
+    
+    session = UploadSession(
+        kind=session_data.kind,
+        filename=filename,
+        total_size=session_data.total_size,
+        expires_at=datetime.utcnow() + timedelta(seconds=UPLOAD_SESSION_TTL_SECONDS)
+    )
+    upload_token = await run_blocking(storage.begin_upload, file_path)
+    
+    session_doc = session.dict()
+    session_doc.update({
+        "user_id": current_user.id,
+        "file_path": file_path,
+        "storage_upload_id": upload_token,
+        "metadata": session_data.dict(exclude={"kind", "filename", "total_size"}),
+        "lock_until": datetime.min,
+    })
+    await upload_session_repo.insert_one(session_doc)
+    return session
+
+@api_router.get("/uploads/{upload_id}", response_model=UploadSession)
+async def get_upload_status(upload_id: str, current_user: User = Depends(get_current_user)):
+    session = await get_upload_session(upload_id, current_user)
+    return UploadSession(**session)
+
+@api_router.put("/uploads/{upload_id}", response_model=UploadSession, dependencies=[Depends(admission("upload"))])
+async def upload_chunk(upload_id: str, offset: int, request: Request, current_user: User = Depends(get_current_user)):
+    session = await get_upload_session(upload_id, current_user)
+    if session["status"] != "open":
+        raise HTTPException(status_code=409, detail="Upload is no longer open")
+    if offset != session["offset"]:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Chunk offset {offset} does not match upload offset {session['offset']}",
+            headers={"Upload-Offset": str(session["offset"])}
+        )
+    content_length = int(request.headers.get("content-length", "0"))
+    if storage.min_part_size and content_length < storage.min_part_size and offset + content_length < session["total_size"]:
+        raise HTTPException(status_code=400, detail=f"Chunks other than the last must be at least {storage.min_part_size} bytes")
+    
+    # Claim the upload so two chunks for the same offset cannot interleave
+    now = datetime.utcnow()
+    claimed = await upload_session_repo.find_one_and_update(
+        {"id": upload_id, "offset": offset, "status": "open", "lock_until": {"$lt": now}},
+        {"$set": {"lock_until": now + timedelta(seconds=UPLOAD_CHUNK_LOCK_SECONDS)}}
+    )
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Another chunk is being written to this upload")
+    
+    digest = hashlib.sha256()
+    written = 0
+    
+    async def hashed_chunks():
+        nonlocal written
+        async for data in request.stream():
+            if offset + written + len(data) > session["total_size"]:
+                raise HTTPException(status_code=413, detail="Chunk exceeds the declared upload size")
+            digest.update(data)
+            written += len(data)
+            yield data
+    
+    try:
+        # A rejected chunk leaves the offset unchanged, so its retry overwrites it
+        etag = await storage.write_part(
+            session["file_path"], session.get("storage_upload_id"), len(session["parts"]) + 1, offset, hashed_chunks()
+        )
+        expected = request.headers.get("x-chunk-sha256")
+        if expected and expected.lower() != digest.hexdigest():
+            raise HTTPException(status_code=400, detail="Chunk checksum mismatch")
+    except Exception:
+        await upload_session_repo.update_one({"id": upload_id}, {"$set": {"lock_until": datetime.min}})
+        raise
+    
+    update = {
+        "$set": {
+            "offset": offset + written,
+            "lock_until": datetime.min,
+            "expires_at": datetime.utcnow() + timedelta(seconds=UPLOAD_SESSION_TTL_SECONDS),
+        }
+    }
+    if written:
+        update["$push"] = {"parts": UploadPart(offset=offset, size=written, sha256=digest.hexdigest(), etag=etag).dict()}
+    updated = await upload_session_repo.find_one_and_update({"id": upload_id}, update, return_document=ReturnDocument.AFTER)
+    return UploadSession(**updated)
+
+@api_router.post("/uploads/{upload_id}/finalize", response_model=Union[Invoice, ContractTemplate], dependencies=[Depends(admission("render"))])
+async def finalize_upload(upload_id: str, request: Request, current_user: User = Depends(get_current_user)):
+    session = await get_upload_session(upload_id, current_user)
+    if session["offset"] != session["total_size"]:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete: {session['offset']} of {session['total_size']} bytes received",
+            headers={"Upload-Offset": str(session["offset"])}
+        )
+    
+    # Whole-file hash derived from the part hashes, so the file is not read again.
+    # A client that sends X-Upload-Hash (computed the same way) has it checked here
+    part_digests = b"".join(bytes.fromhex(part["sha256"]) for part in session["parts"])
+    upload_hash = f"{hashlib.sha256(part_digests).hexdigest()}-{len(session['parts'])}"
+    expected = request.headers.get("x-upload-hash")
+    if expected and expected.lower() != upload_hash:
+        raise HTTPException(status_code=400, detail="Upload checksum mismatch")
+    
+    # Also takes over a finalize whose worker died, once its lease has run out
+    now = datetime.utcnow()
+    claimed = await upload_session_repo.find_one_and_update(
+        {"id": upload_id, "status": {"$in": ["open", "finalizing"]}, "lock_until": {"$lt": now}},
+        {"$set": {"status": "finalizing", "lock_until": now + timedelta(seconds=UPLOAD_FINALIZE_LOCK_SECONDS)}}
+    )
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Upload is already being finalized")
+    
+    metadata = session["metadata"]
+    
+    try:
+        await run_blocking(storage.complete_upload, session["file_path"], session.get("storage_upload_id"), session["parts"])
+        if session["kind"] == "invoice":
+            await check_invoice_upload_allowed(metadata["supplier_id"], current_user)
+            result = await save_invoice(
+                metadata["supplier_id"],
+                session["file_path"],
+                metadata["amount"],
+                parse_due_date(metadata["due_date"]),
+                metadata.get("notes")
+            )
+        else:
+            result = await save_contract_template(metadata["name"], session["file_path"])
+    except Exception:
+        await upload_session_repo.update_one({"id": upload_id}, {"$set": {"status": "open", "lock_until": datetime.min}})
+        raise
+    
+    await upload_session_repo.update_one(
+        {"id": upload_id},
+        {"$set": {"status": "finalized", "upload_hash": upload_hash, "lock_until": datetime.min}}
+    )
+    return result
+
+@api_router.delete("/uploads/{upload_id}")
+async def abort_upload(upload_id: str, current_user: User = Depends(get_current_user)):
+    session = await get_upload_session(upload_id, current_user)
+    if session["status"] != "open":
+        raise HTTPException(status_code=409, detail="Upload is no longer open")
+    
+    await upload_session_repo.delete_one({"id": upload_id, "status": "open"})
+    await run_blocking(storage.abort_upload, session["file_path"], session.get("storage_upload_id"))
+    return {"message": "Upload aborted"}
+
+async def sweep_expired_uploads():
+    # Removes expired sessions; unfinished ones also lose their partial file
+    now = datetime.utcnow()
+    # A finalize whose lease ran out died with its worker: reopen it for a retry
+    reopened = await upload_session_repo.update_many(
+        {"status": "finalizing", "lock_until": {"$lt": now}},
+        {"$set": {"status": "open", "lock_until": datetime.min}}
+    )
+    if reopened.modified_count:
+        logger.warning(f"Reopened {reopened.modified_count} upload sessions stuck in finalizing")
+    expired = upload_session_repo.find(
+        {"expires_at": {"$lt": now}, "lock_until": {"$lt": now}, "status": {"$ne": "finalizing"}}, "id"
+    )
+    removed = 0
+    async for session in expired:
+        # find_one_and_delete makes the sweep safe to run in every worker
+        deleted = await upload_session_repo.find_one_and_delete({
+            "id": session["id"], "expires_at": {"$lt": now}, "lock_until": {"$lt": now}, "status": {"$ne": "finalizing"}
+        })
+        if deleted is None:
+            continue
+        if deleted["status"] == "open":
+            await run_blocking(storage.abort_upload, deleted["file_path"], deleted.get("storage_upload_id"))
+        removed += 1
+    if removed:
+        logger.info(f"Swept {removed} expired upload sessions")
+
+async def sweep_upload_sessions():
+    while True:
+        await asyncio.sleep(UPLOAD_SWEEP_INTERVAL_SECONDS)
+        try:
+            await sweep_expired_uploads()
+        except Exception as e:
+            logger.error(f"Upload sweep failed: {str(e)}")
+
+# Event Stream Endpoints
+async def get_stream_user(request: Request, token: Optional[str] = None) -> User:
+    # EventSource cannot send headers, so the token may also come as a query parameter
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return await get_current_user(token)
+
+def event_visible_to(event: Dict[str, Any], user: User) -> bool:
+    if user.is_admin or event.get("supplier_id") is None:
+        return True
+    return event.get("supplier_id") == user.supplier_id
+
+@api_router.get("/events/stream")
+async def stream_events(request: Request, current_user: User = Depends(get_stream_user)):
+    if not current_user.is_admin and not current_user.supplier_id:
+        raise HTTPException(status_code=403, detail="Not authorized to subscribe to events")
+    
+    queue = event_broker.subscribe()
+    
+    async def event_generator():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event_visible_to(event, current_user):
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            event_broker.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+CHANGE_STREAM_EVENTS = {
+    "contracts": "contract",
+    "invoices": "invoice",
+    "general_conditions": "gc",
+    "gc_acceptances": "gc",
+}
+
+def change_to_event(change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    collection = change["ns"]["coll"]
+    prefix = CHANGE_STREAM_EVENTS.get(collection)
+    doc = change.get("fullDocument") or {}
+    operation = change["operationType"]
+    if prefix is None:
+        return None
+    if collection == "gc_acceptances":
+        event_type = "gc.accepted"
+    elif collection == "general_conditions":
+        # A new version, or one being activated; deactivations are not announced
+        if operation == "update":
+            updated_fields = change.get("updateDescription", {}).get("updatedFields", {})
+            if updated_fields.get("is_active") is not True:
+                return None
+        elif operation == "replace" and not doc.get("is_active"):
+            return None
+        event_type = "gc.published"
+    elif operation == "insert":
+        event_type = f"{prefix}.created"
+    else:
+        updated_fields = change.get("updateDescription", {}).get("updatedFields", {})
+        if "status" not in updated_fields:
+            return None
+        event_type = f"{prefix}.status"
+    
+    event = {"type": event_type, "supplier_id": doc.get("supplier_id"), "id": doc.get("id")}
+    for field in ("status", "gc_id", "version", "is_active"):
+        if field in doc:
+            event[field] = doc[field]
+    return event
+
+async def follow_change_stream():
+    # Deletes are not followed: their change events carry no supplier_id to scope them by
+    pipeline = [{"$match": {
+        "ns.coll": {"$in": list(CHANGE_STREAM_EVENTS)},
+        "operationType": {"$in": ["insert", "update", "replace"]},
+    }}]
+    resume_token = None
+    while True:
+        try:
+            async with db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    event = change_to_event(change)
+                    if event:
+                        event_broker.publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Change stream interrupted: {str(e)}")
+            await asyncio.sleep(5)
+
+# Forecast Endpoints
+forecast_cache: "OrderedDict[str, CashFlowForecast]" = OrderedDict()
+
+def parse_payment_rule(rule: Optional[str]):
+    # "30", "30 days", "45 jours fin de mois", "end of month"... -> (days, end_of_month)
+    if not rule:
+        return None
+    text = rule.lower()
+    days_match = re.search(r'\d+', text)
+    end_of_month = "end of month" in text or "fin de mois" in text or "eom" in text
+    if not days_match and not end_of_month:
+        return None
+    return (int(days_match.group()) if days_match else 0, end_of_month)
+
+def project_payout_days(
+    due_days: np.ndarray,
+    upload_days: np.ndarray,
+    supplier_index: np.ndarray,
+    rule_days: np.ndarray,
+    rule_end_of_month: np.ndarray,
+    has_rule: np.ndarray,
+    shift_days: int
+) -> np.ndarray:
+    # Suppliers with a parsable rule are paid rule_days after upload, others on the due date
+    ruled = has_rule[supplier_index]
+    payout = np.where(ruled, upload_days + rule_days[supplier_index].astype("timedelta64[D]"), due_days)
+    month_end = (payout.astype("datetime64[M]") + 1).astype("datetime64[D]") - np.timedelta64(1, "D")
+    payout = np.where(ruled & rule_end_of_month[supplier_index], month_end, payout)
+    return payout + np.timedelta64(shift_days, "D")
+
+@api_router.get("/forecast/cash-flow", response_model=CashFlowForecast)
+async def get_cash_flow_forecast(
+    start_date: Optional[str] = None,
+    horizon_days: int = 90,
+    bucket: str = "day",
+    supplier_id: Optional[str] = None,
+    apply_payment_rules: bool = False,
+    rule_overrides: Optional[str] = None,
+    shift_days: int = 0,
+    top_suppliers: int = 20,
+    current_user: User = Depends(get_current_admin_user)
+):
+    if bucket not in ("day", "week"):
+        raise HTTPException(status_code=400, detail="Invalid bucket. Use 'day' or 'week'")
+    if horizon_days < 1 or horizon_days > FORECAST_MAX_HORIZON_DAYS:
+        raise HTTPException(status_code=400, detail=f"horizon_days must be between 1 and {FORECAST_MAX_HORIZON_DAYS}")
+    try:
+        start = np.datetime64(datetime.fromisoformat(start_date).date() if start_date else datetime.utcnow().date(), "D")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid start date format. Use ISO format (YYYY-MM-DD)")
+    try:
+        overrides = json.loads(rule_overrides) if rule_overrides else {}
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="rule_overrides must be a JSON object of supplier_id to payment rule")
+    if not isinstance(overrides, dict):
+        raise HTTPException(status_code=400, detail="rule_overrides must be a JSON object of supplier_id to payment rule")
+    
+    # Cached per parameter set and per data version, so any invoice or supplier write invalidates it
+    versions = await get_collection_versions("invoices", "suppliers")
+    cache_key = json.dumps([
+        str(start), horizon_days, bucket, supplier_id, apply_payment_rules, overrides, shift_days, top_suppliers, versions
+    ], sort_keys=True)
+    cached = forecast_cache.get(cache_key)
+    if cached is not None:
+        forecast_cache.move_to_end(cache_key)
+        return cached
+    
+    query = {"status": "pending"}
+    if supplier_id:
+        query["supplier_id"] = supplier_id
+    
+    # Pull only the needed fields straight into column lists
+    supplier_codes: Dict[str, int] = {}
+    codes, amounts, due_dates, upload_dates = [], [], [], []
+    cursor = invoice_repo.find(query, "supplier_id", "amount", "due_date", "upload_date", batch_size=5000)
+    async for invoice in cursor:
+        codes.append(supplier_codes.setdefault(invoice["supplier_id"], len(supplier_codes)))
+        amounts.append(invoice["amount"])
+        due_dates.append(invoice["due_date"])
+        upload_dates.append(invoice.get("upload_date") or invoice["due_date"])
+    
+    supplier_ids = list(supplier_codes)
+    suppliers = {
+        doc["id"]: doc for doc in await supplier_repo.find(
+            {"id": {"$in": supplier_ids}}, "id", "name", "payment_rule"
+        ).to_list(None)
+    }
+    
+    # Per-supplier rule columns, indexed by supplier code
+    rules = [overrides.get(sid, suppliers.get(sid, {}).get("payment_rule")) for sid in supplier_ids]
+    parsed = [parse_payment_rule(rule) if apply_payment_rules or sid in overrides else None
+              for sid, rule in zip(supplier_ids, rules)]
+    has_rule = np.array([p is not None for p in parsed], dtype=bool)
+    rule_days = np.array([p[0] if p else 0 for p in parsed], dtype=np.int64)
+    rule_end_of_month = np.array([p[1] if p else False for p in parsed], dtype=bool)
+    
+    supplier_index = np.array(codes, dtype=np.int64)
+    amount_array = np.array(amounts, dtype=np.float64)
+    due_days = np.array(due_dates, dtype="datetime64[D]")
+    upload_days = np.array(upload_dates, dtype="datetime64[D]")
+    
+    payout = project_payout_days(
+        due_days, upload_days, supplier_index, rule_days, rule_end_of_month, has_rule, shift_days
+    )
+    offsets = (payout - start).astype(np.int64)
+    bucket_size = 7 if bucket == "week" else 1
+    n_buckets = -(-horizon_days // bucket_size)
+    
+    overdue = offsets < 0
+    beyond = offsets >= horizon_days
+    in_range = ~overdue & ~beyond
+    bucket_index = offsets[in_range] // bucket_size
+    
+    totals = np.bincount(bucket_index, weights=amount_array[in_range], minlength=n_buckets)
+    by_supplier = np.bincount(
+        supplier_index[in_range] * n_buckets + bucket_index,
+        weights=amount_array[in_range],
+        minlength=len(supplier_ids) * n_buckets
+    ).reshape(len(supplier_ids), n_buckets)
+    supplier_totals = by_supplier.sum(axis=1)
+    
+    top = np.argsort(-supplier_totals, kind="stable")[:max(0, top_suppliers)]
+    bucket_starts = start + np.arange(n_buckets) * np.timedelta64(bucket_size, "D")
+    
+    forecast = CashFlowForecast(
+        start_date=str(start),
+        bucket=bucket,
+        buckets=[str(day) for day in bucket_starts],
+        totals=np.round(totals, 2).tolist(),
+        total=round(float(totals.sum()), 2),
+        overdue_total=round(float(amount_array[overdue].sum()), 2),
+        beyond_horizon_total=round(float(amount_array[beyond].sum()), 2),
+        invoice_count=len(amount_array),
+        suppliers=[
+            SupplierCashFlow(
+                supplier_id=supplier_ids[i],
+                name=suppliers.get(supplier_ids[i], {}).get("name"),
+                payment_rule=rules[i],
+                total=round(float(supplier_totals[i]), 2),
+                series=np.round(by_supplier[i], 2).tolist()
+            )
+            for i in top if supplier_totals[i] > 0
+        ]
+    )
+    
+    forecast_cache[cache_key] = forecast
+    while len(forecast_cache) > FORECAST_CACHE_SIZE:
+        forecast_cache.popitem(last=False)
+    return forecast
+
+# Outbox Endpoints
+@api_router.get("/admin/outbox")
+async def get_outbox_status(current_user: User = Depends(get_current_admin_user)):
+    counts = await db.outbox.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]).to_list(None)
+    failed = await db.outbox.find(
+        {"status": "failed"}, {"_id": 0, "body": 0}
+    ).sort("next_attempt_at", -1).limit(20).to_list(20)
+    return {
+        "delivery_enabled": bool(SMTP_HOST),
+        "counts": {doc["_id"]: doc["count"] for doc in counts},
+        "recent_failures": failed,
+    }
+
+@api_router.post("/admin/outbox/{message_id}/retry")
+async def retry_outbox_message(message_id: str, current_user: User = Depends(get_current_admin_user)):
+    result = await db.outbox.update_one(
+        {"id": message_id, "status": "failed"},
+        {"$set": {"status": "pending", "attempts": 0, "next_attempt_at": datetime.utcnow()}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Failed outbox message not found")
+    return {"message": "Message queued for delivery"}
+
+# Audit Endpoints
+@api_router.get("/audit", response_model=List[AuditEvent])
+async def get_audit_events(
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    supplier_id: Optional[str] = None,
+    limit: int = 100,
+    current_user: User = Depends(get_current_admin_user)
+):
+    if entity_id and not entity_type:
+        raise HTTPException(status_code=400, detail="entity_id requires entity_type")
+    query = {}
+    if entity_type:
+        query["entity_type"] = entity_type
+    if entity_id:
+        query["entity_id"] = entity_id
+    if supplier_id:
+        query["supplier_id"] = supplier_id
+    
+    events = await db.audit_log.find(query, {"_id": 0}).sort("at", -1).limit(max(1, min(limit, 1000))).to_list(None)
+    return [AuditEvent(**event) for event in events]
+
+# Export Endpoints
+EXPORT_FORMATS = {"csv", "ndjson", "parquet"}
+
+# Column name and type for each export, in output order
+EXPORT_FIELDS = {
+    "invoices": [
+        ("id", "string"),
+        ("supplier_id", "string"),
+        ("supplier_name", "string"),
+        ("supplier_siret", "string"),
+        ("supplier_vat_number", "string"),
+        ("amount", "float"),
+        ("due_date", "datetime"),
+        ("upload_date", "datetime"),
+        ("status", "string"),
+        ("payment_date", "datetime"),
+        ("notes", "string"),
+    ],
+    "contracts": [
+        ("id", "string"),
+        ("supplier_id", "string"),
+        ("supplier_name", "string"),
+        ("supplier_siret", "string"),
+        ("template_id", "string"),
+        ("template_version", "int"),
+        ("status", "string"),
+        ("created_at", "datetime"),
+        ("signed_at", "datetime"),
+    ],
+}
+
+EXPORT_DATE_FIELDS = {
+    "invoices": {"due_date", "upload_date", "payment_date"},
+    "contracts": {"created_at", "signed_at"},
+}
+
+def build_export_pipeline(
+    collection: str,
+    date_field: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    status: Optional[str],
+    supplier_id: Optional[str]
+) -> List[Dict[str, Any]]:
+    if date_field not in EXPORT_DATE_FIELDS[collection]:
+        raise HTTPException(status_code=400, detail=f"Invalid date field. Use one of {sorted(EXPORT_DATE_FIELDS[collection])}")
+    
+    match: Dict[str, Any] = {}
+    date_range = {}
+    try:
+        if start_date:
+            date_range["$gte"] = datetime.fromisoformat(start_date)
+        if end_date:
+            date_range["$lt"] = datetime.fromisoformat(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use ISO format (YYYY-MM-DD)")
+    if date_range:
+        match[date_field] = date_range
+    if status:
+        match["status"] = status
+    if supplier_id:
+        match["supplier_id"] = supplier_id
+    
+    fields = [name for name, _ in EXPORT_FIELDS[collection]]
+    projection = {name: 1 for name in fields if not name.startswith("supplier_") or name == "supplier_id"}
+    projection.update({
+        "_id": 0,
+        "supplier_name": {"$first": "$supplier.name"},
+        "supplier_siret": {"$first": "$supplier.siret"},
+    })
+    if "supplier_vat_number" in fields:
+        projection["supplier_vat_number"] = {"$first": "$supplier.vat_number"}
+    
+    return [
+        {"$match": match},
+        {"$sort": {date_field: 1, "id": 1}},
+        {"$lookup": {
+            "from": "suppliers",
+            "localField": "supplier_id",
+            "foreignField": "id",
+            "pipeline": [{"$project": {"_id": 0, "name": 1, "siret": 1, "vat_number": 1}}],
+            "as": "supplier",
+        }},
+        {"$project": projection},
+    ]
+
+def format_export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+async def iter_export_batches(collection: str, pipeline: List[Dict[str, Any]], batch_size: int):
+    cursor = repositories[collection].aggregate(pipeline, batchSize=batch_size, allowDiskUse=True)
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def stream_text_export(collection: str, pipeline: List[Dict[str, Any]], export_format: str, batch_size: int):
+    # gzip-compresses each batch as it comes off the cursor
+    fields = [name for name, _ in EXPORT_FIELDS[collection]]
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield compressor.compress(buffer.getvalue().encode())
+    
+    async for batch in iter_export_batches(collection, pipeline, batch_size):
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([[format_export_value(doc.get(name)) for name in fields] for doc in batch])
+            chunk = buffer.getvalue()
+        else:
+            chunk = "".join(
+                json.dumps({name: format_export_value(doc.get(name)) for name in fields}) + "\n" for doc in batch
+            )
+        compressed = compressor.compress(chunk.encode())
+        if compressed:
+            yield compressed
+    
+    yield compressor.flush()
+
+async def stream_parquet_export(collection: str, pipeline: List[Dict[str, Any]], batch_size: int):
+    # One row group per batch; Parquet compresses internally so there is no outer gzip
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    arrow_types = {"string": pa.string(), "float": pa.float64(), "int": pa.int64(), "datetime": pa.timestamp("ms")}
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in EXPORT_FIELDS[collection]])
+    sink = io.BytesIO()
+    writer = pq.ParquetWriter(sink, schema, compression="gzip")
+    
+    def drain():
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+    
+    async for batch in iter_export_batches(collection, pipeline, batch_size):
+        table = pa.Table.from_pylist([{name: doc.get(name) for name in schema.names} for doc in batch], schema=schema)
+        writer.write_table(table)
+        data = drain()
+        if data:
+            yield data
+    
+    writer.close()
+    yield drain()
+
+def export_response(
+    collection: str,
+    export_format: str,
+    batch_size: int,
+    pipeline: List[Dict[str, Any]]
+) -> StreamingResponse:
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Use one of {sorted(EXPORT_FORMATS)}")
+    batch_size = max(1, min(batch_size, EXPORT_MAX_BATCH_SIZE))
+    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    
+    if export_format == "parquet":
+        body = stream_parquet_export(collection, pipeline, batch_size)
+        filename = f"{collection}_{timestamp}.parquet"
+        media_type = "application/vnd.apache.parquet"
+    else:
+        body = stream_text_export(collection, pipeline, export_format, batch_size)
+        filename = f"{collection}_{timestamp}.{export_format}.gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@api_router.get("/exports/invoices", dependencies=[Depends(require_uniform_ids)])
+async def export_invoices(
+    format: str = "csv",
+    date_field: str = "due_date",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    status: Optional[str] = None,
+    supplier_id: Optional[str] = None,
+    batch_size: int = EXPORT_DEFAULT_BATCH_SIZE,
+    current_user: User = Depends(get_current_admin_user)
+):
+    pipeline = build_export_pipeline("invoices", date_field, start_date, end_date, status, supplier_id)
+    return export_response("invoices", format, batch_size, pipeline)
+
+@api_router.get("/exports/contracts", dependencies=[Depends(require_uniform_ids)])
+async def export_contracts(
+    format: str = "csv",
+    date_field: str = "created_at",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    status: Optional[str] = None,
+    supplier_id: Optional[str] = None,
+    batch_size: int = EXPORT_DEFAULT_BATCH_SIZE,
+    current_user: User = Depends(get_current_admin_user)
+):
+    pipeline = build_export_pipeline("contracts", date_field, start_date, end_date, status, supplier_id)
+    return export_response("contracts", format, batch_size, pipeline)
+
+# Admission Control Endpoints
+@api_router.get("/admin/admission")
+async def get_admission_stats(current_user: User = Depends(get_current_admin_user)):
+    # Per-process figures: each uvicorn worker has its own gates
+    return {"worker": WORKER_ID, "classes": {name: gate.stats() for name, gate in admission_gates.items()}}
+
+# Slow Query Endpoints
+async def explain_slow_query(key: str, database_name: str, command: Dict[str, Any]):
+    try:
+        result = await client[database_name].command({"explain": command, "verbosity": "queryPlanner"})
+        stages = find_plan_stages(result.get("queryPlanner", {}).get("winningPlan", result))
+        slow_query_recorder.set_plan(key, stages)
+        if "COLLSCAN" in stages:
+            logger.warning(f"Slow query is a collection scan: {key}")
+    except Exception as e:
+        logger.error(f"Error explaining slow query: {str(e)}")
+
+@api_router.get("/admin/slow-queries", response_model=List[SlowQuery])
+async def get_slow_queries(
+    collscan_only: bool = False,
+    limit: int = 100,
+    current_user: User = Depends(get_current_admin_user)
+):
+    entries = slow_query_recorder.snapshot()
+    if collscan_only:
+        entries = [entry for entry in entries if entry["collscan"]]
+    entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+    return [SlowQuery(**entry) for entry in entries[:limit]]
+
+@api_router.delete("/admin/slow-queries")
+async def reset_slow_queries(current_user: User = Depends(get_current_admin_user)):
+    slow_query_recorder.reset()
+    return {"message": "Slow query log cleared"}
+
+# Storage Layout Migration Endpoints
+FILE_PATH_COLLECTIONS = ["contract_templates", "contract_template_versions", "contracts", "invoices"]
+LAYOUT_MIGRATION_ID = "upload_layout"
+
+async def relocate_file(old_key: str, new_key: str) -> str:
+    # Copy, repoint every reference, then delete, so readers never see a missing file
+    if await run_blocking(storage.exists, old_key):
+        await run_blocking(storage.copy, old_key, new_key)
+        result = "moved"
+    elif await run_blocking(storage.exists, new_key):
+        # Copied by an interrupted run or through another reference
+        result = "rewritten"
+    else:
+        return "missing"
+    
+    for collection_name in FILE_PATH_COLLECTIONS:
+        updated = await repositories[collection_name].update_many({"file_path": old_key}, {"$set": {"file_path": new_key}})
+        if updated.modified_count and collection_name in VERSIONED_COLLECTIONS:
+            await bump_collection_version(collection_name)
+    await run_blocking(storage.delete, old_key)
+    return result
+
+async def migrate_upload_layout(batch_size: int, pause_seconds: float):
+    try:
+        state = await db.migrations.find_one({"_id": LAYOUT_MIGRATION_ID}) or {}
+        checkpoints = state.get("checkpoints", {})
+        
+        for collection_name in FILE_PATH_COLLECTIONS:
+            last_id = checkpoints.get(collection_name)
+            while True:
+                await renew_lock(LAYOUT_MIGRATION_ID)
+                query = {"file_path": {"$type": "string"}}
+                if last_id is not None:
+                    query["_id"] = {"$gt": last_id}
+                batch = await db[collection_name].find(query, {"_id": 1, "file_path": 1}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+                if not batch:
+                    break
+                
+                counts = {"moved": 0, "rewritten": 0, "missing": 0}
+                for doc in batch:
+                    # Per file, since a batch of large copies can outlast the lease
+                    await renew_lock(LAYOUT_MIGRATION_ID)
+                    new_key = sharded_key_for(doc["file_path"])
+                    if new_key:
+                        counts[await relocate_file(doc["file_path"], new_key)] += 1
+                
+                # Checkpoint after every batch so a restart resumes here
+                last_id = batch[-1]["_id"]
+                await db.migrations.update_one(
+                    {"_id": LAYOUT_MIGRATION_ID},
+                    {
+                        "$set": {f"checkpoints.{collection_name}": last_id, "status": "running", "updated_at": datetime.utcnow()},
+                        "$inc": {f"counts.{key}": value for key, value in counts.items()},
+                    },
+                    upsert=True
+                )
+                await asyncio.sleep(pause_seconds)
+        
+        await db.migrations.update_one(
+            {"_id": LAYOUT_MIGRATION_ID},
+            {"$set": {"status": "complete", "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        logger.info("Upload layout migration complete")
+    except Exception as e:
+        logger.error(f"Upload layout migration failed: {str(e)}")
+        await db.migrations.update_one(
+            {"_id": LAYOUT_MIGRATION_ID},
+            {"$set": {"status": "failed", "error": str(e), "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+    finally:
+        await release_startup_lock(LAYOUT_MIGRATION_ID)
+
+@api_router.post("/admin/storage/layout-migration")
+async def start_upload_layout_migration(
+    batch_size: int = 200,
+    pause_ms: int = 50,
+    restart: bool = False,
+    current_user: User = Depends(get_current_admin_user)
+):
+    if not await acquire_startup_lock(LAYOUT_MIGRATION_ID):
+        raise HTTPException(status_code=409, detail="Layout migration is already running")
+    # Checked after taking our lock; the GC checks ours after taking its own, so they never overlap
+    if await lock_held(ORPHAN_GC_ID):
+        await release_startup_lock(LAYOUT_MIGRATION_ID)
+        raise HTTPException(status_code=409, detail="Orphan GC is running, retry when it has finished")
+    if restart:
+        await db.migrations.delete_one({"_id": LAYOUT_MIGRATION_ID})
+    # Marks the start for the orphan GC before the first file is copied
+    await db.migrations.update_one(
+        {"_id": LAYOUT_MIGRATION_ID}, {"$set": {"started_at": datetime.utcnow()}}, upsert=True
+    )
+    
+    spawn(migrate_upload_layout(max(1, min(batch_size, 5000)), max(pause_ms, 0) / 1000))
+    return {"message": "Layout migration started"}
+
+@api_router.get("/admin/storage/layout-migration")
+async def get_upload_layout_migration(current_user: User = Depends(get_current_admin_user)):
+    state = await db.migrations.find_one({"_id": LAYOUT_MIGRATION_ID})
+    if not state:
+        return {"status": "not_started"}
+    state.pop("_id")
+    state["checkpoints"] = {key: str(value) for key, value in state.get("checkpoints", {}).items()}
+    return state
+
+# Binary Identifier Migration Endpoints
+ID_MIGRATION_ID = "binary_ids"
+ID_COLLECTIONS = [
+    "users", "suppliers", "contract_templates", "contract_template_versions", "contracts",
+    "general_conditions", "gc_acceptances", "invoices", "audit_log", "upload_sessions", "outbox",
+]
+
+async def migrate_binary_ids(batch_size: int, pause_seconds: float):
+    # Works on raw_db so it sees what is actually stored; the app must run with
+    # ID_STORAGE=dual meanwhile, and can switch to binary once this is complete
+    try:
+        state = await raw_db.migrations.find_one({"_id": ID_MIGRATION_ID}) or {}
+        checkpoints = state.get("checkpoints", {})
+        
+        for collection_name in ID_COLLECTIONS:
+            last_id = checkpoints.get(collection_name)
+            while True:
+                await renew_lock(ID_MIGRATION_ID)
+                query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+                batch = await raw_db[collection_name].find(query).sort("_id", 1).limit(batch_size).to_list(batch_size)
+                if not batch:
+                    break
+                
+                operations = []
+                for doc in batch:
+                    encoded = encode_ids({key: value for key, value in doc.items() if key != "_id"})
+                    changes = {key: value for key, value in encoded.items() if value != doc[key]}
+                    if changes:
+                        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": changes}))
+                if operations:
+                    await raw_db[collection_name].bulk_write(operations, ordered=False)
+                    if collection_name in VERSIONED_COLLECTIONS:
+                        await bump_collection_version(collection_name)
+                
+                # Checkpoint after every batch so a restart resumes here
+                last_id = batch[-1]["_id"]
+                await raw_db.migrations.update_one(
+                    {"_id": ID_MIGRATION_ID},
+                    {
+                        "$set": {f"checkpoints.{collection_name}": last_id, "status": "running", "updated_at": datetime.utcnow()},
+                        "$inc": {f"counts.{collection_name}": len(operations)},
+                    },
+                    upsert=True
+                )
+                await asyncio.sleep(pause_seconds)
+        
+        await raw_db.migrations.update_one(
+            {"_id": ID_MIGRATION_ID},
+            {"$set": {"status": "complete", "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        logger.info("Binary identifier migration complete")
+    except Exception as e:
+        logger.error(f"Binary identifier migration failed: {str(e)}")
+        await raw_db.migrations.update_one(
+            {"_id": ID_MIGRATION_ID},
+            {"$set": {"status": "failed", "error": str(e), "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+    finally:
+        await release_startup_lock(ID_MIGRATION_ID)
+
+@api_router.post("/admin/ids/binary-migration")
+async def start_binary_id_migration(
+    batch_size: int = 500,
+    pause_ms: int = 50,
+    restart: bool = False,
+    current_user: User = Depends(get_current_admin_user)
+):
+    if ID_STORAGE != "dual":
+        # Under "string" converted documents would stop matching queries
+        raise HTTPException(status_code=409, detail="Run the migration with ID_STORAGE=dual")
+    if not await acquire_startup_lock(ID_MIGRATION_ID):
+        raise HTTPException(status_code=409, detail="Binary identifier migration is already running")
+    if restart:
+        await raw_db.migrations.delete_one({"_id": ID_MIGRATION_ID})
+    
+    spawn(migrate_binary_ids(max(1, min(batch_size, 5000)), max(pause_ms, 0) / 1000))
+    return {"message": "Binary identifier migration started"}
+
+@api_router.get("/admin/ids/binary-migration")
+async def get_binary_id_migration(current_user: User = Depends(get_current_admin_user)):
+    state = await raw_db.migrations.find_one({"_id": ID_MIGRATION_ID})
+    if not state:
+        return {"status": "not_started", "id_storage": ID_STORAGE}
+    state.pop("_id")
+    state["checkpoints"] = {key: str(value) for key, value in state.get("checkpoints", {}).items()}
+    state["id_storage"] = ID_STORAGE
+    return state
+
+# Orphan File GC Endpoints
+ORPHAN_GC_ID = "orphan_gc"
+ORPHAN_GC_PREFIXES = ["templates", "contracts", "invoices"]
+QUARANTINE_PREFIX = "quarantine"
+
+async def referenced_keys(keys: List[str]) -> set:
+    # Records may hold the relative key or, for older files, the absolute local path
+    candidates = {key: key for key in keys}
+    candidates.update({str(UPLOAD_DIR / key): key for key in keys})
+    referenced = set()
+    for collection_name in FILE_PATH_COLLECTIONS + ["upload_sessions"]:
+        async for doc in repositories[collection_name].find({"file_path": {"$in": list(candidates)}}, "file_path"):
+            referenced.add(candidates[doc["file_path"]])
+    return referenced
+
+async def layout_migration_active(cutoff: datetime) -> bool:
+    # Relocated files are hard links that keep the old mtime, and stay unreferenced
+    # until relocate_file repoints the records, so keep out of a migration's way
+    if await lock_held(LAYOUT_MIGRATION_ID):
+        return True
+    state = await db.migrations.find_one({"_id": LAYOUT_MIGRATION_ID}, {"started_at": 1, "updated_at": 1})
+    return bool(state) and max(state.get("started_at") or datetime.min, state.get("updated_at") or datetime.min) > cutoff
+
+async def quarantine_orphans(stats: Dict[str, int]):
+    cutoff = datetime.utcnow() - timedelta(seconds=ORPHAN_GC_MIN_AGE_SECONDS)
+    for prefix in ORPHAN_GC_PREFIXES:
+        files = storage.iter_files(prefix)
+        while True:
+            await renew_lock(ORPHAN_GC_ID)
+            batch = await run_blocking(lambda: list(itertools.islice(files, ORPHAN_GC_BATCH_SIZE)))
+            if not batch:
+                break
+            stats["scanned"] += len(batch)
+            
+            # Recent files may belong to a request that has not inserted its record yet.
+            # Only keys in the fan-out layout are managed by the app: flat keys predate
+            # it (including the sample templates shipped with the repo) and are left alone
+            candidates = [
+                (key, size) for key, size, modified in batch
+                if modified < cutoff and SHARDED_KEY_PATTERN.match(key)
+            ]
+            referenced = await referenced_keys([key for key, _ in candidates])
+            for key, size in candidates:
+                if key in referenced:
+                    continue
+                quarantine_key = f"{QUARANTINE_PREFIX}/{key}"
+                await run_blocking(storage.copy, key, quarantine_key)
+                await run_blocking(storage.delete, key)
+                await db.gc_quarantine.update_one(
+                    {"_id": key},
+                    {"$set": {"quarantine_key": quarantine_key, "size": size, "quarantined_at": datetime.utcnow()}},
+                    upsert=True
+                )
+                stats["quarantined"] += 1
+
+async def purge_quarantine(stats: Dict[str, int]):
+    cutoff = datetime.utcnow() - timedelta(seconds=ORPHAN_GC_GRACE_SECONDS)
+    while True:
+        await renew_lock(ORPHAN_GC_ID)
+        batch = await db.gc_quarantine.find({"quarantined_at": {"$lt": cutoff}}).limit(ORPHAN_GC_BATCH_SIZE).to_list(ORPHAN_GC_BATCH_SIZE)
+        if not batch:
+            break
+        referenced = await referenced_keys([entry["_id"] for entry in batch])
+        for entry in batch:
+            if entry["_id"] in referenced:
+                # A record showed up during the grace period: put the file back
+                await run_blocking(storage.copy, entry["quarantine_key"], entry["_id"])
+                stats["restored"] += 1
+            else:
+                stats["deleted"] += 1
+                stats["reclaimed_bytes"] += entry["size"]
+            await run_blocking(storage.delete, entry["quarantine_key"])
+            await db.gc_quarantine.delete_one({"_id": entry["_id"]})
+
+async def run_orphan_gc() -> Optional[Dict[str, Any]]:
+    if not await acquire_startup_lock(ORPHAN_GC_ID):
+        return None
+    stats = {"scanned": 0, "quarantined": 0, "restored": 0, "deleted": 0, "reclaimed_bytes": 0}
+    started_at = datetime.utcnow()
+    try:
+        if await layout_migration_active(started_at - timedelta(seconds=ORPHAN_GC_MIN_AGE_SECONDS)):
+            report = {"status": "skipped", "reason": "layout migration", "started_at": started_at, "finished_at": datetime.utcnow(), **stats}
+            logger.info("Orphan GC skipped: upload layout migration is running or finished recently")
+        else:
+            await purge_quarantine(stats)
+            await quarantine_orphans(stats)
+            report = {"status": "complete", "started_at": started_at, "finished_at": datetime.utcnow(), **stats}
+            logger.info(f"Orphan GC: {stats}")
+    except Exception as e:
+        logger.error(f"Orphan GC failed: {str(e)}")
+        report = {"status": "failed", "error": str(e), "started_at": started_at, "finished_at": datetime.utcnow(), **stats}
+    finally:
+        await release_startup_lock(ORPHAN_GC_ID)
+    
+    await db.maintenance_runs.update_one(
+        {"_id": ORPHAN_GC_ID},
+        {"$set": {"last_run": report}, "$inc": {"total_reclaimed_bytes": stats["reclaimed_bytes"]}},
+        upsert=True
+    )
+    return report
+
+async def orphan_gc_loop():
+    while True:
+        await asyncio.sleep(ORPHAN_GC_INTERVAL_SECONDS)
+        await run_orphan_gc()
+
+@api_router.post("/admin/storage/gc")
+async def start_orphan_gc(current_user: User = Depends(get_current_admin_user)):
+    spawn(run_orphan_gc())
+    return {"message": "Orphan GC started"}
+
+@api_router.get("/admin/storage/gc")
+async def get_orphan_gc_status(current_user: User = Depends(get_current_admin_user)):
+    state = await db.maintenance_runs.find_one({"_id": ORPHAN_GC_ID}, {"_id": 0})
+    quarantined = await db.gc_quarantine.count_documents({})
+    return {"quarantined_files": quarantined, **(state or {"last_run": None, "total_reclaimed_bytes": 0})}
+
+# Health Endpoints
+@api_router.get("/health/live")
+async def liveness():
+    return {"status": "alive"}
+
+@api_router.get("/health/ready")
+async def readiness():
+    checks = dict(startup_state)
+    try:
+        await client.admin.command("ping")
+        checks["mongo"] = True
+    except Exception as e:
+        logger.error(f"Readiness ping failed: {str(e)}")
+        checks["mongo"] = False
+    
+    # Warm-up runs in the background; traffic waits for it so first requests are not cold
+    ready = checks["mongo"] and checks["indexes_applied"] and checks["executors_started"] and checks["warmup_complete"]
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "starting", "worker": WORKER_ID, "checks": checks}
+    )
+
 # Include the router in the main app
 app.include_router(api_router)
 
+# Added before CORS so admission rejections still carry CORS headers
+app.add_middleware(AdmissionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -735,6 +4408,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Retry-After"],
 )
 
 # Configure logging
@@ -744,25 +4418,144 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def acquire_startup_lock(name: str) -> bool:
+    # Only one worker runs a given startup task; an expired lease can be taken over
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=STARTUP_LOCK_TTL_SECONDS)
+    try:
+        await db.startup_locks.insert_one({"_id": name, "owner": WORKER_ID, "expires_at": expires_at})
+        return True
+    except DuplicateKeyError:
+        result = await db.startup_locks.update_one(
+            {"_id": name, "expires_at": {"$lt": now}},
+            {"$set": {"owner": WORKER_ID, "expires_at": expires_at}}
+        )
+        return result.modified_count == 1
+
+async def renew_lock(name: str):
+    await db.startup_locks.update_one(
+        {"_id": name, "owner": WORKER_ID},
+        {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=STARTUP_LOCK_TTL_SECONDS)}}
+    )
+
+async def lock_held(name: str) -> bool:
+    return await db.startup_locks.count_documents({"_id": name, "expires_at": {"$gt": datetime.utcnow()}}, limit=1) > 0
+
+async def release_startup_lock(name: str):
+    await db.startup_locks.delete_one({"_id": name, "owner": WORKER_ID})
+
+async def seed_admin_user():
+    # Create a default admin user if none exists
+    if not await acquire_startup_lock("seed_admin_user"):
+        return
+    try:
+        if not await user_repo.exists({"is_admin": True}):
+            admin_user = {
+                "id": str(uuid.uuid4()),
+                "email": "admin@prismfinance.com",
+                "password": await run_blocking(get_password_hash, "admin123"),
+                "name": "Admin User",
+                "is_admin": True,
+                "created_at": datetime.utcnow()
+            }
+            await user_repo.update_one(
+                {"email": admin_user["email"]},
+                {"$setOnInsert": admin_user},
+                upsert=True
+            )
+            logger.info("Created default admin user")
+    finally:
+        await release_startup_lock("seed_admin_user")
+
+async def apply_indexes():
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        existing = await db[collection_name].index_information()
+        for name in names:
+            if name in existing:
+                try:
+                    await db[collection_name].drop_index(name)
+                except OperationFailure as e:
+                    # Another worker dropped it first (IndexNotFound, NamespaceNotFound)
+                    if e.code not in (26, 27):
+                        raise
+    for collection_name, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                await db[collection_name].create_index(keys, **options)
+            except Exception as e:
+                logger.error(f"Error creating index {keys} on {collection_name}: {str(e)}")
+    startup_state["indexes_applied"] = True
+
+def start_executors():
+    global document_executor
+    document_executor = ThreadPoolExecutor(max_workers=DOCUMENT_WORKERS, thread_name_prefix="document")
+    # Spawn the worker threads now rather than on the first request
+    for _ in range(DOCUMENT_WORKERS):
+        document_executor.submit(time.sleep, 0.01)
+    for gate in admission_gates.values():
+        gate.executor = ThreadPoolExecutor(max_workers=gate.concurrency, thread_name_prefix=f"admission-{gate.name}")
+    startup_state["executors_started"] = True
+
+async def warm_up():
+    try:
+        for module_name in WARMUP_MODULES:
+            importlib.import_module(module_name)
+        
+        # Pre-convert the templates used by the most recent contracts
+        template_ids = []
+        recent = contract_repo.find({}, "template_id").sort("created_at", -1).limit(WARMUP_TEMPLATE_COUNT * 5)
+        async for contract in recent:
+            if contract["template_id"] not in template_ids:
+                template_ids.append(contract["template_id"])
+            if len(template_ids) >= WARMUP_TEMPLATE_COUNT:
+                break
+        templates = await template_repo.find({"id": {"$in": template_ids}}, "file_path").to_list(WARMUP_TEMPLATE_COUNT)
+        for template in templates:
+            try:
+                await run_blocking(convert_template_to_html, template["file_path"])
+            except Exception as e:
+                logger.warning(f"Could not pre-convert template {template['file_path']}: {str(e)}")
+        logger.info(f"Warm-up complete, {len(templates)} templates pre-converted")
+    except Exception as e:
+        logger.error(f"Warm-up failed: {str(e)}")
+    startup_state["warmup_complete"] = True
+
 @app.on_event("startup")
 async def startup_db_client():
-    # Create a default admin user if none exists
-    admin_count = await db.users.count_documents({"is_admin": True})
-    if admin_count == 0:
-        admin_user = {
-            "id": str(uuid.uuid4()),
-            "email": "admin@prismfinance.com",
-            "password": get_password_hash("admin123"),
-            "name": "Admin User",
-            "is_admin": True,
-            "created_at": datetime.utcnow()
-        }
-        await db.users.insert_one(admin_user)
-        logger.info("Created default admin user")
+    slow_query_recorder.attach(asyncio.get_running_loop(), explain_slow_query)
+    start_executors()
+    
+    # Opens the connection pool before the first request
+    await client.admin.command("ping")
+    startup_state["transactions"] = await detect_transaction_support()
+    await apply_indexes()
+
+    await seed_admin_user()
     
     # Make sure UPLOAD_DIR and all subdirectories exist
-    (UPLOAD_DIR / "invoices").mkdir(exist_ok=True, parents=True)
+    INVOICES_DIR.mkdir(exist_ok=True, parents=True)
+    
+    audit_writer.start()
+    spawn(audit_writer.replay_spilled())
+    outbox_dispatcher.start()
+    spawn(warm_up())
+    spawn(sweep_upload_sessions())
+    if ORPHAN_GC_INTERVAL_SECONDS > 0:
+        spawn(orphan_gc_loop())
+    if EVENT_SOURCE == "changestream":
+        spawn(follow_change_stream())
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await audit_writer.stop()
+    await outbox_dispatcher.stop()
+    # Before closing the client, so migrations and the GC can release their locks
+    await cancel_background_tasks()
     client.close()
+    if document_executor is not None:
+        document_executor.shutdown(wait=False)
+    for gate in admission_gates.values():
+        if gate.executor is not None:
+            gate.executor.shutdown(wait=False)
+    if template_import_pool is not None:
+        template_import_pool.shutdown(wait=False, cancel_futures=True)
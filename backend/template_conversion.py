@@ -0,0 +1,21 @@
+# Pure docx conversion helpers. Kept free of side effects so the template import
+# process pool can import this module without pulling in server (Motor client,
+# executors, env config) in every spawned worker.
+import hashlib
+import io
+import re
+from typing import List
+
+import mammoth
+
+VARIABLE_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+
+# Function to extract variables from template content
+def extract_variables(content: str) -> List[str]:
+    matches = VARIABLE_PATTERN.findall(content)
+    return list(set(matches))
+
+def convert_template_bytes(data: bytes):
+    # Runs in the process pool: no storage or database access here
+    html_content = mammoth.convert_to_html(io.BytesIO(data)).value
+    return extract_variables(html_content), hashlib.sha256(data).hexdigest()
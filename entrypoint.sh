@@ -4,18 +4,44 @@ set -e
 # Start the FastAPI backend
 cd /backend || { echo "Backend directory not found"; exit 1; }
 
-echo "Starting FastAPI backend"
+# A single worker unless UVICORN_WORKERS is set: the SSE broker, admission gates and
+# render caches live in each process
+UVICORN_WORKERS=${UVICORN_WORKERS:-1}
+
+if [ "$UVICORN_WORKERS" -gt 1 ]; then
+    # Events published by one worker never reach the SSE clients of another, so
+    # several workers need every process to follow the Mongo change stream
+    if [ -z "$EVENT_SOURCE" ]; then
+        export EVENT_SOURCE=changestream
+    elif [ "$EVENT_SOURCE" != "changestream" ]; then
+        echo "EVENT_SOURCE=${EVENT_SOURCE} only works with a single worker, set EVENT_SOURCE=changestream or UVICORN_WORKERS=1"
+        exit 1
+    fi
+    echo "Admission limits apply per worker: ${UVICORN_WORKERS} workers admit ${UVICORN_WORKERS}x ADMISSION_LIMITS"
+fi
+
+echo "Starting FastAPI backend with ${UVICORN_WORKERS} worker(s)"
 # Start Uvicorn with proper host binding
-uvicorn server:app --host 0.0.0.0 --port 8001 &
+uvicorn server:app --host 0.0.0.0 --port 8001 --workers $UVICORN_WORKERS &
 BACKEND_PID=$!
 
-echo "Waiting for backend to start..."
-sleep 30
-
-if ! kill -0 $BACKEND_PID 2>/dev/null; then
-    echo "Backend failed to start at initialization, exiting"
-    exit 1
-fi
+echo "Waiting for backend to become ready..."
+READY_TIMEOUT=${READY_TIMEOUT:-120}
+WAITED=0
+until python3 -c "import urllib.request; urllib.request.urlopen('http://127.0.0.1:8001/api/health/ready', timeout=2)" 2>/dev/null; do
+    if ! kill -0 $BACKEND_PID 2>/dev/null; then
+        echo "Backend failed to start at initialization, exiting"
+        exit 1
+    fi
+    if [ $WAITED -ge $READY_TIMEOUT ]; then
+        echo "Backend not ready after ${READY_TIMEOUT}s, exiting"
+        kill $BACKEND_PID
+        exit 1
+    fi
+    sleep 1
+    WAITED=$((WAITED + 1))
+done
+echo "Backend ready after ${WAITED}s"
 
 # Start Nginx
 nginx -g 'daemon off;' &
@@ -0,0 +1,3 @@
+// API Configuration
+export const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+export const API = `${BACKEND_URL}/api`;
@@ -0,0 +1,88 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+import { API } from "./api";
+
+// Auth Context
+export const AuthContext = React.createContext(null);
+
+export const useAuth = () => {
+  return React.useContext(AuthContext);
+};
+
+// Auth Provider
+export const AuthProvider = ({ children }) => {
+  const [currentUser, setCurrentUser] = useState(null);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    // Check if user is logged in
+    const token = localStorage.getItem("token");
+    const user = localStorage.getItem("user");
+    
+    if (token && user) {
+      setCurrentUser(JSON.parse(user));
+      // Configure axios to use token in all requests
+      axios.defaults.headers.common["Authorization"] = `Bearer ${token}`;
+    }
+    
+    setLoading(false);
+  }, []);
+
+  const login = async (email, password) => {
+    try {
+      const response = await axios.post(`${API}/auth/token`, new URLSearchParams({
+        'username': email,
+        'password': password
+      }), {
+        headers: {
+          'Content-Type': 'application/x-www-form-urlencoded'
+        }
+      });
+      
+      const { access_token, user_id, is_admin, name } = response.data;
+      
+      // Store token and user info
+      localStorage.setItem("token", access_token);
+      
+      const user = {
+        id: user_id,
+        name: name || email,
+        isAdmin: is_admin
+      };
+      
+      localStorage.setItem("user", JSON.stringify(user));
+      
+      // Set current user
+      setCurrentUser(user);
+      
+      // Configure axios to use token in all requests
+      axios.defaults.headers.common["Authorization"] = `Bearer ${access_token}`;
+      
+      return true;
+    } catch (error) {
+      console.error("Login error:", error);
+      return false;
+    }
+  };
+
+  const logout = () => {
+    localStorage.removeItem("token");
+    localStorage.removeItem("user");
+    setCurrentUser(null);
+    delete axios.defaults.headers.common["Authorization"];
+  };
+
+  const value = {
+    currentUser,
+    login,
+    logout,
+    isAdmin: currentUser?.isAdmin || false,
+    isLoggedIn: !!currentUser
+  };
+
+  return (
+    <AuthContext.Provider value={value}>
+      {!loading && children}
+    </AuthContext.Provider>
+  );
+};
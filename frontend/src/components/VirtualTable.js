@@ -0,0 +1,61 @@
+import React, { useState, useEffect } from "react";
+
+// Windowed table: only the rows in view (plus overscan) are in the DOM, the rest
+// is replaced by two spacer rows. Rows have a fixed height, passed to renderRow
+// as a style; onEndReached is called when the window gets near the last row.
+const VirtualTable = ({
+  items,
+  header,
+  renderRow,
+  empty,
+  columns,
+  rowHeight = 57,
+  height = 640,
+  overscan = 10,
+  hasMore = false,
+  loadingMore = false,
+  onEndReached
+}) => {
+  const [scrollTop, setScrollTop] = useState(0);
+
+  const visibleCount = Math.ceil(height / rowHeight);
+  const start = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan);
+  const end = Math.min(items.length, start + visibleCount + overscan * 2);
+
+  useEffect(() => {
+    if (hasMore && onEndReached && end >= items.length - overscan) {
+      onEndReached();
+    }
+  }, [end, items.length, hasMore, onEndReached, overscan]);
+
+  const rowStyle = { height: rowHeight };
+
+  return (
+    <div style={{ maxHeight: height, overflowY: "auto" }} onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}>
+      <table className="modern-table">
+        <thead>
+          {header}
+        </thead>
+        <tbody>
+          {items.length === 0 ? empty : (
+            <>
+              {start > 0 && <tr aria-hidden="true" style={{ height: start * rowHeight }} />}
+              {items.slice(start, end).map((item) => renderRow(item, rowStyle))}
+              {end < items.length && <tr aria-hidden="true" style={{ height: (items.length - end) * rowHeight }} />}
+            </>
+          )}
+          {loadingMore && (
+            <tr>
+              <td colSpan={columns} className="py-4 text-center text-sm text-gray-500 dark:text-gray-400">
+                <span className="loader mr-2"></span>
+                Loading more...
+              </td>
+            </tr>
+          )}
+        </tbody>
+      </table>
+    </div>
+  );
+};
+
+export default VirtualTable;
@@ -0,0 +1,134 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+import { API } from "./api";
+
+// Server-sent events: calls onEvent for each pushed event whose type is listed
+export const useServerEvents = (types, onEvent) => {
+  const handlerRef = React.useRef(onEvent);
+  handlerRef.current = onEvent;
+  const typesKey = types.join(",");
+
+  useEffect(() => {
+    const token = localStorage.getItem("token");
+    if (!token) return;
+
+    const source = new EventSource(`${API}/events/stream?token=${encodeURIComponent(token)}`);
+    const listener = (e) => handlerRef.current(e.type, JSON.parse(e.data));
+    typesKey.split(",").forEach(type => source.addEventListener(type, listener));
+
+    return () => source.close();
+  }, [typesKey]);
+};
+
+// Incremental list fetching through the list endpoints' skip/limit parameters
+export const usePagedList = (url, pageSize = 100) => {
+  const [items, setItems] = useState([]);
+  const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [hasMore, setHasMore] = useState(false);
+  const stateRef = React.useRef({ count: 0, hasMore: false, busy: false, generation: 0 });
+  stateRef.current.count = items.length;
+  stateRef.current.hasMore = hasMore;
+
+  const fetchPage = React.useCallback(async (skip) => {
+    const separator = url.includes("?") ? "&" : "?";
+    const response = await axios.get(`${url}${separator}skip=${skip}&limit=${pageSize}`);
+    return response.data;
+  }, [url, pageSize]);
+
+  const reload = React.useCallback(async () => {
+    // Pages still in flight from before the reload are dropped
+    const generation = ++stateRef.current.generation;
+    try {
+      const page = await fetchPage(0);
+      if (generation !== stateRef.current.generation) return;
+      setItems(page);
+      setHasMore(page.length === pageSize);
+    } catch (error) {
+      console.error("Error fetching list:", error);
+    } finally {
+      setLoading(false);
+    }
+  }, [fetchPage, pageSize]);
+
+  const loadMore = React.useCallback(async () => {
+    const state = stateRef.current;
+    if (state.busy || !state.hasMore) return;
+    const generation = state.generation;
+    state.busy = true;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(state.count);
+      if (generation !== stateRef.current.generation) return;
+      setItems(prev => prev.concat(page));
+      setHasMore(page.length === pageSize);
+    } catch (error) {
+      console.error("Error fetching list:", error);
+    } finally {
+      state.busy = false;
+      setLoadingMore(false);
+    }
+  }, [fetchPage, pageSize]);
+
+  useEffect(() => {
+    reload();
+  }, [reload]);
+
+  return { items, setItems, loading, loadingMore, hasMore, loadMore, reload };
+};
+
+// Whether at least one contract template and one supplier exist, without loading either list
+export const useContractRequirements = () => {
+  const [requirements, setRequirements] = useState({ loading: true, hasTemplates: false, hasSuppliers: false });
+
+  useEffect(() => {
+    const probe = async () => {
+      try {
+        const [templatesRes, suppliersRes] = await Promise.all([
+          axios.get(`${API}/contract-templates?limit=1`),
+          axios.get(`${API}/suppliers?limit=1`)
+        ]);
+        setRequirements({
+          loading: false,
+          hasTemplates: templatesRes.data.length > 0,
+          hasSuppliers: suppliersRes.data.length > 0
+        });
+      } catch (error) {
+        console.error("Error fetching data:", error);
+        setRequirements(prev => ({ ...prev, loading: false }));
+      }
+    };
+
+    probe();
+  }, []);
+
+  return requirements;
+};
+
+// Name search for pickers: one small page per (debounced) query instead of the whole collection
+export const useNameSearch = (url, query, pageSize = 20, delay = 250) => {
+  const [results, setResults] = useState([]);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    let cancelled = false;
+    setLoading(true);
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(url, { params: { q: query || undefined, limit: pageSize } });
+        if (!cancelled) setResults(response.data);
+      } catch (error) {
+        console.error("Error searching:", error);
+      } finally {
+        if (!cancelled) setLoading(false);
+      }
+    }, query ? delay : 0);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [url, query, pageSize, delay]);
+
+  return { results, loading };
+};
@@ -0,0 +1,214 @@
+import React, { useState, useEffect } from "react";
+import { useNavigate, useParams } from "react-router-dom";
+import axios from "axios";
+import { API } from "../api";
+
+// Contract Detail View
+const ContractDetail = () => {
+  const { contractId } = useParams();
+  const [contract, setContract] = useState(null);
+  const [supplier, setSupplier] = useState(null);
+  const [template, setTemplate] = useState(null);
+  const [content, setContent] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+  const navigate = useNavigate();
+
+  useEffect(() => {
+    const fetchData = async () => {
+      try {
+        const contractRes = await axios.get(`${API}/contracts/${contractId}`);
+        setContract(contractRes.data);
+        
+        // Fetch supplier, template and the rendered HTML, which the content
+        // endpoint serves as-is (gzipped when stored that way) instead of base64 in JSON
+        const [supplierRes, templateRes, contentRes] = await Promise.all([
+          axios.get(`${API}/suppliers/${contractRes.data.supplier_id}`),
+          axios.get(`${API}/contract-templates/${contractRes.data.template_id}`),
+          axios.get(`${API}/contracts/${contractId}/content`, { responseType: "text" })
+        ]);
+        
+        setSupplier(supplierRes.data);
+        setTemplate(templateRes.data);
+        setContent(contentRes.data);
+        setLoading(false);
+      } catch (error) {
+        console.error("Error fetching contract:", error);
+        setError("Failed to load contract details");
+        setLoading(false);
+      }
+    };
+
+    fetchData();
+  }, [contractId]);
+
+  const handleSignContract = async () => {
+    try {
+      await axios.post(`${API}/contracts/${contractId}/sign`);
+      const contractRes = await axios.get(`${API}/contracts/${contractId}`);
+      setContract(contractRes.data);
+    } catch (error) {
+      console.error("Error signing contract:", error);
+      setError("Failed to sign contract");
+    }
+  };
+
+  if (loading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading contract...</span>
+      </div>
+    );
+  }
+
+  if (error) {
+    return (
+      <div className="max-w-7xl mx-auto py-8 px-4 sm:px-6 lg:px-8">
+        <div className="notification error">
+          <div className="flex-shrink-0">
+            <svg className="h-5 w-5 text-red-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+              <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zM8.707 7.293a1 1 0 00-1.414 1.414L8.586 10l-1.293 1.293a1 1 0 101.414 1.414L10 11.414l1.293 1.293a1 1 0 001.414-1.414L11.414 10l1.293-1.293a1 1 0 00-1.414-1.414L10 8.586 8.707 7.293z" clipRule="evenodd" />
+            </svg>
+          </div>
+          <div className="ml-3">
+            <p className="text-sm font-medium text-red-800">{error}</p>
+          </div>
+        </div>
+        <div className="mt-4">
+          <button
+            onClick={() => navigate('/contracts')}
+            className="btn-primary"
+          >
+            Back to Contracts
+          </button>
+        </div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto py-8 px-4 sm:px-6 lg:px-8">
+      <div className="flex justify-between items-center mb-6">
+        <h1 className="text-2xl font-bold text-gray-900 dark:text-white">
+          Contract: {template?.name}
+        </h1>
+        <div className="flex space-x-4">
+          {contract.status !== 'signed' && (
+            <button
+              onClick={handleSignContract}
+              className="btn-primary"
+            >
+              Sign Contract
+            </button>
+          )}
+          <button
+            onClick={() => navigate('/contracts')}
+            className="btn-secondary"
+          >
+            Back to Contracts
+          </button>
+        </div>
+      </div>
+
+      <div className="bg-white shadow-sm overflow-hidden sm:rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700 mb-8">
+        <div className="px-4 py-5 sm:px-6 border-b border-gray-200 dark:border-gray-700">
+          <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Contract Information</h3>
+          <p className="mt-1 max-w-2xl text-sm text-gray-500 dark:text-gray-400">Details and status.</p>
+        </div>
+        <div className="border-t border-gray-200 dark:border-gray-700">
+          <dl>
+            <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Supplier</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                {supplier?.name}
+              </dd>
+            </div>
+            <div className="bg-white px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-800">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Template</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                {template?.name}
+              </dd>
+            </div>
+            <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Status</dt>
+              <dd className="mt-1 sm:mt-0 sm:col-span-2">
+                <span className={`status-badge ${
+                  contract.status === 'signed' 
+                    ? 'success' 
+                    : contract.status === 'draft' 
+                      ? 'warning' 
+                      : 'info'
+                }`}>
+                  {contract.status.charAt(0).toUpperCase() + contract.status.slice(1)}
+                </span>
+              </dd>
+            </div>
+            <div className="bg-white px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-800">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Created</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                {new Date(contract.created_at).toLocaleString()}
+              </dd>
+            </div>
+            {contract.signed_at && (
+              <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+                <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Signed</dt>
+                <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                  {new Date(contract.signed_at).toLocaleString()}
+                </dd>
+              </div>
+            )}
+          </dl>
+        </div>
+      </div>
+
+      <div className="bg-white shadow-sm overflow-hidden sm:rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700">
+        <div className="px-4 py-5 sm:px-6 border-b border-gray-200 dark:border-gray-700">
+          <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Contract Preview</h3>
+        </div>
+        <div className="px-4 py-5 sm:p-6">
+          {content ? (
+            <div 
+              className="p-4 border border-gray-200 rounded-lg dark:border-gray-700 bg-white dark:bg-gray-900 prose prose-sm max-w-none dark:prose-invert"
+              dangerouslySetInnerHTML={{ __html: content }}
+            />
+          ) : (
+            <div className="text-center py-8 text-gray-500 dark:text-gray-400">
+              <svg className="mx-auto h-12 w-12 text-gray-400 dark:text-gray-600" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+              </svg>
+              <p className="mt-2">Contract content preview is not available</p>
+            </div>
+          )}
+        </div>
+      </div>
+
+      {Object.keys(contract.variables).length > 0 && (
+        <div className="mt-8 bg-white shadow-sm overflow-hidden sm:rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700">
+          <div className="px-4 py-5 sm:px-6 border-b border-gray-200 dark:border-gray-700">
+            <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Contract Variables</h3>
+          </div>
+          <div className="px-4 py-5 sm:p-6">
+            <ul className="grid grid-cols-1 gap-4 sm:grid-cols-2 lg:grid-cols-3">
+              {Object.entries(contract.variables).map(([key, value]) => (
+                <li key={key} className="col-span-1 flex shadow-sm rounded-md">
+                  <div className="bg-[#004A58] flex-shrink-0 flex items-center justify-center w-16 text-white text-sm font-medium rounded-l-md">
+                    {key.substring(0, 2)}
+                  </div>
+                  <div className="flex-1 flex items-center justify-between border-t border-r border-b border-gray-200 dark:border-gray-700 bg-white dark:bg-gray-800 rounded-r-md truncate">
+                    <div className="flex-1 px-4 py-2 text-sm truncate">
+                      <p className="text-gray-500 dark:text-gray-400">{key}</p>
+                      <p className="text-gray-900 dark:text-white font-medium">{value}</p>
+                    </div>
+                  </div>
+                </li>
+              ))}
+            </ul>
+          </div>
+        </div>
+      )}
+    </div>
+  );
+};
+
+export default ContractDetail;
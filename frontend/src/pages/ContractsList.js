@@ -0,0 +1,168 @@
+import React from "react";
+import { Link, useNavigate } from "react-router-dom";
+import { API } from "../api";
+import { useServerEvents, usePagedList, useContractRequirements } from "../hooks";
+import VirtualTable from "../components/VirtualTable";
+
+// Contracts List
+const ContractsList = () => {
+  const {
+    items: contracts,
+    setItems: setContracts,
+    loading: contractsLoading,
+    loadingMore,
+    hasMore,
+    loadMore,
+    reload
+  } = usePagedList(`${API}/contracts`);
+  const { loading, hasTemplates, hasSuppliers } = useContractRequirements();
+  const navigate = useNavigate();
+
+  useServerEvents(["contract.created", "contract.status"], (type, event) => {
+    if (type === "contract.status") {
+      setContracts(prev => prev.map(c => c.id === event.id ? { ...c, status: event.status } : c));
+    } else {
+      reload();
+    }
+  });
+
+  if (loading || contractsLoading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading contracts...</span>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto sm:px-6 lg:px-8 py-8">
+      <div className="sm:flex sm:items-center">
+        <div className="sm:flex-auto">
+          <h1 className="text-xl font-semibold text-gray-900 dark:text-white">Contracts 📝</h1>
+          <p className="mt-2 text-sm text-gray-700 dark:text-gray-400">A list of all contracts in your account including their status and supplier.</p>
+        </div>
+        <div className="mt-4 sm:mt-0 sm:ml-16 sm:flex-none">
+          <button
+            onClick={() => navigate('/contracts/new')}
+            className="btn-primary"
+            disabled={!hasTemplates || !hasSuppliers}
+          >
+            Generate contract
+          </button>
+        </div>
+      </div>
+      {(!hasTemplates || !hasSuppliers) && (
+        <div className="mt-4 p-4 border border-yellow-400 bg-yellow-50 rounded-md dark:bg-yellow-900 dark:border-yellow-700">
+          <div className="flex">
+            <div className="flex-shrink-0">
+              <svg className="h-5 w-5 text-yellow-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+                <path fillRule="evenodd" d="M8.257 3.099c.765-1.36 2.722-1.36 3.486 0l5.58 9.92c.75 1.334-.213 2.98-1.742 2.98H4.42c-1.53 0-2.493-1.646-1.743-2.98l5.58-9.92zM11 13a1 1 0 11-2 0 1 1 0 012 0zm-1-8a1 1 0 00-1 1v3a1 1 0 002 0V6a1 1 0 00-1-1z" clipRule="evenodd" />
+              </svg>
+            </div>
+            <div className="ml-3">
+              <h3 className="text-sm font-medium text-yellow-800 dark:text-yellow-200">Missing requirements</h3>
+              <div className="mt-2 text-sm text-yellow-700 dark:text-yellow-300">
+                <p>
+                  {!hasTemplates && "You need to upload at least one contract template. "}
+                  {!hasSuppliers && "You need to add at least one supplier. "}
+                  {!hasTemplates && <Link to="/templates" className="font-medium underline">Go to Templates</Link>}
+                  {!hasTemplates && !hasSuppliers && " | "}
+                  {!hasSuppliers && <Link to="/suppliers" className="font-medium underline">Go to Suppliers</Link>}
+                </p>
+              </div>
+            </div>
+          </div>
+        </div>
+      )}
+      <div className="mt-8 flex flex-col">
+        <div className="-my-2 -mx-4 overflow-x-auto sm:-mx-6 lg:-mx-8">
+          <div className="inline-block min-w-full py-2 align-middle md:px-6 lg:px-8">
+            <div className="overflow-hidden shadow-sm ring-1 ring-black ring-opacity-5 md:rounded-lg">
+              <VirtualTable
+                items={contracts}
+                columns={5}
+                hasMore={hasMore}
+                loadingMore={loadingMore}
+                onEndReached={loadMore}
+                header={
+                  <tr>
+                    <th scope="col">
+                      Supplier
+                    </th>
+                    <th scope="col">
+                      Template
+                    </th>
+                    <th scope="col">
+                      Status
+                    </th>
+                    <th scope="col">
+                      Created
+                    </th>
+                    <th scope="col">
+                      <span className="sr-only">View</span>
+                    </th>
+                  </tr>
+                }
+                empty={
+                  <tr>
+                    <td colSpan="5" className="py-6 text-center text-sm text-gray-500 dark:text-gray-400">
+                      <div className="flex flex-col items-center">
+                        <svg className="h-10 w-10 text-gray-400 dark:text-gray-600 mb-3" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                          <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+                        </svg>
+                        <p>No contracts found. Generate your first contract to get started.</p>
+                        {hasTemplates && hasSuppliers && (
+                          <button 
+                            onClick={() => navigate('/contracts/new')} 
+                            className="mt-4 btn-primary"
+                          >
+                            Generate your first contract
+                          </button>
+                        )}
+                      </div>
+                    </td>
+                  </tr>
+                }
+                renderRow={(contract, style) => (
+                  <tr key={contract.id} style={style}>
+                    <td className="whitespace-nowrap py-4 pl-4 pr-3 text-sm font-medium text-gray-900 dark:text-white sm:pl-6">
+                      {contract.supplier_name || 'Unknown'}
+                    </td>
+                    <td className="whitespace-nowrap px-3 py-4 text-sm text-gray-500 dark:text-gray-400">
+                      {contract.template_name || 'Unknown'}
+                    </td>
+                    <td className="whitespace-nowrap px-3 py-4 text-sm">
+                      <span className={`status-badge ${
+                        contract.status === 'signed' 
+                          ? 'success' 
+                          : contract.status === 'draft' 
+                            ? 'warning' 
+                            : 'info'
+                      }`}>
+                        {contract.status.charAt(0).toUpperCase() + contract.status.slice(1)}
+                      </span>
+                    </td>
+                    <td className="whitespace-nowrap px-3 py-4 text-sm text-gray-500 dark:text-gray-400">
+                      {new Date(contract.created_at).toLocaleDateString()}
+                    </td>
+                    <td className="relative whitespace-nowrap py-4 pl-3 pr-4 text-right text-sm font-medium sm:pr-6">
+                      <button
+                        onClick={() => navigate(`/contracts/${contract.id}`)}
+                        className="text-[#004A58] hover:text-[#00353F] dark:text-[#80CED7] dark:hover:text-white"
+                      >
+                        View<span className="sr-only">, contract</span>
+                      </button>
+                    </td>
+                  </tr>
+                )}
+              />
+            </div>
+          </div>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default ContractsList;
@@ -0,0 +1,190 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+import { API } from "../api";
+
+// General Conditions Component
+const GeneralConditions = () => {
+  const [conditions, setConditions] = useState({
+    id: "",
+    version: "1.0",
+    content: "",
+    is_active: true
+  });
+  const [loading, setLoading] = useState(true);
+  const [saving, setSaving] = useState(false);
+  const [error, setError] = useState(null);
+  const [success, setSuccess] = useState(false);
+
+  useEffect(() => {
+    const fetchConditions = async () => {
+      try {
+        const response = await axios.get(`${API}/general-conditions/active`);
+        setConditions(response.data);
+        setLoading(false);
+      } catch (error) {
+        if (error.response?.status === 404) {
+          // No active general conditions found, that's okay
+          setLoading(false);
+        } else {
+          console.error("Error fetching general conditions:", error);
+          setError("Failed to load general conditions");
+          setLoading(false);
+        }
+      }
+    };
+
+    fetchConditions();
+  }, []);
+
+  const handleChange = (e) => {
+    const { name, value } = e.target;
+    setConditions({
+      ...conditions,
+      [name]: value
+    });
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    
+    setSaving(true);
+    setError(null);
+    setSuccess(false);
+    
+    try {
+      await axios.post(`${API}/general-conditions`, conditions);
+      setSuccess(true);
+      
+      // Clear success message after 3 seconds
+      setTimeout(() => {
+        setSuccess(false);
+      }, 3000);
+    } catch (error) {
+      console.error("Error saving general conditions:", error);
+      setError(error.response?.data?.detail || "An error occurred while saving");
+    } finally {
+      setSaving(false);
+    }
+  };
+
+  if (loading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading...</span>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto sm:px-6 lg:px-8 py-8">
+      <div className="md:grid md:grid-cols-3 md:gap-6">
+        <div className="md:col-span-1">
+          <div className="px-4 sm:px-0">
+            <h3 className="text-lg font-medium leading-6 text-gray-900 dark:text-white">General Conditions 📋</h3>
+            <p className="mt-1 text-sm text-gray-600 dark:text-gray-400">
+              Manage the general conditions that suppliers must accept before uploading invoices.
+            </p>
+          </div>
+        </div>
+        <div className="mt-5 md:mt-0 md:col-span-2">
+          <form onSubmit={handleSubmit}>
+            <div className="shadow-sm sm:rounded-md sm:overflow-hidden">
+              <div className="px-4 py-5 bg-white space-y-6 sm:p-6 dark:bg-gray-800">
+                {error && (
+                  <div className="notification error">
+                    <div className="flex-shrink-0">
+                      <svg className="h-5 w-5 text-red-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+                        <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zM8.707 7.293a1 1 0 00-1.414 1.414L8.586 10l-1.293 1.293a1 1 0 101.414 1.414L10 11.414l1.293 1.293a1 1 0 001.414-1.414L11.414 10l1.293-1.293a1 1 0 00-1.414-1.414L10 8.586 8.707 7.293z" clipRule="evenodd" />
+                      </svg>
+                    </div>
+                    <div className="ml-3">
+                      <p className="text-sm font-medium text-red-800">{error}</p>
+                    </div>
+                  </div>
+                )}
+
+                {success && (
+                  <div className="notification success">
+                    <div className="flex-shrink-0">
+                      <svg className="h-5 w-5 text-green-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+                        <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clipRule="evenodd" />
+                      </svg>
+                    </div>
+                    <div className="ml-3">
+                      <p className="text-sm font-medium text-green-800">General conditions saved successfully!</p>
+                    </div>
+                  </div>
+                )}
+
+                <div>
+                  <label htmlFor="version" className="form-label">
+                    Version
+                  </label>
+                  <input
+                    type="text"
+                    name="version"
+                    id="version"
+                    value={conditions.version}
+                    onChange={handleChange}
+                    className="form-input"
+                  />
+                </div>
+
+                <div>
+                  <label htmlFor="content" className="form-label">
+                    Content
+                  </label>
+                  <textarea
+                    id="content"
+                    name="content"
+                    rows={10}
+                    value={conditions.content}
+                    onChange={handleChange}
+                    className="form-input"
+                    placeholder="Enter the text of your general conditions..."
+                  />
+                </div>
+
+                <div className="flex items-start">
+                  <div className="flex items-center h-5">
+                    <input
+                      id="is_active"
+                      name="is_active"
+                      type="checkbox"
+                      checked={conditions.is_active}
+                      onChange={(e) => setConditions({...conditions, is_active: e.target.checked})}
+                      className="form-checkbox"
+                    />
+                  </div>
+                  <div className="ml-3 text-sm">
+                    <label htmlFor="is_active" className="font-medium text-gray-700 dark:text-gray-300">Active</label>
+                    <p className="text-gray-500 dark:text-gray-400">Make these general conditions active. This will deactivate any previously active conditions.</p>
+                  </div>
+                </div>
+              </div>
+              <div className="px-4 py-3 bg-gray-50 text-right sm:px-6 dark:bg-gray-700">
+                <button
+                  type="submit"
+                  disabled={saving}
+                  className="btn-primary"
+                >
+                  {saving ? (
+                    <span className="flex items-center">
+                      <span className="loader mr-2"></span>
+                      Saving...
+                    </span>
+                  ) : (
+                    "Save"
+                  )}
+                </button>
+              </div>
+            </div>
+          </form>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default GeneralConditions;
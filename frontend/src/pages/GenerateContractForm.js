@@ -0,0 +1,274 @@
+import React, { useState, useEffect, useCallback } from "react";
+import { Link, useNavigate, useLocation } from "react-router-dom";
+import axios from "axios";
+import { API } from "../api";
+import { useContractRequirements, useNameSearch } from "../hooks";
+
+// Generate Contract Form
+const GenerateContractForm = () => {
+  const [templateQuery, setTemplateQuery] = useState("");
+  const [supplierQuery, setSupplierQuery] = useState("");
+  const [selectedTemplate, setSelectedTemplate] = useState(null);
+  const [selectedSupplier, setSelectedSupplier] = useState(null);
+  const [variables, setVariables] = useState({});
+  const [generating, setGenerating] = useState(false);
+  const [error, setError] = useState(null);
+  const navigate = useNavigate();
+  const location = useLocation();
+  const params = new URLSearchParams(location.search);
+  const templateIdFromUrl = params.get('template');
+  const { loading, hasTemplates, hasSuppliers } = useContractRequirements();
+  const { results: templates } = useNameSearch(`${API}/contract-templates`, templateQuery);
+  const { results: suppliers } = useNameSearch(`${API}/suppliers`, supplierQuery);
+
+  const selectTemplate = useCallback((template) => {
+    setSelectedTemplate(template);
+    
+    // Initialize variables object with empty strings
+    const vars = {};
+    (template?.variables || []).forEach(variable => {
+      vars[variable] = "";
+    });
+    setVariables(vars);
+  }, []);
+
+  useEffect(() => {
+    // If template ID is provided in URL, select it
+    if (!templateIdFromUrl) return;
+    axios.get(`${API}/contract-templates/${templateIdFromUrl}`)
+      .then(response => selectTemplate(response.data))
+      .catch(error => console.error("Error fetching template:", error));
+  }, [templateIdFromUrl, selectTemplate]);
+
+  // The current selection stays listed while the search shows other names
+  const templateOptions = selectedTemplate && !templates.some(t => t.id === selectedTemplate.id)
+    ? [selectedTemplate, ...templates]
+    : templates;
+  const supplierOptions = selectedSupplier && !suppliers.some(s => s.id === selectedSupplier.id)
+    ? [selectedSupplier, ...suppliers]
+    : suppliers;
+
+  const handleTemplateChange = (e) => {
+    selectTemplate(templateOptions.find(t => t.id === e.target.value) || null);
+  };
+
+  const handleSupplierChange = (e) => {
+    setSelectedSupplier(supplierOptions.find(s => s.id === e.target.value) || null);
+  };
+
+  const handleVariableChange = (e) => {
+    const { name, value } = e.target;
+    setVariables({
+      ...variables,
+      [name]: value
+    });
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    
+    if (!selectedTemplate || !selectedSupplier) {
+      setError("Template and supplier are required");
+      return;
+    }
+    
+    setGenerating(true);
+    setError(null);
+    
+    const formData = new FormData();
+    formData.append('supplier_id', selectedSupplier.id);
+    formData.append('template_id', selectedTemplate.id);
+    formData.append('variables', JSON.stringify(variables));
+    
+    try {
+      const response = await axios.post(`${API}/contracts/generate`, formData);
+      navigate(`/contracts/${response.data.id}`);
+    } catch (error) {
+      console.error("Error generating contract:", error);
+      setError(error.response?.data?.detail || "An error occurred while generating the contract");
+      setGenerating(false);
+    }
+  };
+
+  if (loading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading...</span>
+      </div>
+    );
+  }
+
+  if (!hasTemplates || !hasSuppliers) {
+    return (
+      <div className="max-w-7xl mx-auto sm:px-6 lg:px-8 py-8">
+        <div className="bg-white shadow-sm sm:rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700">
+          <div className="px-4 py-5 sm:p-6">
+            <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Missing Requirements</h3>
+            <div className="mt-2 max-w-xl text-sm text-gray-500 dark:text-gray-400">
+              <p>
+                {!hasTemplates && "You need to upload at least one contract template. "}
+                {!hasSuppliers && "You need to add at least one supplier. "}
+              </p>
+            </div>
+            <div className="mt-5">
+              {!hasTemplates && (
+                <Link
+                  to="/templates"
+                  className="btn-primary mr-4"
+                >
+                  Add Templates
+                </Link>
+              )}
+              {!hasSuppliers && (
+                <Link
+                  to="/suppliers"
+                  className="btn-primary"
+                >
+                  Add Suppliers
+                </Link>
+              )}
+            </div>
+          </div>
+        </div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto sm:px-6 lg:px-8 py-8">
+      <div className="md:grid md:grid-cols-3 md:gap-6">
+        <div className="md:col-span-1">
+          <div className="px-4 sm:px-0">
+            <h3 className="text-lg font-medium leading-6 text-gray-900 dark:text-white">Generate Contract</h3>
+            <p className="mt-1 text-sm text-gray-600 dark:text-gray-400">
+              Select a template and supplier, then fill in the variable values to generate a contract.
+            </p>
+          </div>
+        </div>
+        <div className="mt-5 md:mt-0 md:col-span-2">
+          <form onSubmit={handleSubmit}>
+            <div className="shadow-sm sm:rounded-md sm:overflow-hidden">
+              <div className="px-4 py-5 bg-white space-y-6 sm:p-6 dark:bg-gray-800">
+                {error && (
+                  <div className="notification error">
+                    <div className="flex-shrink-0">
+                      <svg className="h-5 w-5 text-red-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+                        <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zM8.707 7.293a1 1 0 00-1.414 1.414L8.586 10l-1.293 1.293a1 1 0 101.414 1.414L10 11.414l1.293 1.293a1 1 0 001.414-1.414L11.414 10l1.293-1.293a1 1 0 00-1.414-1.414L10 8.586 8.707 7.293z" clipRule="evenodd" />
+                      </svg>
+                    </div>
+                    <div className="ml-3">
+                      <p className="text-sm font-medium text-red-800">{error}</p>
+                    </div>
+                  </div>
+                )}
+
+                <div>
+                  <label htmlFor="template" className="form-label">
+                    Template
+                  </label>
+                  <input
+                    type="search"
+                    placeholder="Search templates by name"
+                    value={templateQuery}
+                    onChange={(e) => setTemplateQuery(e.target.value)}
+                    className="form-input mb-2"
+                  />
+                  <select
+                    id="template"
+                    name="template"
+                    className="form-select"
+                    value={selectedTemplate?.id || ""}
+                    onChange={handleTemplateChange}
+                  >
+                    <option value="">Select a template</option>
+                    {templateOptions.map((template) => (
+                      <option key={template.id} value={template.id}>
+                        {template.name}
+                      </option>
+                    ))}
+                  </select>
+                </div>
+
+                <div>
+                  <label htmlFor="supplier" className="form-label">
+                    Supplier
+                  </label>
+                  <input
+                    type="search"
+                    placeholder="Search suppliers by name"
+                    value={supplierQuery}
+                    onChange={(e) => setSupplierQuery(e.target.value)}
+                    className="form-input mb-2"
+                  />
+                  <select
+                    id="supplier"
+                    name="supplier"
+                    className="form-select"
+                    value={selectedSupplier?.id || ""}
+                    onChange={handleSupplierChange}
+                  >
+                    <option value="">Select a supplier</option>
+                    {supplierOptions.map((supplier) => (
+                      <option key={supplier.id} value={supplier.id}>
+                        {supplier.name}
+                      </option>
+                    ))}
+                  </select>
+                </div>
+
+                {selectedTemplate && selectedTemplate.variables.length > 0 && (
+                  <div>
+                    <h3 className="text-sm font-medium text-gray-700 mb-3 dark:text-gray-300">Variable Values</h3>
+                    <div className="space-y-4">
+                      {selectedTemplate.variables.map((variable) => (
+                        <div key={variable}>
+                          <label htmlFor={variable} className="form-label">
+                            {variable}
+                          </label>
+                          <input
+                            type="text"
+                            name={variable}
+                            id={variable}
+                            value={variables[variable] || ""}
+                            onChange={handleVariableChange}
+                            className="form-input"
+                          />
+                        </div>
+                      ))}
+                    </div>
+                  </div>
+                )}
+              </div>
+              <div className="px-4 py-3 bg-gray-50 text-right sm:px-6 dark:bg-gray-700">
+                <button
+                  type="button"
+                  onClick={() => navigate('/contracts')}
+                  className="btn-secondary mr-3"
+                >
+                  Cancel
+                </button>
+                <button
+                  type="submit"
+                  disabled={generating || !selectedTemplate || !selectedSupplier}
+                  className="btn-primary"
+                >
+                  {generating ? (
+                    <span className="flex items-center">
+                      <span className="loader mr-2"></span>
+                      Generating...
+                    </span>
+                  ) : (
+                    "Generate Contract"
+                  )}
+                </button>
+              </div>
+            </div>
+          </form>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default GenerateContractForm;
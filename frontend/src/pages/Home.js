@@ -0,0 +1,144 @@
+import React from "react";
+import { useNavigate } from "react-router-dom";
+import { useAuth } from "../auth";
+
+// Home Page
+const Home = () => {
+  const { isLoggedIn, isAdmin } = useAuth();
+  const navigate = useNavigate();
+
+  return (
+    <div className="bg-white dark:bg-gray-900">
+      <main>
+        {/* Hero section */}
+        <div className="hero">
+          <div className="max-w-7xl mx-auto sm:px-6 lg:px-8">
+            <div className="relative shadow-xl sm:rounded-2xl sm:overflow-hidden">
+              <div className="absolute inset-0">
+                <img
+                  className="h-full w-full object-cover"
+                  src="https://images.unsplash.com/photo-1551434678-e076c223a692?ixlib=rb-1.2.1&ixid=eyJhcHBfaWQiOjEyMDd9&auto=format&fit=crop&w=2850&q=80"
+                  alt="People working on laptops"
+                />
+                <div className="absolute inset-0 bg-gradient-to-r from-[#004A58] to-[#006d83] mix-blend-multiply" />
+              </div>
+              <div className="hero-content">
+                <h1 className="text-center text-4xl font-bold tracking-tight sm:text-5xl lg:text-6xl">
+                  <span className="block">PRISM'FINANCE ✨</span>
+                  <span className="block text-[#a1dbe1]">Supplier Management</span>
+                </h1>
+                <p className="mt-6 max-w-lg mx-auto text-center text-xl text-white sm:max-w-3xl">
+                  Manage your suppliers, contracts, and compliance documents in one elegant platform
+                </p>
+                <div className="mt-10 max-w-sm mx-auto sm:max-w-none sm:flex sm:justify-center">
+                  <div className="space-y-4 sm:space-y-0 sm:mx-auto sm:inline-grid sm:grid-cols-2 sm:gap-5">
+                    {isLoggedIn ? (
+                      <>
+                        <button
+                          onClick={() => navigate(isAdmin ? "/suppliers" : "/profile")}
+                          className="flex items-center justify-center px-4 py-3 border border-transparent text-base font-medium rounded-lg shadow-sm text-[#004A58] bg-white hover:bg-[#F5F5F5] sm:px-8"
+                        >
+                          {isAdmin ? "View Suppliers 🏢" : "My Profile 👤"}
+                        </button>
+                        <button
+                          onClick={() => navigate(isAdmin ? "/contracts" : "/my-contracts")}
+                          className="flex items-center justify-center px-4 py-3 border border-transparent text-base font-medium rounded-lg shadow-sm text-white bg-[#004A58] bg-opacity-60 hover:bg-opacity-70 sm:px-8"
+                        >
+                          {isAdmin ? "Manage Contracts 📝" : "My Contracts 📝"}
+                        </button>
+                      </>
+                    ) : (
+                      <>
+                        <button
+                          onClick={() => navigate("/login")}
+                          className="flex items-center justify-center px-4 py-3 border border-transparent text-base font-medium rounded-lg shadow-sm text-[#004A58] bg-white hover:bg-[#F5F5F5] sm:px-8"
+                        >
+                          Sign In 🔑
+                        </button>
+                        <button
+                          onClick={() => navigate("/login")}
+                          className="flex items-center justify-center px-4 py-3 border border-transparent text-base font-medium rounded-lg shadow-sm text-white bg-[#004A58] bg-opacity-60 hover:bg-opacity-70 sm:px-8"
+                        >
+                          Get Started 🚀
+                        </button>
+                      </>
+                    )}
+                  </div>
+                </div>
+              </div>
+            </div>
+          </div>
+        </div>
+
+        {/* Features section */}
+        <div className="py-12 bg-white dark:bg-gray-900">
+          <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div className="lg:text-center">
+              <h2 className="text-base text-[#004A58] font-semibold tracking-wide uppercase dark:text-[#80CED7]">Features ✨</h2>
+              <p className="mt-2 text-3xl leading-8 font-bold tracking-tight text-gray-900 sm:text-4xl dark:text-white">
+                Simplify Your Supplier Management
+              </p>
+              <p className="mt-4 max-w-2xl text-xl text-gray-500 lg:mx-auto dark:text-gray-400">
+                PRISM'FINANCE helps businesses manage suppliers efficiently and compliantly with French regulations
+              </p>
+            </div>
+
+            <div className="mt-10">
+              <div className="space-y-10 md:space-y-0 md:grid md:grid-cols-2 md:gap-x-8 md:gap-y-10">
+                <div className="modern-card">
+                  <div className="flex items-center justify-center h-12 w-12 rounded-full bg-gradient-to-r from-[#004A58] to-[#006d83] text-white mb-5">
+                    <svg className="h-6 w-6" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                      <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M13 10V3L4 14h7v7l9-11h-7z" />
+                    </svg>
+                  </div>
+                  <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Contract Management 📝</h3>
+                  <p className="mt-2 text-base text-gray-500 dark:text-gray-400">
+                    Generate and manage contracts from customizable templates with automatic variable detection
+                  </p>
+                </div>
+
+                <div className="modern-card">
+                  <div className="flex items-center justify-center h-12 w-12 rounded-full bg-gradient-to-r from-[#004A58] to-[#006d83] text-white mb-5">
+                    <svg className="h-6 w-6" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                      <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M3 10h18M7 15h1m4 0h1m-7 4h12a3 3 0 003-3V8a3 3 0 00-3-3H6a3 3 0 00-3 3v8a3 3 0 003 3z" />
+                    </svg>
+                  </div>
+                  <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Supplier Portal 🏢</h3>
+                  <p className="mt-2 text-base text-gray-500 dark:text-gray-400">
+                    Provide suppliers with a secure interface to update information and accept your terms
+                  </p>
+                </div>
+
+                <div className="modern-card">
+                  <div className="flex items-center justify-center h-12 w-12 rounded-full bg-gradient-to-r from-[#004A58] to-[#006d83] text-white mb-5">
+                    <svg className="h-6 w-6" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                      <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12l2 2 4-4m5.618-4.016A11.955 11.955 0 0112 2.944a11.955 11.955 0 01-8.618 3.04A12.02 12.02 0 003 9c0 5.591 3.824 10.29 9 11.622 5.176-1.332 9-6.03 9-11.622 0-1.042-.133-2.052-.382-3.016z" />
+                    </svg>
+                  </div>
+                  <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Compliance Dashboard 📊</h3>
+                  <p className="mt-2 text-base text-gray-500 dark:text-gray-400">
+                    Track supplier compliance status with visual indicators and automated alerts
+                  </p>
+                </div>
+
+                <div className="modern-card">
+                  <div className="flex items-center justify-center h-12 w-12 rounded-full bg-gradient-to-r from-[#004A58] to-[#006d83] text-white mb-5">
+                    <svg className="h-6 w-6" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                      <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M15 17h5l-1.405-1.405A2.032 2.032 0 0118 14.158V11a6.002 6.002 0 00-4-5.659V5a2 2 0 10-4 0v.341C7.67 6.165 6 8.388 6 11v3.159c0 .538-.214 1.055-.595 1.436L4 17h5m6 0v1a3 3 0 11-6 0v-1m6 0H9" />
+                    </svg>
+                  </div>
+                  <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Automated Notifications 🔔</h3>
+                  <p className="mt-2 text-base text-gray-500 dark:text-gray-400">
+                    Receive alerts for document expiration and compliance status changes
+                  </p>
+                </div>
+              </div>
+            </div>
+          </div>
+        </div>
+      </main>
+    </div>
+  );
+};
+
+export default Home;
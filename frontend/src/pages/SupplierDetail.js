@@ -0,0 +1,211 @@
+import React, { useState, useEffect } from "react";
+import { useNavigate, useParams } from "react-router-dom";
+import axios from "axios";
+import { API } from "../api";
+
+// Supplier Detail View
+const SupplierDetail = () => {
+  const { supplierId } = useParams();
+  const [supplier, setSupplier] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+  const navigate = useNavigate();
+
+  useEffect(() => {
+    const fetchSupplier = async () => {
+      try {
+        const response = await axios.get(`${API}/suppliers/${supplierId}`);
+        setSupplier(response.data);
+        setLoading(false);
+      } catch (error) {
+        console.error("Error fetching supplier:", error);
+        setError("Failed to load supplier details");
+        setLoading(false);
+      }
+    };
+
+    fetchSupplier();
+  }, [supplierId]);
+
+  if (loading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading supplier details...</span>
+      </div>
+    );
+  }
+
+  if (error) {
+    return (
+      <div className="max-w-7xl mx-auto py-8 px-4 sm:px-6 lg:px-8">
+        <div className="notification error">
+          <div className="flex-shrink-0">
+            <svg className="h-5 w-5 text-red-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+              <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zM8.707 7.293a1 1 0 00-1.414 1.414L8.586 10l-1.293 1.293a1 1 0 101.414 1.414L10 11.414l1.293 1.293a1 1 0 001.414-1.414L11.414 10l1.293-1.293a1 1 0 00-1.414-1.414L10 8.586 8.707 7.293z" clipRule="evenodd" />
+            </svg>
+          </div>
+          <div className="ml-3">
+            <p className="text-sm font-medium text-red-800">{error}</p>
+          </div>
+        </div>
+        <div className="mt-4">
+          <button
+            onClick={() => navigate('/suppliers')}
+            className="btn-primary"
+          >
+            Back to Suppliers
+          </button>
+        </div>
+      </div>
+    );
+  }
+
+  if (!supplier) {
+    return (
+      <div className="max-w-7xl mx-auto py-8 px-4 sm:px-6 lg:px-8">
+        <div className="notification warning">
+          <div className="flex-shrink-0">
+            <svg className="h-5 w-5 text-yellow-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+              <path fillRule="evenodd" d="M8.257 3.099c.765-1.36 2.722-1.36 3.486 0l5.58 9.92c.75 1.334-.213 2.98-1.742 2.98H4.42c-1.53 0-2.493-1.646-1.743-2.98l5.58-9.92zM11 13a1 1 0 11-2 0 1 1 0 012 0zm-1-8a1 1 0 00-1 1v3a1 1 0 002 0V6a1 1 0 00-1-1z" clipRule="evenodd" />
+            </svg>
+          </div>
+          <div className="ml-3">
+            <p className="text-sm font-medium text-yellow-800">Supplier not found</p>
+          </div>
+        </div>
+        <div className="mt-4">
+          <button
+            onClick={() => navigate('/suppliers')}
+            className="btn-primary"
+          >
+            Back to Suppliers
+          </button>
+        </div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto py-8 px-4 sm:px-6 lg:px-8">
+      <div className="flex justify-between items-center mb-6">
+        <h1 className="text-2xl font-bold text-gray-900 dark:text-white">{supplier.name}</h1>
+        <div className="flex space-x-4">
+          <button
+            onClick={() => navigate(`/suppliers/edit/${supplier.id}`)}
+            className="btn-primary"
+          >
+            Edit Supplier
+          </button>
+          <button
+            onClick={() => navigate('/suppliers')}
+            className="btn-secondary"
+          >
+            Back to Suppliers
+          </button>
+        </div>
+      </div>
+
+      <div className="bg-white shadow-sm overflow-hidden sm:rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700">
+        <div className="px-4 py-5 sm:px-6 border-b border-gray-200 dark:border-gray-700">
+          <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Supplier Information</h3>
+          <p className="mt-1 max-w-2xl text-sm text-gray-500 dark:text-gray-400">Details and documents.</p>
+        </div>
+        <div className="border-t border-gray-200 dark:border-gray-700">
+          <dl>
+            <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Full name</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">{supplier.name}</dd>
+            </div>
+            <div className="bg-white px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-800">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">SIRET</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">{supplier.siret}</dd>
+            </div>
+            <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">VAT Number</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">{supplier.vat_number}</dd>
+            </div>
+            <div className="bg-white px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-800">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Email address</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                {supplier.emails.map((email, index) => (
+                  <div key={index}>{email}</div>
+                ))}
+              </dd>
+            </div>
+            <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Profession</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">{supplier.profession || "Not specified"}</dd>
+            </div>
+            <div className="bg-white px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-800">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Address</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                {supplier.address ? (
+                  <div>
+                    {supplier.address}<br />
+                    {supplier.postal_code} {supplier.city}<br />
+                    {supplier.country}
+                  </div>
+                ) : (
+                  "Not specified"
+                )}
+              </dd>
+            </div>
+            <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Banking Information</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                <div>IBAN: {supplier.iban}</div>
+                {supplier.bic && <div>BIC: {supplier.bic}</div>}
+              </dd>
+            </div>
+            <div className="bg-white px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-800">
+              <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">VAT Information</dt>
+              <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">
+                <div>VAT Rates: {supplier.vat_rates.join(", ")}%</div>
+                {supplier.vat_exigibility && <div>VAT Exigibility: {supplier.vat_exigibility}</div>}
+                {supplier.payment_rule && <div>Payment Rule: {supplier.payment_rule}</div>}
+              </dd>
+            </div>
+            {supplier.notes && (
+              <div className="bg-gray-50 px-4 py-5 sm:grid sm:grid-cols-3 sm:gap-4 sm:px-6 dark:bg-gray-900">
+                <dt className="text-sm font-medium text-gray-500 dark:text-gray-400">Notes</dt>
+                <dd className="mt-1 text-sm text-gray-900 sm:mt-0 sm:col-span-2 dark:text-white">{supplier.notes}</dd>
+              </div>
+            )}
+          </dl>
+        </div>
+      </div>
+
+      <div className="mt-8">
+        <h2 className="text-xl font-semibold text-gray-900 dark:text-white mb-4">Contract Variables</h2>
+        {Object.keys(supplier.contract_variables || {}).length > 0 ? (
+          <div className="bg-white shadow-sm overflow-hidden sm:rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700">
+            <div className="px-4 py-5 sm:px-6">
+              <ul className="grid grid-cols-1 gap-4 sm:grid-cols-2 lg:grid-cols-3">
+                {Object.entries(supplier.contract_variables).map(([key, value]) => (
+                  <li key={key} className="col-span-1 flex shadow-sm rounded-md">
+                    <div className="bg-[#004A58] flex-shrink-0 flex items-center justify-center w-16 text-white text-sm font-medium rounded-l-md">
+                      {key.substring(0, 2)}
+                    </div>
+                    <div className="flex-1 flex items-center justify-between border-t border-r border-b border-gray-200 dark:border-gray-700 bg-white dark:bg-gray-800 rounded-r-md truncate">
+                      <div className="flex-1 px-4 py-2 text-sm truncate">
+                        <p className="text-gray-500 dark:text-gray-400">{key}</p>
+                        <p className="text-gray-900 dark:text-white font-medium">{value}</p>
+                      </div>
+                    </div>
+                  </li>
+                ))}
+              </ul>
+            </div>
+          </div>
+        ) : (
+          <div className="bg-gray-50 px-4 py-5 rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700">
+            <p className="text-sm text-gray-500 dark:text-gray-400">No contract variables defined yet.</p>
+          </div>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default SupplierDetail;
@@ -0,0 +1,355 @@
+import React, { useState, useEffect } from "react";
+import { useNavigate, useParams } from "react-router-dom";
+import axios from "axios";
+import { API } from "../api";
+
+// Supplier Form
+const SupplierForm = () => {
+  const { supplierId } = useParams();
+  const [formData, setFormData] = useState({
+    name: "",
+    siret: "",
+    vat_number: "",
+    profession: "",
+    iban: "",
+    bic: "",
+    vat_rates: [20.0],
+    emails: [""],
+    address: "",
+    postal_code: "",
+    city: "",
+    country: "",
+    notes: "",
+  });
+  const [errors, setErrors] = useState({});
+  const [loading, setLoading] = useState(false);
+  const [initialLoading, setInitialLoading] = useState(!!supplierId);
+  const navigate = useNavigate();
+  const isEditing = !!supplierId;
+
+  useEffect(() => {
+    // If editing, fetch the supplier data
+    if (isEditing) {
+      const fetchSupplier = async () => {
+        try {
+          const response = await axios.get(`${API}/suppliers/${supplierId}`);
+          setFormData(response.data);
+          setInitialLoading(false);
+        } catch (error) {
+          console.error("Error fetching supplier:", error);
+          setInitialLoading(false);
+        }
+      };
+
+      fetchSupplier();
+    }
+  }, [supplierId, isEditing]);
+
+  const handleChange = (e) => {
+    const { name, value } = e.target;
+    
+    if (name === "emails[0]") {
+      setFormData({
+        ...formData,
+        emails: [value]
+      });
+    } else {
+      setFormData({
+        ...formData,
+        [name]: value
+      });
+    }
+  };
+
+  const validateForm = () => {
+    const newErrors = {};
+    
+    if (!formData.name) newErrors.name = "Name is required";
+    if (!formData.siret) newErrors.siret = "SIRET is required";
+    if (!formData.vat_number) newErrors.vat_number = "VAT number is required";
+    if (!formData.iban) newErrors.iban = "IBAN is required";
+    if (!formData.emails[0]) newErrors["emails[0]"] = "Email is required";
+    
+    setErrors(newErrors);
+    return Object.keys(newErrors).length === 0;
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    
+    if (!validateForm()) return;
+    
+    setLoading(true);
+    
+    try {
+      if (isEditing) {
+        await axios.put(`${API}/suppliers/${supplierId}`, formData);
+      } else {
+        await axios.post(`${API}/suppliers`, formData);
+      }
+      navigate("/suppliers");
+    } catch (error) {
+      console.error("Error saving supplier:", error);
+      setErrors({
+        submit: error.response?.data?.detail || "An error occurred while saving the supplier"
+      });
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  if (initialLoading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading supplier details...</span>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto sm:px-6 lg:px-8 py-8">
+      <div className="md:grid md:grid-cols-3 md:gap-6">
+        <div className="md:col-span-1">
+          <div className="px-4 sm:px-0">
+            <h3 className="text-lg font-medium leading-6 text-gray-900 dark:text-white">
+              {isEditing ? "Edit Supplier" : "Add Supplier"}
+            </h3>
+            <p className="mt-1 text-sm text-gray-600 dark:text-gray-400">
+              {isEditing 
+                ? "Update supplier information. Required fields are marked with an asterisk (*)."
+                : "Add a new supplier to your account. Required fields are marked with an asterisk (*)."}
+            </p>
+          </div>
+        </div>
+        <div className="mt-5 md:mt-0 md:col-span-2">
+          <form onSubmit={handleSubmit}>
+            <div className="shadow-sm sm:rounded-md sm:overflow-hidden">
+              <div className="px-4 py-5 bg-white space-y-6 sm:p-6 dark:bg-gray-800">
+                {errors.submit && (
+                  <div className="notification error">
+                    <div className="flex-shrink-0">
+                      <svg className="h-5 w-5 text-red-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+                        <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zM8.707 7.293a1 1 0 00-1.414 1.414L8.586 10l-1.293 1.293a1 1 0 101.414 1.414L10 11.414l1.293 1.293a1 1 0 001.414-1.414L11.414 10l1.293-1.293a1 1 0 00-1.414-1.414L10 8.586 8.707 7.293z" clipRule="evenodd" />
+                      </svg>
+                    </div>
+                    <div className="ml-3">
+                      <p className="text-sm font-medium text-red-800">{errors.submit}</p>
+                    </div>
+                  </div>
+                )}
+
+                <div className="grid grid-cols-6 gap-6">
+                  <div className="col-span-6 sm:col-span-3">
+                    <label htmlFor="name" className="form-label">
+                      Name *
+                    </label>
+                    <input
+                      type="text"
+                      name="name"
+                      id="name"
+                      value={formData.name}
+                      onChange={handleChange}
+                      className={`form-input ${errors.name ? 'border-red-300' : ''}`}
+                      placeholder="Définir un nom"
+                    />
+                    {errors.name && <p className="mt-2 text-sm text-red-600">{errors.name}</p>}
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-3">
+                    <label htmlFor="siret" className="form-label">
+                      SIRET *
+                    </label>
+                    <input
+                      type="text"
+                      name="siret"
+                      id="siret"
+                      value={formData.siret}
+                      onChange={handleChange}
+                      className={`form-input ${errors.siret ? 'border-red-300' : ''}`}
+                      placeholder="Entrer le SIRET"
+                    />
+                    {errors.siret && <p className="mt-2 text-sm text-red-600">{errors.siret}</p>}
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-3">
+                    <label htmlFor="vat_number" className="form-label">
+                      VAT Number *
+                    </label>
+                    <input
+                      type="text"
+                      name="vat_number"
+                      id="vat_number"
+                      value={formData.vat_number}
+                      onChange={handleChange}
+                      className={`form-input ${errors.vat_number ? 'border-red-300' : ''}`}
+                      placeholder="Définir un numéro de TVA"
+                    />
+                    {errors.vat_number && <p className="mt-2 text-sm text-red-600">{errors.vat_number}</p>}
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-3">
+                    <label htmlFor="profession" className="form-label">
+                      Profession
+                    </label>
+                    <input
+                      type="text"
+                      name="profession"
+                      id="profession"
+                      value={formData.profession}
+                      onChange={handleChange}
+                      className="form-input"
+                      placeholder="Renseigner la profession"
+                    />
+                  </div>
+
+                  <div className="col-span-6">
+                    <label htmlFor="address" className="form-label">
+                      Street Address
+                    </label>
+                    <input
+                      type="text"
+                      name="address"
+                      id="address"
+                      value={formData.address}
+                      onChange={handleChange}
+                      className="form-input"
+                    />
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-2">
+                    <label htmlFor="postal_code" className="form-label">
+                      Postal Code
+                    </label>
+                    <input
+                      type="text"
+                      name="postal_code"
+                      id="postal_code"
+                      value={formData.postal_code}
+                      onChange={handleChange}
+                      className="form-input"
+                    />
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-2">
+                    <label htmlFor="city" className="form-label">
+                      City
+                    </label>
+                    <input
+                      type="text"
+                      name="city"
+                      id="city"
+                      value={formData.city}
+                      onChange={handleChange}
+                      className="form-input"
+                    />
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-2">
+                    <label htmlFor="country" className="form-label">
+                      Country
+                    </label>
+                    <input
+                      type="text"
+                      name="country"
+                      id="country"
+                      value={formData.country}
+                      onChange={handleChange}
+                      className="form-input"
+                    />
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-3">
+                    <label htmlFor="iban" className="form-label">
+                      IBAN *
+                    </label>
+                    <input
+                      type="text"
+                      name="iban"
+                      id="iban"
+                      value={formData.iban}
+                      onChange={handleChange}
+                      className={`form-input ${errors.iban ? 'border-red-300' : ''}`}
+                      placeholder="XXXX XXXX XXXX XXXX XXXX XXXX XXX"
+                    />
+                    {errors.iban && <p className="mt-2 text-sm text-red-600">{errors.iban}</p>}
+                  </div>
+
+                  <div className="col-span-6 sm:col-span-3">
+                    <label htmlFor="bic" className="form-label">
+                      BIC
+                    </label>
+                    <input
+                      type="text"
+                      name="bic"
+                      id="bic"
+                      value={formData.bic}
+                      onChange={handleChange}
+                      className="form-input"
+                    />
+                  </div>
+
+                  <div className="col-span-6">
+                    <label htmlFor="emails[0]" className="form-label">
+                      Email *
+                    </label>
+                    <input
+                      type="email"
+                      name="emails[0]"
+                      id="emails[0]"
+                      value={formData.emails[0]}
+                      onChange={handleChange}
+                      className={`form-input ${errors["emails[0]"] ? 'border-red-300' : ''}`}
+                      placeholder="email@example.com"
+                    />
+                    {errors["emails[0]"] && <p className="mt-2 text-sm text-red-600">{errors["emails[0]"]}</p>}
+                  </div>
+
+                  <div className="col-span-6">
+                    <label htmlFor="notes" className="form-label">
+                      Notes
+                    </label>
+                    <textarea
+                      id="notes"
+                      name="notes"
+                      rows={3}
+                      value={formData.notes}
+                      onChange={handleChange}
+                      className="form-input"
+                      placeholder="Ajouter des notes à ce fournisseur"
+                    />
+                  </div>
+                </div>
+              </div>
+              <div className="px-4 py-3 bg-gray-50 text-right sm:px-6 dark:bg-gray-700">
+                <button
+                  type="button"
+                  onClick={() => navigate('/suppliers')}
+                  className="btn-secondary mr-3"
+                >
+                  Cancel
+                </button>
+                <button
+                  type="submit"
+                  disabled={loading}
+                  className="btn-primary"
+                >
+                  {loading ? (
+                    <span className="flex items-center">
+                      <span className="loader mr-2"></span>
+                      Saving...
+                    </span>
+                  ) : (
+                    isEditing ? 'Update' : 'Save'
+                  )}
+                </button>
+              </div>
+            </div>
+          </form>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default SupplierForm;
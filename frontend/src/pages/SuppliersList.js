@@ -0,0 +1,115 @@
+import React from "react";
+import { useNavigate } from "react-router-dom";
+import { API } from "../api";
+import { usePagedList } from "../hooks";
+import VirtualTable from "../components/VirtualTable";
+
+// Suppliers List
+const SuppliersList = () => {
+  const { items: suppliers, loading, loadingMore, hasMore, loadMore } = usePagedList(`${API}/suppliers`);
+  const navigate = useNavigate();
+
+  if (loading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading suppliers...</span>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto sm:px-6 lg:px-8 py-8">
+      <div className="sm:flex sm:items-center">
+        <div className="sm:flex-auto">
+          <h1 className="text-xl font-semibold text-gray-900 dark:text-white">Suppliers 🏢</h1>
+          <p className="mt-2 text-sm text-gray-700 dark:text-gray-400">A list of all suppliers in your account including their name, SIRET, and status.</p>
+        </div>
+        <div className="mt-4 sm:mt-0 sm:ml-16 sm:flex-none">
+          <button
+            onClick={() => navigate('/suppliers/new')}
+            className="btn-primary"
+          >
+            Add supplier
+          </button>
+        </div>
+      </div>
+      <div className="mt-8 flex flex-col">
+        <div className="-my-2 -mx-4 overflow-x-auto sm:-mx-6 lg:-mx-8">
+          <div className="inline-block min-w-full py-2 align-middle md:px-6 lg:px-8">
+            <div className="overflow-hidden shadow-sm ring-1 ring-black ring-opacity-5 md:rounded-lg">
+              <VirtualTable
+                items={suppliers}
+                columns={5}
+                hasMore={hasMore}
+                loadingMore={loadingMore}
+                onEndReached={loadMore}
+                header={
+                  <tr>
+                    <th scope="col">
+                      Name
+                    </th>
+                    <th scope="col">
+                      SIRET
+                    </th>
+                    <th scope="col">
+                      Email
+                    </th>
+                    <th scope="col">
+                      Status
+                    </th>
+                    <th scope="col">
+                      <span className="sr-only">View</span>
+                    </th>
+                  </tr>
+                }
+                empty={
+                  <tr>
+                    <td colSpan="5" className="py-6 text-center text-sm text-gray-500 dark:text-gray-400">
+                      <div className="flex flex-col items-center">
+                        <svg className="h-10 w-10 text-gray-400 dark:text-gray-600 mb-3" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                          <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M17 20h5v-2a3 3 0 00-5.356-1.857M17 20H7m10 0v-2c0-.656-.126-1.283-.356-1.857M7 20H2v-2a3 3 0 015.356-1.857M7 20v-2c0-.656.126-1.283.356-1.857m0 0a5.002 5.002 0 019.288 0M15 7a3 3 0 11-6 0 3 3 0 016 0zm6 3a2 2 0 11-4 0 2 2 0 014 0zM7 10a2 2 0 11-4 0 2 2 0 014 0z" />
+                        </svg>
+                        <p>No suppliers found. Add your first supplier to get started.</p>
+                        <button 
+                          onClick={() => navigate('/suppliers/new')} 
+                          className="mt-4 btn-primary"
+                        >
+                          Add your first supplier
+                        </button>
+                      </div>
+                    </td>
+                  </tr>
+                }
+                renderRow={(supplier, style) => (
+                  <tr key={supplier.id} style={style}>
+                    <td className="whitespace-nowrap py-4 pl-4 pr-3 text-sm font-medium text-gray-900 dark:text-white sm:pl-6">
+                      {supplier.name}
+                    </td>
+                    <td className="whitespace-nowrap px-3 py-4 text-sm text-gray-500 dark:text-gray-400">{supplier.siret}</td>
+                    <td className="whitespace-nowrap px-3 py-4 text-sm text-gray-500 dark:text-gray-400">{supplier.emails[0]}</td>
+                    <td className="whitespace-nowrap px-3 py-4 text-sm text-gray-500 dark:text-gray-400">
+                      <span className="status-badge success">
+                        Active
+                      </span>
+                    </td>
+                    <td className="relative whitespace-nowrap py-4 pl-3 pr-4 text-right text-sm font-medium sm:pr-6">
+                      <button
+                        onClick={() => navigate(`/suppliers/${supplier.id}`)}
+                        className="text-[#004A58] hover:text-[#00353F] dark:text-[#80CED7] dark:hover:text-white"
+                      >
+                        View<span className="sr-only">, {supplier.name}</span>
+                      </button>
+                    </td>
+                  </tr>
+                )}
+              />
+            </div>
+          </div>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default SuppliersList;
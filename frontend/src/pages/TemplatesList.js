@@ -0,0 +1,261 @@
+import React, { useState } from "react";
+import { useNavigate } from "react-router-dom";
+import axios from "axios";
+import { API } from "../api";
+import { usePagedList } from "../hooks";
+import VirtualTable from "../components/VirtualTable";
+
+// Tags shown per row; rows keep a fixed height for the virtualized table
+const MAX_VARIABLE_TAGS = 4;
+
+// Templates List
+const TemplatesList = () => {
+  const { items: templates, loading, loadingMore, hasMore, loadMore, reload } = usePagedList(`${API}/contract-templates`);
+  const [isUploading, setIsUploading] = useState(false);
+  const [uploadError, setUploadError] = useState(null);
+  const [uploadSuccess, setUploadSuccess] = useState(false);
+  const [templateName, setTemplateName] = useState("");
+  const [file, setFile] = useState(null);
+  const navigate = useNavigate();
+
+  const handleFileChange = (e) => {
+    if (e.target.files && e.target.files[0]) {
+      setFile(e.target.files[0]);
+    }
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    
+    if (!templateName || !file) {
+      setUploadError("Template name and file are required");
+      return;
+    }
+    
+    setIsUploading(true);
+    setUploadError(null);
+    setUploadSuccess(false);
+    
+    const formData = new FormData();
+    formData.append('name', templateName);
+    formData.append('file', file);
+    
+    try {
+      await axios.post(`${API}/contract-templates`, formData, {
+        headers: {
+          'Content-Type': 'multipart/form-data'
+        }
+      });
+      
+      // Refresh the templates list
+      await reload();
+      
+      // Reset the form
+      setTemplateName("");
+      setFile(null);
+      
+      // Show success message
+      setUploadSuccess(true);
+      
+      // Clear success message after 3 seconds
+      setTimeout(() => {
+        setUploadSuccess(false);
+      }, 3000);
+      
+    } catch (error) {
+      console.error("Error uploading template:", error);
+      setUploadError(error.response?.data?.detail || "An error occurred while uploading the template");
+    } finally {
+      setIsUploading(false);
+    }
+  };
+
+  if (loading) {
+    return (
+      <div className="flex justify-center items-center h-64">
+        <div className="loader mr-3 h-8 w-8 border-4"></div>
+        <span className="text-lg text-gray-600 dark:text-gray-400">Loading templates...</span>
+      </div>
+    );
+  }
+
+  return (
+    <div className="max-w-7xl mx-auto sm:px-6 lg:px-8 py-8">
+      <div className="sm:flex sm:items-center">
+        <div className="sm:flex-auto">
+          <h1 className="text-xl font-semibold text-gray-900 dark:text-white">Contract Templates 📄</h1>
+          <p className="mt-2 text-sm text-gray-700 dark:text-gray-400">Upload and manage contract templates with variable placeholders.</p>
+        </div>
+      </div>
+      
+      <div className="mt-8 bg-white shadow-sm sm:rounded-lg dark:bg-gray-800 border border-gray-200 dark:border-gray-700">
+        <div className="px-4 py-5 sm:p-6">
+          <h3 className="text-lg leading-6 font-medium text-gray-900 dark:text-white">Upload New Template</h3>
+          <div className="mt-2 max-w-xl text-sm text-gray-500 dark:text-gray-400">
+            <p>Upload a .docx file containing placeholders in the format {"{{VariableName}}"}.</p>
+          </div>
+          
+          {uploadError && (
+            <div className="mt-4 notification error">
+              <div className="flex-shrink-0">
+                <svg className="h-5 w-5 text-red-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+                  <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zM8.707 7.293a1 1 0 00-1.414 1.414L8.586 10l-1.293 1.293a1 1 0 101.414 1.414L10 11.414l1.293 1.293a1 1 0 001.414-1.414L11.414 10l1.293-1.293a1 1 0 00-1.414-1.414L10 8.586 8.707 7.293z" clipRule="evenodd" />
+                </svg>
+              </div>
+              <div className="ml-3">
+                <p className="text-sm font-medium text-red-800">{uploadError}</p>
+              </div>
+            </div>
+          )}
+          
+          {uploadSuccess && (
+            <div className="mt-4 notification success">
+              <div className="flex-shrink-0">
+                <svg className="h-5 w-5 text-green-400" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 20 20" fill="currentColor">
+                  <path fillRule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clipRule="evenodd" />
+                </svg>
+              </div>
+              <div className="ml-3">
+                <p className="text-sm font-medium text-green-800">Template uploaded successfully!</p>
+              </div>
+            </div>
+          )}
+          
+          <form onSubmit={handleSubmit} className="mt-5">
+            <div className="grid grid-cols-1 gap-6 sm:grid-cols-6">
+              <div className="sm:col-span-3">
+                <label htmlFor="templateName" className="form-label">Template Name</label>
+                <input
+                  type="text"
+                  name="templateName"
+                  id="templateName"
+                  className="form-input"
+                  placeholder="Service Contract"
+                  value={templateName}
+                  onChange={(e) => setTemplateName(e.target.value)}
+                />
+              </div>
+              
+              <div className="sm:col-span-6">
+                <label className="form-label">Template File</label>
+                <div className="file-upload">
+                  <input
+                    type="file"
+                    name="file"
+                    id="file"
+                    accept=".docx,.doc"
+                    onChange={handleFileChange}
+                  />
+                  <div className="flex flex-col items-center text-gray-500 dark:text-gray-400">
+                    <svg className="mx-auto h-12 w-12 text-gray-400 dark:text-gray-600" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                      <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M7 16a4 4 0 01-.88-7.903A5 5 0 1115.9 6L16 6a5 5 0 011 9.9M15 13l-3-3m0 0l-3 3m3-3v12" />
+                    </svg>
+                    <p className="mt-1">{file ? file.name : "Drag and drop a file here, or click to select a file"}</p>
+                    <p className="mt-1 text-sm text-gray-500 dark:text-gray-500">Word document (.docx, .doc)</p>
+                  </div>
+                </div>
+              </div>
+            </div>
+            
+            <div className="mt-6">
+              <button
+                type="submit"
+                className="btn-primary"
+                disabled={isUploading}
+              >
+                {isUploading ? (
+                  <span className="flex items-center">
+                    <span className="loader mr-2"></span>
+                    Uploading...
+                  </span>
+                ) : (
+                  "Upload Template"
+                )}
+              </button>
+            </div>
+          </form>
+        </div>
+      </div>
+      
+      <div className="mt-8 flex flex-col">
+        <div className="-my-2 -mx-4 overflow-x-auto sm:-mx-6 lg:-mx-8">
+          <div className="inline-block min-w-full py-2 align-middle md:px-6 lg:px-8">
+            <div className="overflow-hidden shadow-sm ring-1 ring-black ring-opacity-5 md:rounded-lg">
+              <VirtualTable
+                items={templates}
+                columns={4}
+                hasMore={hasMore}
+                loadingMore={loadingMore}
+                onEndReached={loadMore}
+                header={
+                  <tr>
+                    <th scope="col">
+                      Name
+                    </th>
+                    <th scope="col">
+                      Variables
+                    </th>
+                    <th scope="col">
+                      Created
+                    </th>
+                    <th scope="col">
+                      <span className="sr-only">Actions</span>
+                    </th>
+                  </tr>
+                }
+                empty={
+                  <tr>
+                    <td colSpan="4" className="py-6 text-center text-sm text-gray-500 dark:text-gray-400">
+                      <div className="flex flex-col items-center">
+                        <svg className="h-10 w-10 text-gray-400 dark:text-gray-600 mb-3" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                          <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+                        </svg>
+                        <p>No templates found. Upload your first template to get started.</p>
+                      </div>
+                    </td>
+                  </tr>
+                }
+                renderRow={(template, style) => (
+                  <tr key={template.id} style={style}>
+                    <td className="whitespace-nowrap py-4 pl-4 pr-3 text-sm font-medium text-gray-900 dark:text-white sm:pl-6">
+                      {template.name}
+                    </td>
+                    <td className="px-3 py-4 text-sm text-gray-500 dark:text-gray-400">
+                      {template.variables.length > 0 ? (
+                        <div className="flex flex-nowrap gap-1 overflow-hidden" title={template.variables.join(", ")}>
+                          {template.variables.slice(0, MAX_VARIABLE_TAGS).map((variable, index) => (
+                            <span key={index} className="tag">
+                              {variable}
+                            </span>
+                          ))}
+                          {template.variables.length > MAX_VARIABLE_TAGS && (
+                            <span className="tag">+{template.variables.length - MAX_VARIABLE_TAGS}</span>
+                          )}
+                        </div>
+                      ) : (
+                        <span className="text-gray-400 dark:text-gray-600">No variables detected</span>
+                      )}
+                    </td>
+                    <td className="whitespace-nowrap px-3 py-4 text-sm text-gray-500 dark:text-gray-400">
+                      {new Date(template.created_at).toLocaleDateString()}
+                    </td>
+                    <td className="relative whitespace-nowrap py-4 pl-3 pr-4 text-right text-sm font-medium sm:pr-6">
+                      <button
+                        onClick={() => navigate(`/contracts/new?template=${template.id}`)}
+                        className="text-[#004A58] hover:text-[#00353F] dark:text-[#80CED7] dark:hover:text-white"
+                      >
+                        Use<span className="sr-only">, {template.name}</span>
+                      </button>
+                    </td>
+                  </tr>
+                )}
+              />
+            </div>
+          </div>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default TemplatesList;
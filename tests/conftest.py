@@ -0,0 +1,50 @@
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import ServerSelectionTimeoutError
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "prims_finance_test")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def mongo_db():
+    # A throwaway database per test module; tests needing it skip without a MongoDB
+    client = MongoClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command("ping")
+    except ServerSelectionTimeoutError:
+        pytest.skip("MongoDB is not reachable")
+    database = client[f"test_{uuid.uuid4().hex[:8]}"]
+    yield database
+    client.drop_database(database.name)
+    client.close()
+
+
+@pytest.fixture
+def run_with_db(mongo_db, monkeypatch):
+    # Runs scenario(database) with the app pointed at the emptied test database;
+    # the Motor client is bound to the loop of that run
+    def runner(scenario):
+        async def main():
+            client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+            database = client[mongo_db.name]
+            monkeypatch.setattr(server, "raw_db", database)
+            monkeypatch.setattr(server, "db", database)
+            for name in await database.list_collection_names():
+                await database[name].delete_many({})
+            try:
+                return await scenario(database)
+            finally:
+                client.close()
+        return asyncio.run(main())
+    return runner
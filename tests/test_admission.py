@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+
+@pytest.fixture
+def upload_gate(monkeypatch):
+    gate = server.AdmissionGate("upload", 1, 0, 0.05)
+    gate.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="admission-upload")
+    monkeypatch.setitem(server.admission_gates, "upload", gate)
+    yield gate
+    gate.executor.shutdown(wait=False)
+
+
+def test_full_gate_rejects_with_429():
+    gate = server.AdmissionGate("render", 1, 1, 5)
+
+    async def scenario():
+        first = await gate.acquire()
+        # Second request queues; the third finds concurrency and queue both full
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as rejected:
+            await gate.acquire()
+        gate.release(first)
+        gate.release(await waiter)
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert gate.rejected_full == 1
+    assert gate.admitted == 2
+    assert gate.in_flight == 0
+
+
+def test_queued_request_times_out_with_503():
+    gate = server.AdmissionGate("auth", 1, 1, 0.05)
+
+    async def scenario():
+        first = await gate.acquire()
+        with pytest.raises(HTTPException) as rejected:
+            await gate.acquire()
+        gate.release(first)
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert gate.rejected_timeout == 1
+    assert gate.waiting == 0
+
+
+def call_middleware(scope, inner):
+    # Drives AdmissionMiddleware directly; records what the client received and
+    # whether any of the request body was read
+    received = {"body_reads": 0}
+    sent = []
+
+    async def receive():
+        received["body_reads"] += 1
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await server.AdmissionMiddleware(inner)(scope, receive, send)
+
+    return run, received, sent
+
+
+def http_scope(method, path):
+    return {"type": "http", "method": method, "path": path, "headers": [], "query_string": b""}
+
+
+def test_multipart_upload_is_rejected_before_its_body_is_read(upload_gate):
+    inner_calls = []
+
+    async def inner(scope, receive, send):
+        inner_calls.append(scope["path"])
+
+    run, received, sent = call_middleware(http_scope("POST", "/api/invoices"), inner)
+
+    async def scenario():
+        held = await upload_gate.acquire()
+        try:
+            await run()
+        finally:
+            upload_gate.release(held)
+
+    asyncio.run(scenario())
+    assert inner_calls == []
+    assert received["body_reads"] == 0
+    assert sent[0]["status"] == 429
+    assert (b"retry-after", b"1") in sent[0]["headers"]
+    assert "Too many concurrent upload requests" in json.loads(sent[1]["body"])["detail"]
+
+
+def test_admitted_upload_runs_blocking_work_on_its_class_executor(upload_gate):
+    threads = []
+
+    async def inner(scope, receive, send):
+        threads.append(await server.run_blocking(lambda: threading.current_thread().name))
+
+    run, _, _ = call_middleware(http_scope("POST", "/api/invoices"), inner)
+    asyncio.run(run())
+    assert threads[0].startswith("admission-upload")
+    assert upload_gate.admitted == 1
+    assert upload_gate.in_flight == 0
+
+
+def test_ungated_routes_pass_straight_through(upload_gate):
+    inner_calls = []
+
+    async def inner(scope, receive, send):
+        inner_calls.append(scope["path"])
+
+    run, _, _ = call_middleware(http_scope("GET", "/api/invoices"), inner)
+    asyncio.run(run())
+    assert inner_calls == ["/api/invoices"]
+    assert upload_gate.admitted == 0
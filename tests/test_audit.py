@@ -0,0 +1,151 @@
+import asyncio
+import ipaddress
+import os
+import time
+from datetime import datetime
+
+import pytest
+from starlette.requests import Request
+
+import server
+
+
+def request_from(peer, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.fixture
+def trusted_proxies(monkeypatch):
+    monkeypatch.setattr(server, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8")])
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies():
+    assert server.client_ip(request_from("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peer(trusted_proxies):
+    assert server.client_ip(request_from("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+
+def test_forwarded_for_from_trusted_proxy_skips_forged_entries(trusted_proxies):
+    # The client claimed 192.0.2.1; the proxy appended the address it actually saw
+    request = request_from("10.0.0.2", "192.0.2.1, 198.51.100.1, 10.0.0.5")
+    assert server.client_ip(request) == "198.51.100.1"
+
+
+class FlakyAuditLog:
+    # Fails the first `failures` inserts, then records the batches
+    def __init__(self, failures):
+        self.failures = failures
+        self.batches = []
+
+    async def insert_many(self, batch, ordered=True):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("primary stepped down")
+        self.batches.append(batch)
+
+
+class FakeDatabase:
+    def __init__(self, audit_log):
+        self.audit_log = audit_log
+
+
+@pytest.fixture
+def audit_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "AUDIT_SPILL_DIR", tmp_path / "spill")
+    monkeypatch.setattr(server, "AUDIT_RETRY_BASE_SECONDS", 0.001)
+
+    def install(failures):
+        audit_log = FlakyAuditLog(failures)
+        monkeypatch.setattr(server, "db", FakeDatabase(audit_log))
+        return audit_log
+    return install
+
+
+def events(count):
+    return [{"id": f"event-{i}", "action": "invoice.status", "created_at": datetime(2024, 1, 1, 12, i)} for i in range(count)]
+
+
+def test_failed_write_is_retried(audit_db):
+    audit_log = audit_db(failures=2)
+    writer = server.AuditLogWriter(10, 10, 0.01)
+    assert asyncio.run(writer._write(events(3), attempts=3))
+    assert audit_log.batches == [events(3)]
+    assert not server.AUDIT_SPILL_DIR.exists()
+
+
+def test_batch_is_spilled_and_replayed(audit_db):
+    audit_db(failures=2)
+    writer = server.AuditLogWriter(10, 10, 0.01)
+    assert not asyncio.run(writer._write(events(3), attempts=2))
+    assert len(list(server.AUDIT_SPILL_DIR.glob("*.jsonl"))) == 1
+
+    # Next start: the database is back and the spilled events keep their types
+    audit_log = audit_db(failures=0)
+    asyncio.run(writer.replay_spilled())
+    assert audit_log.batches == [events(3)]
+    assert list(server.AUDIT_SPILL_DIR.glob("*.jsonl")) == []
+
+
+def test_concurrent_replays_write_each_spilled_batch_once(audit_db):
+    audit_db(failures=1)
+    writer = server.AuditLogWriter(10, 10, 0.01)
+    assert not asyncio.run(writer._write(events(3), attempts=1))
+
+    # Two workers starting together both replay the spill directory
+    audit_log = audit_db(failures=0)
+
+    async def start_two_workers():
+        await asyncio.gather(*(server.AuditLogWriter(10, 10, 0.01).replay_spilled() for _ in range(2)))
+
+    asyncio.run(start_two_workers())
+    assert audit_log.batches == [events(3)]
+    assert list(server.AUDIT_SPILL_DIR.iterdir()) == []
+
+
+def test_failed_replay_leaves_the_batch_for_the_next_start(audit_db):
+    audit_db(failures=1)
+    writer = server.AuditLogWriter(10, 10, 0.01)
+    asyncio.run(writer._write(events(3), attempts=1))
+    spilled = list(server.AUDIT_SPILL_DIR.iterdir())
+
+    audit_db(failures=1)
+    asyncio.run(writer.replay_spilled())
+    assert list(server.AUDIT_SPILL_DIR.iterdir()) == spilled
+
+
+def test_claim_of_a_dead_worker_is_taken_over_once_stale(audit_db):
+    audit_db(failures=1)
+    writer = server.AuditLogWriter(10, 10, 0.01)
+    asyncio.run(writer._write(events(3), attempts=1))
+    # A worker claimed the file and died before replaying it
+    [claimed] = writer._claim_spilled()
+
+    audit_log = audit_db(failures=0)
+    asyncio.run(writer.replay_spilled())
+    assert audit_log.batches == []
+
+    stale = time.time() - server.STARTUP_LOCK_TTL_SECONDS - 1
+    os.utime(claimed, (stale, stale))
+    asyncio.run(writer.replay_spilled())
+    assert audit_log.batches == [events(3)]
+    assert list(server.AUDIT_SPILL_DIR.iterdir()) == []
+
+
+def test_gc_acceptance_records_the_observed_address(run_with_db, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(server.audit_writer, "record", recorded.append)
+    user = server.User(email="billing@acme.test", name="Acme", supplier_id="supplier-1")
+
+    async def scenario(database):
+        await database.suppliers.insert_one({"id": "supplier-1", "name": "Acme"})
+        await database.general_conditions.insert_one({"id": "gc-1", "version": "2024-01", "content": "", "is_active": True})
+        # The body claims an address the request did not come from
+        return await server.accept_general_conditions("supplier-1", request_from("203.0.113.7"), "gc-1", "192.0.2.1", user)
+
+    acceptance = run_with_db(scenario)
+    assert acceptance.ip_address == "203.0.113.7"
+    assert recorded[0].ip_address == "203.0.113.7"
+    assert recorded[0].data["claimed_ip_address"] == "192.0.2.1"
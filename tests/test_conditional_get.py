@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+SUPPLIER_USER = server.User(email="billing@acme.test", name="Acme", supplier_id="supplier-1")
+OTHER_SUPPLIER_USER = server.User(email="billing@beta.test", name="Beta", supplier_id="supplier-2")
+
+
+def get(path, etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers})
+
+
+async def list_invoices(user, etag=None):
+    response = Response()
+    result = await server.get_invoices(request=get("/api/invoices", etag), response=response, current_user=user)
+    return result, response.headers.get("etag")
+
+
+async def insert_invoice(database):
+    await database.invoices.insert_one({
+        "id": "invoice-1", "supplier_id": "supplier-1", "file_path": "invoices/f-1.pdf", "amount": 120.0,
+        "due_date": datetime(2024, 3, 1), "upload_date": datetime(2024, 2, 1), "status": "pending",
+    })
+
+
+def test_matching_etag_returns_304_until_a_write(run_with_db):
+    async def scenario(database):
+        await insert_invoice(database)
+        first, etag = await list_invoices(ADMIN)
+        cached, _ = await list_invoices(ADMIN, etag)
+        await database.invoices.update_one({"id": "invoice-1"}, {"$set": {"status": "paid"}})
+        await server.bump_collection_version("invoices")
+        fresh, new_etag = await list_invoices(ADMIN, etag)
+        return first, etag, cached, fresh, new_etag
+
+    first, etag, cached, fresh, new_etag = run_with_db(scenario)
+    assert [invoice.id for invoice in first] == ["invoice-1"]
+    assert isinstance(cached, Response)
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    # The old ETag no longer matches once the version moved
+    assert [invoice.status for invoice in fresh] == ["paid"]
+    assert new_etag != etag
+
+
+def test_users_do_not_share_etags(run_with_db):
+    async def scenario(database):
+        await insert_invoice(database)
+        _, admin_etag = await list_invoices(ADMIN)
+        supplier_list, supplier_etag = await list_invoices(SUPPLIER_USER, admin_etag)
+        other_list, _ = await list_invoices(OTHER_SUPPLIER_USER, supplier_etag)
+        return admin_etag, supplier_list, supplier_etag, other_list
+
+    admin_etag, supplier_list, supplier_etag, other_list = run_with_db(scenario)
+    # Same URL and data version, but the lists differ by caller
+    assert supplier_etag != admin_etag
+    assert [invoice.id for invoice in supplier_list] == ["invoice-1"]
+    assert other_list == []
+
+
+@pytest.mark.parametrize("cached", ["wildcard", "owner"])
+def test_non_owner_is_refused_before_any_304(run_with_db, cached):
+    async def scenario(database):
+        await insert_invoice(database)
+        etag = "*"
+        if cached == "owner":
+            # The owner's own ETag for this resource
+            response = Response()
+            await server.get_invoice("invoice-1", get("/api/invoices/invoice-1"), response, SUPPLIER_USER)
+            etag = response.headers["etag"]
+        with pytest.raises(server.HTTPException) as refused:
+            await server.get_invoice("invoice-1", get("/api/invoices/invoice-1", etag), Response(), OTHER_SUPPLIER_USER)
+        with pytest.raises(server.HTTPException) as missing:
+            await server.get_invoice("invoice-2", get("/api/invoices/invoice-2", etag), Response(), ADMIN)
+        return refused.value, missing.value
+
+    refused, missing = run_with_db(scenario)
+    assert refused.status_code == 403
+    assert missing.status_code == 404
@@ -0,0 +1,29 @@
+import pytest
+from starlette.requests import Request
+
+import server
+
+
+def request(accept_encoding=None):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("header,accepted", [
+    ("gzip", True),
+    ("gzip, br", True),
+    ("br;q=1.0, gzip;q=0.5", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000", False),
+    # An entry for the encoding itself wins over the wildcard, in either order
+    ("*;q=0, gzip", True),
+    ("gzip;q=0, *", False),
+    ("*, gzip;q=0", False),
+    ("br, *;q=0", False),
+    ("identity", False),
+    ("", False),
+    (None, False),
+])
+def test_accepts_encoding(header, accepted):
+    assert server.accepts_encoding(request(header), "gzip") is accepted
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from fastapi import Response
+from starlette.requests import Request
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+
+
+def get(path, query="", etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": headers})
+
+
+async def list_contracts(etag=None):
+    response = Response()
+    result = await server.get_contracts(request=get("/api/contracts", etag=etag), response=response, current_user=ADMIN)
+    return result, response.headers.get("etag")
+
+
+def supplier(id, name, siret):
+    return {"id": id, "name": name, "siret": siret, "vat_number": "FR00" + siret[:9], "iban": "FR7600000000000000000000000", "emails": []}
+
+
+async def seed(database):
+    await database.suppliers.insert_many([
+        supplier("supplier-1", "Acme", "12345678901234"),
+        supplier("supplier-2", "Beta (EU)", "98765432109876"),
+        supplier("supplier-3", "acme north", "11111111111111"),
+    ])
+    await database.contract_templates.insert_many([
+        {"id": "template-1", "name": "Framework", "file_path": "templates/t-1.docx", "created_at": datetime(2024, 1, 1)},
+        {"id": "template-2", "name": "NDA", "file_path": "templates/t-2.docx", "created_at": datetime(2024, 1, 2)},
+    ])
+    await database.contracts.insert_many([
+        {"id": "contract-1", "supplier_id": "supplier-1", "template_id": "template-1", "created_at": datetime(2024, 2, 1)},
+        {"id": "contract-2", "supplier_id": "supplier-2", "template_id": "template-2", "created_at": datetime(2024, 2, 2)},
+        {"id": "contract-3", "supplier_id": "deleted-supplier", "template_id": "template-1", "created_at": datetime(2024, 2, 3)},
+    ])
+
+
+def test_contract_list_resolves_names_for_the_page(run_with_db):
+    async def scenario(database):
+        await seed(database)
+        contracts, _ = await list_contracts()
+        return contracts
+
+    contracts = run_with_db(scenario)
+    names = {contract.id: (contract.supplier_name, contract.template_name) for contract in contracts}
+    assert names == {
+        "contract-1": ("Acme", "Framework"),
+        "contract-2": ("Beta (EU)", "NDA"),
+        # A dangling reference lists without a name instead of failing
+        "contract-3": (None, "Framework"),
+    }
+
+
+def test_renaming_a_supplier_changes_the_contract_list_etag(run_with_db):
+    async def scenario(database):
+        await seed(database)
+        _, etag = await list_contracts()
+        await database.suppliers.update_one({"id": "supplier-1"}, {"$set": {"name": "Acme Group"}})
+        await server.bump_collection_version("suppliers")
+        fresh, new_etag = await list_contracts(etag)
+        return etag, fresh, new_etag
+
+    etag, fresh, new_etag = run_with_db(scenario)
+    assert new_etag != etag
+    assert {contract.supplier_name for contract in fresh if contract.supplier_id == "supplier-1"} == {"Acme Group"}
+
+
+def test_supplier_and_template_search_by_name_prefix(run_with_db):
+    async def scenario(database):
+        await seed(database)
+        acme = await server.get_suppliers(request=get("/api/suppliers", "q=acme"), response=Response(), q="acme", current_user=ADMIN)
+        # Regex characters in the input are matched literally
+        beta = await server.get_suppliers(request=get("/api/suppliers", "q=Beta+("), response=Response(), q="Beta (", current_user=ADMIN)
+        nda = await server.get_contract_templates(request=get("/api/contract-templates", "q=nd"), response=Response(), q="nd", current_user=ADMIN)
+        return acme, beta, nda
+
+    acme, beta, nda = run_with_db(scenario)
+    assert [supplier.id for supplier in acme] == ["supplier-1", "supplier-3"]
+    assert [supplier.id for supplier in beta] == ["supplier-2"]
+    assert [template.id for template in nda] == ["template-2"]
@@ -0,0 +1,31 @@
+import server
+
+
+def change(collection, operation, doc, updated_fields=None):
+    event = {"ns": {"coll": collection}, "operationType": operation, "fullDocument": doc}
+    if updated_fields is not None:
+        event["updateDescription"] = {"updatedFields": updated_fields}
+    return event
+
+
+def test_new_general_conditions_are_published():
+    event = server.change_to_event(change("general_conditions", "insert", {"id": "gc-2", "version": "2.0", "is_active": True}))
+    assert event == {"type": "gc.published", "supplier_id": None, "id": "gc-2", "version": "2.0", "is_active": True}
+
+
+def test_activation_is_published_but_deactivation_is_not():
+    activated = change("general_conditions", "update", {"id": "gc-1", "is_active": True}, {"is_active": True})
+    deactivated = change("general_conditions", "update", {"id": "gc-1", "is_active": False}, {"is_active": False})
+    edited = change("general_conditions", "update", {"id": "gc-1", "is_active": True}, {"content": "..."})
+    assert server.change_to_event(activated)["type"] == "gc.published"
+    assert server.change_to_event(deactivated) is None
+    assert server.change_to_event(edited) is None
+
+
+def test_status_changes_map_to_status_events():
+    doc = {"id": "inv-1", "supplier_id": "sup-1", "status": "paid"}
+    assert server.change_to_event(change("invoices", "update", doc, {"status": "paid"})) == {
+        "type": "invoice.status", "supplier_id": "sup-1", "id": "inv-1", "status": "paid",
+    }
+    assert server.change_to_event(change("invoices", "update", doc, {"notes": "late"})) is None
+    assert server.change_to_event(change("contracts", "insert", {"id": "c-1", "supplier_id": "sup-1", "status": "draft"}))["type"] == "contract.created"
@@ -0,0 +1,118 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+import server
+
+INVOICES = [
+    {
+        "id": f"invoice-{i}", "supplier_id": "supplier-1", "supplier_name": "Acme", "supplier_siret": "123",
+        "supplier_vat_number": "FR1", "amount": 100.0 + i, "due_date": datetime(2024, 3, 1 + i),
+        "upload_date": datetime(2024, 2, 1), "status": "pending", "payment_date": None, "notes": "line, with comma",
+    }
+    for i in range(5)
+]
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    # Serves INVOICES in batches of the requested size instead of a Mongo cursor
+    served = []
+
+    async def fake_batches(collection, pipeline, batch_size):
+        for start in range(0, len(INVOICES), batch_size):
+            served.append(start)
+            yield INVOICES[start:start + batch_size]
+
+    monkeypatch.setattr(server, "iter_export_batches", fake_batches)
+    return served
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_pipeline_filters_sorts_and_joins():
+    pipeline = server.build_export_pipeline("invoices", "due_date", "2024-03-01", "2024-04-01", "pending", "supplier-1")
+    assert pipeline[0] == {"$match": {
+        "due_date": {"$gte": datetime(2024, 3, 1), "$lt": datetime(2024, 4, 1)},
+        "status": "pending",
+        "supplier_id": "supplier-1",
+    }}
+    assert pipeline[1] == {"$sort": {"due_date": 1, "id": 1}}
+    assert pipeline[2]["$lookup"]["from"] == "suppliers"
+    assert pipeline[3]["$project"]["supplier_vat_number"] == {"$first": "$supplier.vat_number"}
+    # Contracts have no VAT number column
+    contracts = server.build_export_pipeline("contracts", "created_at", None, None, None, None)
+    assert contracts[0] == {"$match": {}}
+    assert "supplier_vat_number" not in contracts[3]["$project"]
+
+
+@pytest.mark.parametrize("date_field,start_date", [("amount", None), ("due_date", "next week")])
+def test_pipeline_rejects_bad_parameters(date_field, start_date):
+    with pytest.raises(server.HTTPException) as error:
+        server.build_export_pipeline("invoices", date_field, start_date, None, None, None)
+    assert error.value.status_code == 400
+
+
+def test_csv_export_is_gzipped_with_header(batches):
+    chunks = asyncio.run(collect(server.stream_text_export("invoices", [], "csv", 2)))
+    rows = list(csv.reader(io.StringIO(gzip.decompress(b"".join(chunks)).decode())))
+    assert batches == [0, 2, 4]
+    assert rows[0] == [name for name, _ in server.EXPORT_FIELDS["invoices"]]
+    assert len(rows) == 6
+    assert rows[1][0] == "invoice-0"
+    assert rows[1][6] == "2024-03-01T00:00:00"
+    assert rows[1][10] == "line, with comma"
+
+
+def test_ndjson_export_has_one_object_per_line(batches):
+    chunks = asyncio.run(collect(server.stream_text_export("invoices", [], "ndjson", 2)))
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["id"] for record in records] == [f"invoice-{i}" for i in range(5)]
+    assert records[4]["amount"] == 104.0
+    assert records[0]["payment_date"] is None
+
+
+def test_parquet_export_writes_a_row_group_per_batch(batches):
+    pq = pytest.importorskip("pyarrow.parquet")
+    chunks = asyncio.run(collect(server.stream_parquet_export("invoices", [], 2)))
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.num_rows == 5
+    assert table.column("due_date")[0].as_py() == datetime(2024, 3, 1)
+    assert str(table.schema.field("amount").type) == "double"
+
+
+def test_export_response_headers_and_format_check(batches):
+    response = server.export_response("invoices", "ndjson", 10 ** 6, [])
+    assert response.media_type == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.ndjson.gz"')
+    parquet = server.export_response("contracts", "parquet", 10, [])
+    assert parquet.media_type == "application/vnd.apache.parquet"
+    with pytest.raises(server.HTTPException) as error:
+        server.export_response("invoices", "xlsx", 10, [])
+    assert error.value.status_code == 400
+
+
+def test_export_joins_supplier_columns(run_with_db):
+    async def scenario(database):
+        await database.suppliers.insert_one({"id": "supplier-1", "name": "Acme", "siret": "123", "vat_number": "FR1"})
+        await database.invoices.insert_many([
+            {key: value for key, value in invoice.items() if not key.startswith("supplier_") or key == "supplier_id"}
+            for invoice in INVOICES
+        ])
+        pipeline = server.build_export_pipeline("invoices", "due_date", "2024-03-02", None, None, None)
+        return [doc async for batch in server.iter_export_batches("invoices", pipeline, 2) for doc in batch]
+
+    docs = run_with_db(scenario)
+    assert [doc["id"] for doc in docs] == [f"invoice-{i}" for i in range(1, 5)]
+    assert docs[0]["supplier_name"] == "Acme"
+    assert docs[0]["supplier_vat_number"] == "FR1"
@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize("rule,expected", [
+    ("30", (30, False)),
+    ("45 jours fin de mois", (45, True)),
+    ("60 days EOM", (60, True)),
+    ("End of month", (0, True)),
+    ("on receipt", None),
+    ("", None),
+    (None, None),
+])
+def test_payment_rule_parsing(rule, expected):
+    assert server.parse_payment_rule(rule) == expected
+
+
+def days(*dates):
+    return np.array(dates, dtype="datetime64[D]")
+
+
+def test_payout_follows_rule_or_due_date():
+    due = days("2024-03-10", "2024-03-10", "2024-03-10")
+    uploaded = days("2024-01-20", "2024-01-20", "2024-01-20")
+    # Supplier 0 has no rule, 1 pays 30 days after upload, 2 pays 30 days end of month
+    payout = server.project_payout_days(
+        due, uploaded, np.array([0, 1, 2]),
+        rule_days=np.array([0, 30, 30]),
+        rule_end_of_month=np.array([False, False, True]),
+        has_rule=np.array([False, True, True]),
+        shift_days=0,
+    )
+    assert payout.tolist() == days("2024-03-10", "2024-02-19", "2024-02-29").tolist()
+
+
+def test_payout_shift_applies_to_every_invoice():
+    payout = server.project_payout_days(
+        days("2024-12-31"), days("2024-12-01"), np.array([0]),
+        rule_days=np.array([0]), rule_end_of_month=np.array([False]), has_rule=np.array([False]),
+        shift_days=3,
+    )
+    assert payout.tolist() == days("2025-01-03").tolist()
+
+
+def invoice(supplier_id, amount, due_date, status="pending"):
+    return {
+        "id": str(uuid.uuid4()), "supplier_id": supplier_id, "amount": amount, "status": status,
+        "due_date": due_date, "upload_date": datetime(2024, 2, 20),
+    }
+
+
+def test_forecast_buckets_and_totals(run_with_db, monkeypatch):
+    admin = server.User(email="admin@test.example", name="Admin", is_admin=True)
+    monkeypatch.setattr(server, "forecast_cache", server.OrderedDict())
+
+    async def scenario(database):
+        await database.suppliers.insert_many([
+            {"id": "supplier-a", "name": "Acme", "payment_rule": "30 days end of month"},
+            {"id": "supplier-b", "name": "Beta"},
+        ])
+        await database.invoices.insert_many([
+            invoice("supplier-a", 100.0, datetime(2024, 3, 2)),
+            invoice("supplier-b", 50.0, datetime(2024, 3, 1)),
+            invoice("supplier-b", 25.5, datetime(2024, 3, 9)),
+            invoice("supplier-b", 10.0, datetime(2024, 2, 25)),
+            invoice("supplier-b", 7.0, datetime(2024, 4, 30)),
+            invoice("supplier-b", 999.0, datetime(2024, 3, 3), status="paid"),
+        ])
+        forecast = server.get_cash_flow_forecast
+        weekly = await forecast(start_date="2024-03-01", horizon_days=14, bucket="week", current_user=admin,
+                                supplier_id=None, apply_payment_rules=False, rule_overrides=None,
+                                shift_days=0, top_suppliers=20)
+        ruled = await forecast(start_date="2024-03-01", horizon_days=31, bucket="day", current_user=admin,
+                               supplier_id=None, apply_payment_rules=True, rule_overrides=None,
+                               shift_days=0, top_suppliers=1)
+        cached = await forecast(start_date="2024-03-01", horizon_days=14, bucket="week", current_user=admin,
+                                supplier_id=None, apply_payment_rules=False, rule_overrides=None,
+                                shift_days=0, top_suppliers=20)
+        return weekly, ruled, cached
+
+    weekly, ruled, cached = run_with_db(scenario)
+    assert weekly.buckets == ["2024-03-01", "2024-03-08"]
+    assert weekly.totals == [150.0, 25.5]
+    assert weekly.total == 175.5
+    assert weekly.overdue_total == 10.0
+    assert weekly.beyond_horizon_total == 7.0
+    # Paid invoices are not part of the forecast
+    assert weekly.invoice_count == 5
+    assert {s.supplier_id: s.series for s in weekly.suppliers} == {
+        "supplier-a": [100.0, 0.0], "supplier-b": [50.0, 25.5],
+    }
+    assert cached is weekly
+
+    # 30 days after the 20 February upload, moved to the end of March
+    assert ruled.totals[30] == 100.0
+    assert [s.supplier_id for s in ruled.suppliers] == ["supplier-a"]
+    assert ruled.suppliers[0].payment_rule == "30 days end of month"
+
+
+@pytest.mark.parametrize("params", [{"bucket": "month"}, {"horizon_days": 0}, {"start_date": "March"}, {"rule_overrides": "[1]"}])
+def test_forecast_rejects_bad_parameters(params):
+    admin = server.User(email="admin@test.example", name="Admin", is_admin=True)
+    arguments = dict(start_date=None, horizon_days=90, bucket="day", supplier_id=None, apply_payment_rules=False,
+                     rule_overrides=None, shift_days=0, top_suppliers=20, current_user=admin)
+    arguments.update(params)
+    with pytest.raises(server.HTTPException) as error:
+        asyncio.run(server.get_cash_flow_forecast(**arguments))
+    assert error.value.status_code == 400
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+
+class Admin:
+    def __init__(self, reachable=True):
+        self.reachable = reachable
+
+    async def command(self, name):
+        if not self.reachable:
+            raise server.OperationFailure("not reachable")
+        return {"ok": 1}
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    for flag in ("indexes_applied", "executors_started", "warmup_complete"):
+        monkeypatch.setitem(server.startup_state, flag, False)
+
+
+def ready(monkeypatch, reachable=True):
+    monkeypatch.setattr(server, "client", SimpleNamespace(admin=Admin(reachable)))
+    response = asyncio.run(server.readiness())
+    return response.status_code, json.loads(response.body)
+
+
+def test_readiness_waits_for_every_startup_phase(monkeypatch, fresh_state):
+    assert ready(monkeypatch)[0] == 503
+    server.startup_state["indexes_applied"] = True
+    server.startup_state["executors_started"] = True
+    # Indexes and pools are up, but templates are still being pre-converted
+    status, body = ready(monkeypatch)
+    assert status == 503
+    assert body["status"] == "starting"
+    assert body["checks"]["warmup_complete"] is False
+
+    server.startup_state["warmup_complete"] = True
+    status, body = ready(monkeypatch)
+    assert status == 200
+    assert body["status"] == "ready"
+
+
+def test_readiness_fails_when_mongo_does_not_answer(monkeypatch, fresh_state):
+    for flag in ("indexes_applied", "executors_started", "warmup_complete"):
+        server.startup_state[flag] = True
+    status, body = ready(monkeypatch, reachable=False)
+    assert status == 503
+    assert body["checks"]["mongo"] is False
+
+
+def test_liveness_does_not_depend_on_startup():
+    assert asyncio.run(server.liveness()) == {"status": "alive"}
+
+
+def test_warm_up_pre_converts_recent_templates_and_completes(run_with_db, monkeypatch, fresh_state):
+    converted = []
+
+    def convert(file_path):
+        if file_path == "templates/broken.docx":
+            raise ValueError("not a docx")
+        converted.append(file_path)
+
+    monkeypatch.setattr(server, "convert_template_to_html", convert)
+
+    async def scenario(database):
+        await database.contract_templates.insert_many([
+            {"id": "template-1", "name": "Framework", "file_path": "templates/t-1.docx"},
+            {"id": "template-2", "name": "Broken", "file_path": "templates/broken.docx"},
+            {"id": "template-3", "name": "Unused", "file_path": "templates/t-3.docx"},
+        ])
+        await database.contracts.insert_many([
+            {"id": "contract-1", "supplier_id": "s", "template_id": "template-1", "created_at": datetime(2024, 2, 1)},
+            {"id": "contract-2", "supplier_id": "s", "template_id": "template-2", "created_at": datetime(2024, 2, 2)},
+        ])
+        await server.warm_up()
+
+    run_with_db(scenario)
+    # Templates no recent contract uses are left cold, and one bad file does not stop warm-up
+    assert converted == ["templates/t-1.docx"]
+    assert server.startup_state["warmup_complete"] is True
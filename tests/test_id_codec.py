@@ -0,0 +1,116 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import server
+
+SUPPLIER_ID = "3f2b8c1e-9a4d-4e6f-8b7a-1c2d3e4f5a6b"
+INVOICE_ID = "9d8c7b6a-5f4e-4d3c-8b2a-1a0f9e8d7c6b"
+
+
+def test_only_canonical_ids_are_converted():
+    assert server.to_binary_id(SUPPLIER_ID) == uuid.UUID(SUPPLIER_ID)
+    # Non-canonical spellings stay strings, as they would under ID_STORAGE=string
+    assert server.to_binary_id(SUPPLIER_ID.upper()) == SUPPLIER_ID.upper()
+    assert server.to_binary_id("not-a-uuid-but-thirty-six-characters") == "not-a-uuid-but-thirty-six-characters"
+    assert server.to_binary_id(42) == 42
+
+
+def test_filters_match_both_forms_only_in_dual_mode():
+    binary = uuid.UUID(SUPPLIER_ID)
+    assert server.encode_ids({"supplier_id": SUPPLIER_ID}) == {"supplier_id": binary}
+    assert server.encode_ids({"supplier_id": SUPPLIER_ID}, True) == {"supplier_id": {"$in": [binary, SUPPLIER_ID]}}
+    assert server.encode_ids({"id": {"$in": [SUPPLIER_ID]}}, True) == {"id": {"$in": [binary, SUPPLIER_ID]}}
+    assert server.encode_ids({"id": {"$ne": SUPPLIER_ID}}, True) == {"id": {"$nin": [binary, SUPPLIER_ID]}}
+    # Fields outside ID_FIELDS are left alone
+    assert server.encode_ids({"name": SUPPLIER_ID}, True) == {"name": SUPPLIER_ID}
+
+
+def test_updates_and_pipelines_are_encoded():
+    binary = uuid.UUID(SUPPLIER_ID)
+    update = server.encode_ids({"$set": {"supplier_id": SUPPLIER_ID, "notes": "x"}})
+    assert update == {"$set": {"supplier_id": binary, "notes": "x"}}
+    pipeline = server.encode_ids([{"$match": {"supplier_id": SUPPLIER_ID}}, {"$sort": {"id": 1}}], True)
+    assert pipeline == [{"$match": {"supplier_id": {"$in": [binary, SUPPLIER_ID]}}}, {"$sort": {"id": 1}}]
+
+
+def test_decoding_restores_canonical_strings():
+    stored = {"id": uuid.UUID(INVOICE_ID), "items": [{"supplier_id": uuid.UUID(SUPPLIER_ID)}]}
+    assert server.decode_ids(stored) == {"id": INVOICE_ID, "items": [{"supplier_id": SUPPLIER_ID}]}
+
+
+def run_in_mode(mongo_db, mode, scenario):
+    # Builds the database handle the app would use under ID_STORAGE=mode
+    async def main():
+        client = AsyncIOMotorClient(os.environ["MONGO_URL"], uuidRepresentation="standard")
+        raw = client[f"{mongo_db.name}_{mode}"]
+        await raw.suppliers.delete_many({})
+        await raw.invoices.delete_many({})
+        database = raw if mode == "string" else server.IdCodecDatabase(raw, match_both=mode == "dual")
+        try:
+            return await scenario(raw, database)
+        finally:
+            client.close()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("mode", ["string", "binary", "dual"])
+def test_round_trip(mongo_db, mode):
+    async def scenario(raw, database):
+        await database.suppliers.insert_one({"id": SUPPLIER_ID, "name": "Supplier"})
+        await database.invoices.insert_one({"id": INVOICE_ID, "supplier_id": SUPPLIER_ID, "status": "pending"})
+        await database.invoices.update_one({"id": INVOICE_ID}, {"$set": {"status": "paid", "supplier_id": SUPPLIER_ID}})
+
+        found = await database.invoices.find_one({"supplier_id": SUPPLIER_ID}, {"_id": 0})
+        listed = await database.invoices.find({"id": {"$in": [INVOICE_ID]}}, {"_id": 0}).to_list(10)
+        joined = await database.invoices.aggregate([
+            {"$match": {"supplier_id": SUPPLIER_ID}},
+            {"$lookup": {"from": "suppliers", "localField": "supplier_id", "foreignField": "id", "as": "supplier"}},
+            {"$project": {"_id": 0, "id": 1, "supplier_id": {"$first": "$supplier.id"}}},
+        ]).to_list(10)
+        stored = await raw.invoices.find_one({}, {"_id": 0})
+        return found, listed, joined, stored
+
+    found, listed, joined, stored = run_in_mode(mongo_db, mode, scenario)
+    expected = {"id": INVOICE_ID, "supplier_id": SUPPLIER_ID, "status": "paid"}
+    assert found == expected
+    assert listed == [expected]
+    assert joined == [{"id": INVOICE_ID, "supplier_id": SUPPLIER_ID}]
+    stored_type = str if mode == "string" else uuid.UUID
+    assert isinstance(stored["id"], stored_type)
+    assert isinstance(stored["supplier_id"], stored_type)
+
+
+def test_dual_mode_matches_documents_not_yet_migrated(mongo_db):
+    async def scenario(raw, database):
+        # Written as a string before the switch to dual
+        await raw.invoices.insert_one({"id": INVOICE_ID, "supplier_id": SUPPLIER_ID, "status": "pending"})
+        await database.invoices.update_one({"supplier_id": SUPPLIER_ID}, {"$set": {"status": "paid"}})
+        return await database.invoices.find_one({"id": INVOICE_ID}, {"_id": 0})
+
+    assert run_in_mode(mongo_db, "dual", scenario) == {"id": INVOICE_ID, "supplier_id": SUPPLIER_ID, "status": "paid"}
+
+
+def test_joins_are_refused_in_dual_mode_until_migrated(monkeypatch):
+    class Migrations:
+        def __init__(self, state):
+            self.state = state
+
+        async def find_one(self, *args, **kwargs):
+            return self.state
+
+    class RawDatabase:
+        def __init__(self, state):
+            self.migrations = Migrations(state)
+
+    monkeypatch.setattr(server, "ID_STORAGE", "dual")
+    monkeypatch.setattr(server, "raw_db", RawDatabase({"status": "running"}))
+    with pytest.raises(server.HTTPException) as refused:
+        asyncio.run(server.require_uniform_ids())
+    assert refused.value.status_code == 503
+
+    monkeypatch.setattr(server, "raw_db", RawDatabase({"status": "complete"}))
+    asyncio.run(server.require_uniform_ids())
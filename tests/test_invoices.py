@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+from starlette.requests import Request
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+
+
+def request():
+    return Request({"type": "http", "method": "PUT", "path": "/", "headers": [], "client": ("203.0.113.7", 1234)})
+
+
+@pytest.fixture
+def audit_events(monkeypatch):
+    events = []
+    monkeypatch.setattr(server.audit_writer, "record", events.append)
+    return events
+
+
+def stored_invoice(**fields):
+    return {
+        "id": "invoice-1", "supplier_id": "supplier-1",
+        "amount": 120.0, "due_date": datetime(2024, 3, 1), "file_path": "invoices/f-1.pdf",
+        "upload_date": datetime(2024, 2, 1), "status": "pending", **fields,
+    }
+
+
+def test_status_change_is_written_notified_and_audited(run_with_db, audit_events):
+    async def scenario(database):
+        await database.invoices.insert_one(stored_invoice())
+        invoice = await server.update_invoice_status("invoice-1", request(), "paid", "2024-03-05", ADMIN)
+        return invoice, await database.outbox.find({}, {"_id": 0}).to_list(None)
+
+    invoice, outbox = run_with_db(scenario)
+    assert invoice.status == "paid"
+    assert invoice.payment_date == datetime(2024, 3, 5)
+    assert [message["kind"] for message in outbox] == ["invoice.status"]
+    assert [(event.action, event.ip_address) for event in audit_events] == [("status_changed", "203.0.113.7")]
+
+
+def test_invoice_deleted_during_the_update_is_a_404(run_with_db, audit_events, monkeypatch):
+    async def read_before_delete(invoice_id, *fields):
+        # The invoice is read, then deleted by another request before the update
+        return stored_invoice()
+
+    async def scenario(database):
+        monkeypatch.setattr(server.invoice_repo, "get_by_id", read_before_delete)
+        with pytest.raises(server.HTTPException) as error:
+            await server.update_invoice_status("invoice-1", request(), "paid", None, ADMIN)
+        return error.value, await database.outbox.count_documents({})
+
+    error, outbox_count = run_with_db(scenario)
+    assert error.status_code == 404
+    assert outbox_count == 0
+    assert audit_events == []
@@ -0,0 +1,114 @@
+import pytest
+
+import server
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    storage = server.LocalStorage(tmp_path)
+    monkeypatch.setattr(server, "storage", storage)
+    monkeypatch.setattr(server, "UPLOAD_DIR", tmp_path)
+    return storage
+
+
+async def insert_invoices(database, storage, names):
+    for name in names:
+        storage.write_bytes(f"invoices/{name}", name.encode())
+        await database.invoices.insert_one({"id": name, "file_path": f"invoices/{name}"})
+
+
+async def migration_state(database):
+    return await database.migrations.find_one({"_id": server.LAYOUT_MIGRATION_ID})
+
+
+def test_files_move_into_the_fan_out_layout(run_with_db, local_storage):
+    async def scenario(database):
+        await insert_invoices(database, local_storage, ["a.pdf", "b.pdf", "c.pdf"])
+        local_storage.write_bytes("templates/t.docx", b"template")
+        await database.contract_templates.insert_one({"id": "template-1", "file_path": "templates/t.docx"})
+        await server.migrate_upload_layout(batch_size=2, pause_seconds=0)
+        docs = await database.invoices.find({}, {"_id": 0, "id": 1, "file_path": 1}).to_list(None)
+        template = await database.contract_templates.find_one({"id": "template-1"})
+        versions = await server.get_collection_versions("invoices", "contract_templates")
+        return docs, template, await migration_state(database), versions
+
+    docs, template, state, versions = run_with_db(scenario)
+    for doc in docs:
+        assert doc["file_path"] == server.sharded_key_for(f"invoices/{doc['id']}")
+        assert server.SHARDED_KEY_PATTERN.match(doc["file_path"])
+        assert local_storage.read_bytes(doc["file_path"]) == doc["id"].encode()
+        assert not local_storage.exists(f"invoices/{doc['id']}")
+    assert template["file_path"] == server.sharded_key_for("templates/t.docx")
+    assert state["status"] == "complete"
+    assert state["counts"] == {"moved": 4, "rewritten": 0, "missing": 0}
+    # Cached lists and ETags see the rewritten paths
+    assert versions["invoices"] > 0 and versions["contract_templates"] > 0
+
+
+def test_rerun_after_a_crash_resumes_from_the_checkpoint(run_with_db, local_storage, monkeypatch):
+    copy = local_storage.copy
+    copies = []
+
+    def crash_on_third_copy(source, destination):
+        copies.append(source)
+        if len(copies) == 3:
+            raise OSError("worker killed")
+        copy(source, destination)
+
+    def recorded_copy(source, destination):
+        copies.append(source)
+        copy(source, destination)
+
+    async def scenario(database):
+        await insert_invoices(database, local_storage, ["a.pdf", "b.pdf", "c.pdf", "d.pdf"])
+        monkeypatch.setattr(local_storage, "copy", crash_on_third_copy)
+        await server.migrate_upload_layout(batch_size=2, pause_seconds=0)
+        crashed = await migration_state(database)
+
+        copies.clear()
+        monkeypatch.setattr(local_storage, "copy", recorded_copy)
+        await server.migrate_upload_layout(batch_size=2, pause_seconds=0)
+        return crashed, await migration_state(database)
+
+    crashed, state = run_with_db(scenario)
+    assert crashed["status"] == "failed"
+    assert "worker killed" in crashed["error"]
+    assert crashed["counts"]["moved"] == 2
+    # Only the batch after the checkpoint is copied again
+    assert copies == ["invoices/c.pdf", "invoices/d.pdf"]
+    assert state["status"] == "complete"
+    assert state["counts"] == {"moved": 4, "rewritten": 0, "missing": 0}
+    for name in ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]:
+        assert local_storage.read_bytes(server.sharded_key_for(f"invoices/{name}")) == name.encode()
+
+
+def test_already_migrated_keys_are_left_alone(run_with_db, local_storage, monkeypatch):
+    key = server.sharded_key_for("invoices/a.pdf")
+    local_storage.write_bytes(key, b"a.pdf")
+
+    async def scenario(database):
+        await database.invoices.insert_one({"id": "a.pdf", "file_path": key})
+        monkeypatch.setattr(local_storage, "copy", lambda source, destination: pytest.fail("copied a migrated key"))
+        await server.migrate_upload_layout(batch_size=2, pause_seconds=0)
+        return await database.invoices.find_one({"id": "a.pdf"}), await migration_state(database)
+
+    doc, state = run_with_db(scenario)
+    assert doc["file_path"] == key
+    assert local_storage.read_bytes(key) == b"a.pdf"
+    assert state["status"] == "complete"
+    assert state["counts"] == {"moved": 0, "rewritten": 0, "missing": 0}
+
+
+def test_file_already_copied_by_an_interrupted_run_is_rewritten(run_with_db, local_storage):
+    new_key = server.sharded_key_for("invoices/a.pdf")
+
+    async def scenario(database):
+        # The copy happened but the records still point at the old key
+        local_storage.write_bytes(new_key, b"a.pdf")
+        await database.invoices.insert_one({"id": "a.pdf", "file_path": "invoices/a.pdf"})
+        result = await server.relocate_file("invoices/a.pdf", new_key)
+        return result, await database.invoices.find_one({"id": "a.pdf"})
+
+    result, doc = run_with_db(scenario)
+    assert result == "rewritten"
+    assert doc["file_path"] == new_key
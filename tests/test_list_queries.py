@@ -0,0 +1,135 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+
+@pytest.fixture(scope="module")
+def db(mongo_db):
+    now = datetime.utcnow()
+    suppliers = [str(uuid.uuid4()) for _ in range(20)]
+    mongo_db.invoices.insert_many([
+        {
+            "id": str(uuid.uuid4()),
+            "supplier_id": suppliers[i % 20],
+            "status": server.LIST_STATUSES["invoices"][i % 3],
+            "amount": float(i * 37 % 20000),
+            "due_date": now + timedelta(days=i % 90),
+            "upload_date": now - timedelta(hours=i),
+        }
+        for i in range(2000)
+    ])
+    mongo_db.contracts.insert_many([
+        {
+            "id": str(uuid.uuid4()),
+            "supplier_id": suppliers[i % 20],
+            "status": server.LIST_STATUSES["contracts"][i % 4],
+            "created_at": now - timedelta(hours=i),
+            "signed_at": now - timedelta(hours=i // 2) if i % 4 == 2 else None,
+        }
+        for i in range(2000)
+    ])
+    for collection in ("invoices", "contracts"):
+        for keys, options in server.INDEXES[collection]:
+            mongo_db[collection].create_index(keys, **options)
+
+    return mongo_db, suppliers
+
+
+def winning_stages(collection, query, sort_spec):
+    plan = collection.find(query).sort(sort_spec).explain()["queryPlanner"]["winningPlan"]
+    return server.find_plan_stages(plan)
+
+
+CASES = [
+    ("invoices", False, "pending", {"due_date": {"$lt": datetime.utcnow() + timedelta(days=7)}, "amount": {"$gte": 10000}}, "due_date"),
+    ("invoices", True, None, {"upload_date": {"$gte": datetime.utcnow() - timedelta(days=30)}}, "-upload_date"),
+    ("invoices", True, "paid", {}, "-amount"),
+    ("invoices", False, None, {}, "amount"),
+    ("invoices", False, None, {"due_date": {"$gte": datetime.utcnow()}}, "due_date"),
+    ("contracts", False, "signed", {"signed_at": {"$gte": datetime.utcnow() - timedelta(days=7)}}, "-signed_at"),
+    ("contracts", True, None, {}, "-created_at"),
+    ("contracts", True, "draft", {}, "created_at"),
+    ("contracts", False, None, {}, "-created_at"),
+]
+
+
+@pytest.mark.parametrize("collection_name,with_supplier,status,ranges,sort", CASES)
+def test_list_query_uses_matching_index(db, collection_name, with_supplier, status, ranges, sort):
+    database, suppliers = db
+    supplier_id = suppliers[3] if with_supplier else None
+    query, sort_spec = server.build_list_query(collection_name, supplier_id, status, ranges, sort)
+
+    stages = winning_stages(database[collection_name], query, sort_spec)
+
+    expected = server.list_query_index_name(collection_name, supplier_id, status, sort)
+    assert f"IXSCAN({expected})" in stages
+    assert "COLLSCAN" not in stages
+    # A blocking in-memory sort would mean the index order is not used
+    assert "SORT" not in stages
+
+
+def test_sort_fields_are_whitelisted():
+    with pytest.raises(server.HTTPException) as error:
+        server.build_list_query("invoices", None, None, {}, "notes")
+    assert error.value.status_code == 400
+
+
+def test_unfiltered_list_has_no_status_condition(db):
+    # Documents with a missing or legacy status are listed as before
+    database, _ = db
+    legacy = [{"id": str(uuid.uuid4()), "due_date": datetime.utcnow()}, {"id": str(uuid.uuid4()), "status": "approved", "due_date": datetime.utcnow()}]
+    database.invoices.insert_many(legacy)
+    try:
+        query, sort_spec = server.build_list_query("invoices", None, None, {}, "due_date")
+        assert "status" not in query
+        listed = {invoice["id"] for invoice in database.invoices.find(query).sort(sort_spec)}
+        assert {invoice["id"] for invoice in legacy} <= listed
+    finally:
+        database.invoices.delete_many({"id": {"$in": [invoice["id"] for invoice in legacy]}})
+
+
+def test_every_sort_field_has_indexes():
+    for collection, fields in server.LIST_SORT_FIELDS.items():
+        index_keys = [[key for key, _ in keys] for keys, _ in server.INDEXES[collection]]
+        for field in fields:
+            assert [field, "id"] in index_keys
+            assert ["status", field, "id"] in index_keys
+            assert ["supplier_id", field, "id"] in index_keys
+
+
+def test_no_index_is_a_prefix_of_another():
+    for collection, indexes in server.INDEXES.items():
+        keys = [tuple(key for key, _ in index_keys) for index_keys, options in indexes if not options.get("unique")]
+        for index in keys:
+            assert not any(other != index and other[:len(index)] == index for other in keys), (collection, index)
+        names = {
+            options.get("name") or "_".join(f"{key}_{direction}" for key, direction in index_keys)
+            for index_keys, options in indexes
+        }
+        assert not names & set(server.OBSOLETE_INDEXES.get(collection, []))
+
+
+def test_index_dropped_by_another_worker_is_ignored(monkeypatch):
+    class Collection:
+        def __init__(self, name):
+            self.name = name
+
+        async def index_information(self):
+            return {name: {} for name in server.OBSOLETE_INDEXES.get(self.name, [])}
+
+        async def drop_index(self, name):
+            # Listed above, but a concurrent worker got there first
+            raise server.OperationFailure("index not found", code=27)
+
+        async def create_index(self, keys, **options):
+            created.append((self.name, keys))
+
+    created = []
+    monkeypatch.setitem(server.startup_state, "indexes_applied", False)
+    monkeypatch.setattr(server, "db", {name: Collection(name) for name in {*server.INDEXES, *server.OBSOLETE_INDEXES}})
+    asyncio.run(server.apply_indexes())
+    assert len(created) == sum(len(indexes) for indexes in server.INDEXES.values())
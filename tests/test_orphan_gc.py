@@ -0,0 +1,135 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+HOUR = 3600
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    storage = server.LocalStorage(tmp_path)
+    monkeypatch.setattr(server, "storage", storage)
+    monkeypatch.setattr(server, "UPLOAD_DIR", tmp_path)
+    return storage
+
+
+def put(storage, name, age_seconds=2 * HOUR, prefix="invoices"):
+    # Writes a file in the fan-out layout, last modified age_seconds ago
+    key = server.sharded_key_for(f"{prefix}/{name}")
+    storage.write_bytes(key, name.encode())
+    modified = time.time() - age_seconds
+    os.utime(storage.path(key), (modified, modified))
+    return key
+
+
+def new_stats():
+    return {"scanned": 0, "quarantined": 0, "restored": 0, "deleted": 0, "reclaimed_bytes": 0}
+
+
+def test_legacy_absolute_paths_count_as_references(run_with_db, local_storage):
+    current = put(local_storage, "current.pdf")
+    legacy = put(local_storage, "legacy.pdf")
+    orphan = put(local_storage, "orphan.pdf")
+
+    async def scenario(database):
+        await database.invoices.insert_one({"id": "invoice-1", "file_path": current})
+        await database.contracts.insert_one({"id": "contract-1", "file_path": str(local_storage.path(legacy))})
+        return await server.referenced_keys([current, legacy, orphan])
+
+    assert run_with_db(scenario) == {current, legacy}
+
+
+def test_only_old_unreferenced_sharded_files_are_quarantined(run_with_db, local_storage):
+    referenced = put(local_storage, "referenced.pdf")
+    orphan = put(local_storage, "orphan.pdf")
+    recent = put(local_storage, "recent.pdf", age_seconds=60)
+    # Flat keys predate the fan-out layout and are never collected
+    local_storage.write_bytes("templates/sample.docx", b"sample")
+
+    async def scenario(database):
+        await database.invoices.insert_one({"id": "invoice-1", "file_path": referenced})
+        stats = new_stats()
+        await server.quarantine_orphans(stats)
+        return stats, await database.gc_quarantine.find().to_list(None)
+
+    stats, quarantine = run_with_db(scenario)
+    assert stats["scanned"] == 4
+    assert stats["quarantined"] == 1
+    assert [entry["_id"] for entry in quarantine] == [orphan]
+    assert not local_storage.exists(orphan)
+    assert local_storage.exists(f"{server.QUARANTINE_PREFIX}/{orphan}")
+    assert local_storage.exists(referenced)
+    assert local_storage.exists(recent)
+    assert local_storage.exists("templates/sample.docx")
+
+
+def test_purge_restores_files_referenced_again_and_respects_the_grace_period(run_with_db, local_storage):
+    expired = datetime.utcnow() - timedelta(seconds=server.ORPHAN_GC_GRACE_SECONDS + HOUR)
+    entries = {}
+    for name, quarantined_at in [("restored.pdf", expired), ("deleted.pdf", expired), ("waiting.pdf", datetime.utcnow())]:
+        key = server.sharded_key_for(f"invoices/{name}")
+        quarantine_key = f"{server.QUARANTINE_PREFIX}/{key}"
+        local_storage.write_bytes(quarantine_key, name.encode())
+        entries[name] = {"_id": key, "quarantine_key": quarantine_key, "size": len(name), "quarantined_at": quarantined_at}
+
+    async def scenario(database):
+        await database.gc_quarantine.insert_many(list(entries.values()))
+        # The upload that owns this file finally inserted its record
+        await database.invoices.insert_one({"id": "invoice-1", "file_path": entries["restored.pdf"]["_id"]})
+        stats = new_stats()
+        await server.purge_quarantine(stats)
+        return stats, [entry["_id"] for entry in await database.gc_quarantine.find().to_list(None)]
+
+    stats, remaining = run_with_db(scenario)
+    assert stats["restored"] == 1
+    assert stats["deleted"] == 1
+    assert stats["reclaimed_bytes"] == len("deleted.pdf")
+    assert local_storage.read_bytes(entries["restored.pdf"]["_id"]) == b"restored.pdf"
+    assert not local_storage.exists(entries["restored.pdf"]["quarantine_key"])
+    assert not local_storage.exists(entries["deleted.pdf"]["_id"])
+    assert not local_storage.exists(entries["deleted.pdf"]["quarantine_key"])
+    # Still inside its grace period
+    assert remaining == [entries["waiting.pdf"]["_id"]]
+    assert local_storage.exists(entries["waiting.pdf"]["quarantine_key"])
+
+
+@pytest.mark.parametrize("migration", ["running", "recent"])
+def test_gc_skips_while_a_layout_migration_is_running(run_with_db, local_storage, migration):
+    orphan = put(local_storage, "orphan.pdf")
+
+    async def scenario(database):
+        if migration == "running":
+            assert await server.acquire_startup_lock(server.LAYOUT_MIGRATION_ID)
+        else:
+            await database.migrations.insert_one({
+                "_id": server.LAYOUT_MIGRATION_ID, "status": "complete", "updated_at": datetime.utcnow(),
+            })
+        report = await server.run_orphan_gc()
+        return report, await database.gc_quarantine.count_documents({})
+
+    report, quarantined = run_with_db(scenario)
+    assert report["status"] == "skipped"
+    assert quarantined == 0
+    assert local_storage.exists(orphan)
+
+
+def test_gc_runs_once_a_migration_is_old_enough(run_with_db, local_storage):
+    orphan = put(local_storage, "orphan.pdf")
+
+    async def scenario(database):
+        finished = datetime.utcnow() - timedelta(seconds=server.ORPHAN_GC_MIN_AGE_SECONDS + HOUR)
+        await database.migrations.insert_one({
+            "_id": server.LAYOUT_MIGRATION_ID, "status": "complete", "started_at": finished, "updated_at": finished,
+        })
+        report = await server.run_orphan_gc()
+        return report, await database.maintenance_runs.find_one({"_id": server.ORPHAN_GC_ID})
+
+    report, state = run_with_db(scenario)
+    assert report["status"] == "complete"
+    assert report["quarantined"] == 1
+    assert state["last_run"]["quarantined"] == 1
+    assert not local_storage.exists(orphan)
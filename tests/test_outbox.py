@@ -0,0 +1,166 @@
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+Controller = pytest.importorskip("aiosmtpd.controller").Controller
+
+
+class Sink:
+    # aiosmtpd handler: keeps accepted messages, or answers every DATA with reject_with
+    def __init__(self):
+        self.messages = []
+        self.reject_with = None
+
+    async def handle_DATA(self, smtp, session, envelope):
+        if self.reject_with:
+            return self.reject_with
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = Sink()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    monkeypatch.setattr(server, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(server, "SMTP_PORT", port)
+    monkeypatch.setattr(server, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(server, "SMTP_USERNAME", None)
+    yield handler
+    controller.stop()
+
+
+async def queue_message(database, emails=("billing@supplier.test",), **fields):
+    supplier_id = str(uuid.uuid4())
+    await database.suppliers.insert_one({"id": supplier_id, "name": "Supplier", "emails": list(emails)})
+    message = server.OutboxMessage(
+        kind="invoice.status", supplier_id=supplier_id, entity_id=str(uuid.uuid4()),
+        subject="Invoice paid", body="Your invoice is paid.", **fields
+    )
+    await database.outbox.insert_one(message.dict())
+    return message
+
+
+async def dispatch(database):
+    dispatcher = server.OutboxDispatcher(batch_size=10, rate_per_second=0)
+    dispatcher.pool = server.SMTPPool(1)
+    try:
+        return await dispatcher.dispatch_batch()
+    finally:
+        dispatcher.pool.close()
+
+
+async def make_due(database, message_id):
+    await database.outbox.update_one({"id": message_id}, {"$set": {"next_attempt_at": datetime.utcnow()}})
+
+
+def test_message_is_delivered_once(run_with_db, sink):
+    async def scenario(database):
+        message = await queue_message(database)
+        assert await dispatch(database) == 1
+        assert await dispatch(database) == 0
+        return message, await database.outbox.find_one({"id": message.id})
+
+    message, stored = run_with_db(scenario)
+    assert stored["status"] == "sent"
+    assert stored["attempts"] == 1
+    assert stored["recipients"] == ["billing@supplier.test"]
+    assert len(sink.messages) == 1
+    assert sink.messages[0].rcpt_tos == ["billing@supplier.test"]
+    assert f"Message-ID: <{message.id}@prismfinance>" in sink.messages[0].content.decode()
+
+
+def test_temporary_failure_is_retried_with_backoff(run_with_db, sink):
+    async def scenario(database):
+        message = await queue_message(database)
+        sink.reject_with = "451 4.3.0 Try again later"
+        started = datetime.utcnow()
+        assert await dispatch(database) == 1
+        after_failure = await database.outbox.find_one({"id": message.id})
+        # Not due again until the backoff has passed
+        assert await dispatch(database) == 0
+
+        sink.reject_with = None
+        await make_due(database, message.id)
+        assert await dispatch(database) == 1
+        return started, after_failure, await database.outbox.find_one({"id": message.id})
+
+    started, after_failure, stored = run_with_db(scenario)
+    assert after_failure["status"] == "pending"
+    assert after_failure["attempts"] == 1
+    assert "451" in after_failure["last_error"]
+    assert after_failure["next_attempt_at"] >= started + timedelta(seconds=29)
+    assert stored["status"] == "sent"
+    assert stored["attempts"] == 2
+    assert len(sink.messages) == 1
+
+
+def test_message_is_dead_lettered_after_max_attempts(run_with_db, sink, monkeypatch):
+    monkeypatch.setattr(server, "OUTBOX_MAX_ATTEMPTS", 2)
+    sink.reject_with = "550 5.1.1 Mailbox unavailable"
+
+    async def scenario(database):
+        message = await queue_message(database)
+        await dispatch(database)
+        await make_due(database, message.id)
+        await dispatch(database)
+        await make_due(database, message.id)
+        # Failed messages are never claimed again
+        assert await dispatch(database) == 0
+        return await database.outbox.find_one({"id": message.id})
+
+    stored = run_with_db(scenario)
+    assert stored["status"] == "failed"
+    assert stored["attempts"] == 2
+    assert "550" in stored["last_error"]
+    assert sink.messages == []
+
+
+def test_message_that_keeps_crashing_its_worker_is_dead_lettered(run_with_db, sink, monkeypatch):
+    monkeypatch.setattr(server, "OUTBOX_MAX_ATTEMPTS", 3)
+
+    async def scenario(database):
+        # Claimed three times by workers that died before recording an outcome
+        message = await queue_message(
+            database, status="sending", attempts=3, next_attempt_at=datetime.utcnow() - timedelta(seconds=1)
+        )
+        assert await dispatch(database) == 0
+        return await database.outbox.find_one({"id": message.id})
+
+    stored = run_with_db(scenario)
+    assert stored["status"] == "failed"
+    assert stored["attempts"] == 4
+    assert sink.messages == []
+
+
+def test_supplier_without_email_fails_immediately(run_with_db, sink):
+    async def scenario(database):
+        message = await queue_message(database, emails=())
+        await dispatch(database)
+        return await database.outbox.find_one({"id": message.id})
+
+    stored = run_with_db(scenario)
+    assert stored["status"] == "failed"
+    assert stored["last_error"] == "Supplier has no email address"
+
+
+def test_rate_limit_is_shared_between_workers(run_with_db):
+    async def scenario(database):
+        # Two dispatchers stand in for two worker processes sharing the database
+        workers = [server.OutboxDispatcher(batch_size=10, rate_per_second=10) for _ in range(2)]
+        started = time.monotonic()
+        for i in range(6):
+            await workers[i % 2]._throttle()
+        return time.monotonic() - started
+
+    # Six sends at 10 per second need five intervals, whichever worker sends them
+    assert run_with_db(scenario) >= 0.45
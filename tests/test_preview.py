@@ -0,0 +1,70 @@
+import base64
+
+import pytest
+
+import server
+
+TEMPLATE_HTML = (
+    "<h1>Contract {{supplier_name}}</h1>"
+    "<p>Between <strong>{{supplier_name}}</strong> and us.</p>"
+    "<table><tr><td>Amount</td><td>{{amount}}</td></tr></table>"
+    "<p>Signed in {{city}}.</p>"
+)
+
+
+@pytest.fixture
+def template(monkeypatch):
+    # Stands in for the mammoth conversion of a stored .docx template
+    monkeypatch.setattr(server, "convert_template_to_html", lambda file_path: TEMPLATE_HTML)
+    monkeypatch.setattr(server.storage, "version_token", lambda file_path: "v1")
+    monkeypatch.setattr(server, "preview_cache", server.OrderedDict())
+    server._compile_template.cache_clear()
+    yield "templates/contract.docx"
+    server._compile_template.cache_clear()
+
+
+def test_blocks_are_top_level_elements():
+    html = "<p>One <em>nested</em></p><br/><hr><div><div>Two</div></div>trailing text"
+    assert server.split_html_blocks(html) == [
+        "<p>One <em>nested</em></p>", "<br/>", "<hr>", "<div><div>Two</div></div>", "trailing text",
+    ]
+
+
+def test_blocks_join_back_to_the_document():
+    assert "".join(server.split_html_blocks(TEMPLATE_HTML)) == TEMPLATE_HTML
+    assert len(server.split_html_blocks(TEMPLATE_HTML)) == 4
+    assert server.split_html_blocks("") == []
+
+
+def test_full_preview_renders_and_reports_missing_variables(template):
+    variables = {"supplier_name": "Acme", "amount": 1200}
+    block_count, missing, content, content_hash, blocks = server.render_preview(template, "key", variables, None)
+    html = base64.b64decode(content).decode()
+    assert block_count == 4
+    assert missing == ["city"]
+    assert blocks is None
+    assert "<h1>Contract Acme</h1>" in html
+    assert "<td>1200</td>" in html
+    # Missing variables keep their placeholder
+    assert "{{city}}" in html
+    assert content_hash == server.hash_content(html.encode())
+    assert server.render_preview(template, "key", variables, None)[2] == content
+    assert len(server.preview_cache) == 1
+
+
+def test_incremental_preview_returns_only_changed_blocks(template):
+    variables = {"supplier_name": "Beta", "amount": 10, "city": "Lyon"}
+    block_count, missing, content, content_hash, blocks = server.render_preview(
+        template, "key", variables, ["supplier_name"]
+    )
+    assert block_count == 4
+    assert missing == []
+    assert content is None and content_hash is None
+    assert [block.index for block in blocks] == [0, 1]
+    assert blocks[1].html == "<p>Between <strong>Beta</strong> and us.</p>"
+
+    blocks = server.render_preview(template, "key", variables, ["city", "unused"])[4]
+    assert [(block.index, block.html) for block in blocks] == [(3, "<p>Signed in Lyon.</p>")]
+    assert server.render_preview(template, "key", variables, [])[4] == []
+    # Partial previews are not cached
+    assert len(server.preview_cache) == 0
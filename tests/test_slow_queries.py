@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+
+
+def run_command(recorder, command_name, command, duration_ms, request_id=1):
+    started = SimpleNamespace(
+        command_name=command_name, command=command, database_name="prims", connection_id=("db", 27017), request_id=request_id
+    )
+    recorder.started(started)
+    recorder.succeeded(SimpleNamespace(connection_id=("db", 27017), request_id=request_id, duration_micros=int(duration_ms * 1000)))
+
+
+def find(supplier_id, amount):
+    return {"find": "invoices", "filter": {"supplier_id": supplier_id, "amount": {"$gte": amount}}, "sort": {"due_date": 1}, "lsid": {"id": "session"}}
+
+
+def test_only_commands_over_the_threshold_are_recorded():
+    recorder = server.SlowQueryRecorder(threshold_ms=50, max_entries=10)
+    run_command(recorder, "find", find("supplier-1", 10), 20)
+    assert recorder.snapshot() == []
+
+    run_command(recorder, "find", find("supplier-1", 10), 80)
+    [entry] = recorder.snapshot()
+    assert entry["namespace"] == "prims.invoices"
+    assert entry["count"] == 1
+    assert entry["max_ms"] == 80
+
+
+def test_same_shape_is_grouped_and_values_are_redacted():
+    recorder = server.SlowQueryRecorder(threshold_ms=0, max_entries=10)
+    run_command(recorder, "find", find("supplier-1", 10), 60, request_id=1)
+    run_command(recorder, "find", find("supplier-2", 9000), 140, request_id=2)
+
+    [entry] = recorder.snapshot()
+    assert entry["shape"] == {"filter": {"supplier_id": "?", "amount": {"$gte": "?"}}, "sort": {"due_date": 1}}
+    assert entry["count"] == 2
+    assert entry["total_ms"] == 200
+    assert entry["max_ms"] == 140
+    assert entry["last_ms"] == 140
+    assert "supplier-2" not in repr(entry)
+
+
+def test_unwatched_commands_and_unknown_replies_are_ignored():
+    recorder = server.SlowQueryRecorder(threshold_ms=0, max_entries=10)
+    run_command(recorder, "insert", {"insert": "invoices", "documents": [{"id": "x"}]}, 500)
+    # A reply whose start was never seen
+    recorder.succeeded(SimpleNamespace(connection_id=("db", 27017), request_id=99, duration_micros=900000))
+    assert recorder.snapshot() == []
+
+
+def test_oldest_shapes_are_evicted_past_the_limit():
+    recorder = server.SlowQueryRecorder(threshold_ms=0, max_entries=2)
+    for request_id, collection in enumerate(["invoices", "contracts", "suppliers"]):
+        run_command(recorder, "count", {"count": collection, "query": {"status": "x"}}, 10, request_id)
+    assert [entry["namespace"] for entry in recorder.snapshot()] == ["prims.contracts", "prims.suppliers"]
+
+
+def test_explain_runs_once_per_shape_and_flags_collection_scans(monkeypatch):
+    explained = []
+
+    async def explainer(key, database_name, command):
+        explained.append((database_name, command))
+        recorder.set_plan(key, ["FETCH", "COLLSCAN"])
+
+    recorder = server.SlowQueryRecorder(threshold_ms=0, max_entries=10, explain=True)
+    monkeypatch.setattr(server, "slow_query_recorder", recorder)
+
+    async def main():
+        recorder.attach(asyncio.get_running_loop(), explainer)
+        run_command(recorder, "find", find("supplier-1", 10), 60, request_id=1)
+        run_command(recorder, "find", find("supplier-2", 20), 60, request_id=2)
+        run_command(recorder, "count", {"count": "contracts", "query": {"status": "x"}}, 60, request_id=3)
+        # Let the explains scheduled from the monitoring callbacks run
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return (
+            await server.get_slow_queries(collscan_only=True, current_user=ADMIN),
+            await server.get_slow_queries(current_user=ADMIN),
+        )
+
+    collscans, everything = asyncio.run(main())
+    assert len(explained) == 2
+    database_name, command = explained[0]
+    assert database_name == "prims"
+    # Session fields are not replayed into the explain
+    assert "lsid" not in command
+    assert {entry.namespace for entry in collscans} == {"prims.invoices", "prims.contracts"}
+    assert {entry.collscan for entry in everything} == {True}
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+
+
+def as_worker(monkeypatch, worker_id):
+    monkeypatch.setattr(server, "WORKER_ID", worker_id)
+
+
+def test_only_one_worker_holds_the_lock_until_its_lease_expires(run_with_db, monkeypatch):
+    async def scenario(database):
+        as_worker(monkeypatch, "host:1")
+        first = await server.acquire_startup_lock("task")
+        as_worker(monkeypatch, "host:2")
+        second = await server.acquire_startup_lock("task")
+        # Neither renewing nor releasing touches a lock owned by another worker
+        await server.release_startup_lock("task")
+        held_after_foreign_release = await server.lock_held("task")
+
+        await database.startup_locks.update_one({"_id": "task"}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+        expired_held = await server.lock_held("task")
+        takeover = await server.acquire_startup_lock("task")
+        as_worker(monkeypatch, "host:1")
+        stale_retry = await server.acquire_startup_lock("task")
+        await server.renew_lock("task")
+        lock = await database.startup_locks.find_one({"_id": "task"})
+        return first, second, held_after_foreign_release, expired_held, takeover, stale_retry, lock
+
+    first, second, held_after_foreign_release, expired_held, takeover, stale_retry, lock = run_with_db(scenario)
+    assert (first, second) == (True, False)
+    assert held_after_foreign_release is True
+    assert expired_held is False
+    # A crashed owner's lease can be taken over, after which the old owner is refused
+    assert (takeover, stale_retry) == (True, False)
+    assert lock["owner"] == "host:2"
+
+
+def test_concurrent_startups_seed_one_admin(run_with_db, monkeypatch):
+    monkeypatch.setattr(server, "get_password_hash", lambda password: f"hashed:{password}")
+
+    async def scenario(database):
+        await asyncio.gather(*(server.seed_admin_user() for _ in range(4)))
+        # A later boot finds the admin and leaves it alone
+        await server.seed_admin_user()
+        return await database.users.count_documents({"is_admin": True}), await database.startup_locks.count_documents({})
+
+    admins, locks = run_with_db(scenario)
+    assert admins == 1
+    assert locks == 0
+
+
+def test_migration_is_refused_while_another_worker_runs_it(run_with_db, monkeypatch):
+    async def scenario(database):
+        as_worker(monkeypatch, "host:1")
+        await server.acquire_startup_lock(server.LAYOUT_MIGRATION_ID)
+        as_worker(monkeypatch, "host:2")
+        with pytest.raises(server.HTTPException) as refused:
+            await server.start_upload_layout_migration(current_user=ADMIN)
+        return refused.value.status_code, await database.migrations.count_documents({})
+
+    status_code, migrations = run_with_db(scenario)
+    assert status_code == 409
+    assert migrations == 0
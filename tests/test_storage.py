@@ -0,0 +1,141 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import server
+
+try:
+    import moto
+except ImportError:
+    moto = None
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture(params=["local", "s3"])
+def storage(request, tmp_path, monkeypatch):
+    if request.param == "local":
+        yield server.LocalStorage(tmp_path)
+        return
+    if moto is None:
+        pytest.skip("moto is not installed")
+    # moto stands in for S3, the same way a local MinIO would through S3_ENDPOINT_URL
+    for name, value in [("AWS_ACCESS_KEY_ID", "test"), ("AWS_SECRET_ACCESS_KEY", "test"), ("AWS_DEFAULT_REGION", "us-east-1")]:
+        monkeypatch.setenv(name, value)
+    with moto.mock_aws():
+        s3 = server.S3Storage("prism-test", "uploads/", region="us-east-1")
+        s3.client.create_bucket(Bucket="prism-test")
+        yield s3
+
+
+async def chunked(data: bytes, size: int = 64 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def download(storage, key: str, headers=None):
+    app = FastAPI()
+
+    @app.get("/download")
+    async def route(request: Request):
+        return await storage.download_response(key, "contract.html", "text/html", request)
+
+    return TestClient(app).get("/download", headers=headers or {}, follow_redirects=False)
+
+
+def test_write_read_exists_delete(storage):
+    key = "contracts/ab/cd/contract.html"
+    assert not storage.exists(key)
+
+    storage.write_bytes(key, b"<p>signed</p>")
+    assert storage.exists(key)
+    assert storage.read_bytes(key) == b"<p>signed</p>"
+    assert storage.version_token(key)
+
+    storage.delete(key)
+    assert not storage.exists(key)
+    # Deleting a missing key is not an error
+    storage.delete(key)
+
+
+def test_save_and_copy(storage):
+    storage.save("templates/source.docx", io.BytesIO(b"docx bytes"))
+    storage.copy("templates/source.docx", "templates/12/34/source.docx")
+    assert storage.read_bytes("templates/12/34/source.docx") == b"docx bytes"
+    keys = {key for key, _, _ in storage.iter_files("templates")}
+    assert keys == {"templates/source.docx", "templates/12/34/source.docx"}
+
+
+def test_multipart_upload_composes_parts(storage):
+    key = "invoices/upload.pdf"
+    first = bytes(range(256)) * (PART_SIZE // 256)
+    last = b"tail of the invoice"
+    token = storage.begin_upload(key)
+
+    async def upload():
+        parts = []
+        for number, (offset, data) in enumerate([(0, first), (len(first), last)], start=1):
+            etag = await storage.write_part(key, token, number, offset, chunked(data))
+            parts.append({"offset": offset, "size": len(data), "etag": etag})
+        return parts
+
+    parts = asyncio.run(upload())
+    storage.complete_upload(key, token, parts)
+    assert storage.read_bytes(key) == first + last
+
+
+def test_retried_completion_is_idempotent(storage, monkeypatch):
+    # A finalize retried after the first completion succeeded must not fail
+    key = "invoices/retried.pdf"
+    token = storage.begin_upload(key)
+    etag = asyncio.run(storage.write_part(key, token, 1, 0, chunked(b"whole invoice")))
+    parts = [{"offset": 0, "size": 13, "etag": etag}]
+    storage.complete_upload(key, token, parts)
+    if isinstance(storage, server.S3Storage):
+        # S3 forgets a completed upload id; moto keeps accepting it
+        def no_such_upload(**kwargs):
+            error = {"Error": {"Code": "NoSuchUpload", "Message": "The specified upload does not exist"}}
+            raise storage.client_error(error, "CompleteMultipartUpload")
+        monkeypatch.setattr(storage.client, "complete_multipart_upload", no_such_upload)
+    storage.complete_upload(key, token, parts)
+    assert storage.read_bytes(key) == b"whole invoice"
+
+
+def test_abort_upload_leaves_nothing(storage):
+    key = "invoices/aborted.pdf"
+    token = storage.begin_upload(key)
+    asyncio.run(storage.write_part(key, token, 1, 0, chunked(b"partial")))
+    storage.abort_upload(key, token)
+    assert not storage.exists(key)
+
+
+def test_download_response_serves_content(storage, monkeypatch):
+    monkeypatch.setattr(server, "S3_PRESIGNED_DOWNLOADS", False)
+    storage.write_bytes("contracts/download.html", b"0123456789")
+
+    response = download(storage, "contracts/download.html")
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert 'filename="contract.html"' in response.headers["content-disposition"]
+
+    if isinstance(storage, server.LocalStorage):
+        # FileResponse in the pinned Starlette ignores Range
+        return
+    # Range is passed through to S3 so clients can resume
+    partial = download(storage, "contracts/download.html", {"Range": "bytes=4-"})
+    assert partial.status_code == 206
+    assert partial.content == b"456789"
+
+
+def test_presigned_download_redirects(storage, monkeypatch):
+    if isinstance(storage, server.LocalStorage):
+        pytest.skip("Local files are always served directly")
+    monkeypatch.setattr(server, "S3_PRESIGNED_DOWNLOADS", True)
+    storage.write_bytes("contracts/presigned.html", b"signed")
+
+    response = download(storage, "contracts/presigned.html")
+    assert response.status_code == 307
+    assert "uploads/contracts/presigned.html" in response.headers["location"]
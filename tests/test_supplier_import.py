@@ -0,0 +1,124 @@
+import io
+import uuid
+
+import pytest
+from fastapi import UploadFile
+
+import server
+
+HEADER = "Name;SIRET;VAT Number;IBAN;Emails;VAT Rates;Contract Variables"
+
+
+def csv_file(*rows):
+    return io.BytesIO("\n".join([HEADER, *rows]).encode())
+
+
+def test_row_parsing_splits_lists_and_skips_blanks():
+    row = {
+        "name": " Acme ", "siret": "123", "emails": "a@acme.test; b@acme.test,", "vat_rates": "20;5.5",
+        "contract_variables": '{"region": "north"}', "city": "", "notes": None, "bic": float("nan"),
+    }
+    assert server.parse_supplier_row(row) == {
+        "name": "Acme", "siret": "123", "emails": ["a@acme.test", "b@acme.test"], "vat_rates": [20.0, 5.5],
+        "contract_variables": {"region": "north"},
+    }
+
+
+def test_csv_chunks_normalize_headers():
+    rows = [f"Supplier {i};{i:014d};FR{i};FR76{i};s{i}@test;20;" for i in range(5)]
+    chunks = list(server.iter_supplier_import_chunks(csv_file(*rows), "suppliers.csv", 2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0][0]["vat_number"] == "FR0"
+    assert chunks[2][0]["siret"] == "00000000000004"
+
+
+def test_xlsx_chunks_normalize_headers():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Name", "SIRET", "Emails"])
+    workbook.active.append(["Acme", "12345678900011", "a@acme.test"])
+    data = io.BytesIO()
+    workbook.save(data)
+    data.seek(0)
+
+    chunks = list(server.iter_supplier_import_chunks(data, "suppliers.xlsx", 10))
+    assert chunks == [[{"name": "Acme", "siret": "12345678900011", "emails": "a@acme.test"}]]
+
+
+def test_numeric_spreadsheet_codes_keep_their_digits():
+    row = {"name": "Acme", "siret": 1234567890012.0, "postal_code": 1000, "insee_code": 75056.0, "vat_rates": 20.0}
+    assert server.parse_supplier_row(row) == {
+        "name": "Acme", "siret": "01234567890012", "postal_code": "01000", "insee_code": "75056", "vat_rates": [20.0],
+    }
+
+
+def test_xlsx_numeric_siret_is_read_as_text():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Name", "SIRET", "Postal Code"])
+    workbook.active.append(["Acme", 12345678900012.0, 6000])
+    data = io.BytesIO()
+    workbook.save(data)
+    data.seek(0)
+
+    [[row]] = server.iter_supplier_import_chunks(data, "suppliers.xlsx", 10)
+    assert server.parse_supplier_row(row) == {"name": "Acme", "siret": "12345678900012", "postal_code": "06000"}
+
+
+def test_import_validates_and_dedupes(run_with_db, monkeypatch):
+    monkeypatch.setattr(server, "IMPORT_CHUNK_SIZE", 2)
+    admin = server.User(email="admin@test.example", name="Admin", is_admin=True)
+    upload = UploadFile(csv_file(
+        "Acme;11111111100011;FR1;FR761;a@acme.test;20;",
+        "Missing IBAN;22222222200022;FR2;;b@test;20;",
+        "Acme again;11111111100011;FR1;FR761;a@acme.test;20;",
+        "Existing;33333333300033;FR3;FR763;c@test;20;",
+        "Bad rates;44444444400044;FR4;FR764;d@test;twenty;",
+        "Beta;55555555500055;FR5;FR765;e@test;5.5;{\"region\": \"south\"}",
+    ), filename="suppliers.csv")
+
+    async def scenario(database):
+        await database.suppliers.insert_one({"id": str(uuid.uuid4()), "name": "Existing", "siret": "33333333300033"})
+        report = await server.import_suppliers(upload, admin)
+        stored = await database.suppliers.find({}, {"_id": 0, "name": 1, "siret": 1, "vat_rates": 1}).to_list(10)
+        return report, stored
+
+    report, stored = run_with_db(scenario)
+    assert report.total_rows == 6
+    assert report.inserted == 2
+    # One duplicate within the file, one already in the database
+    assert report.duplicates == 2
+    assert report.failed == 2
+    # Spreadsheet lines, the header being line 1
+    assert [(error.row, error.siret) for error in report.errors] == [(3, "22222222200022"), (6, "44444444400044")]
+    assert any("iban" in message for message in report.errors[0].errors)
+    assert {supplier["name"] for supplier in stored} == {"Existing", "Acme", "Beta"}
+    assert next(supplier for supplier in stored if supplier["name"] == "Beta")["vat_rates"] == [5.5]
+
+
+def test_siret_inserted_concurrently_counts_as_duplicate(run_with_db, monkeypatch):
+    admin = server.User(email="admin@test.example", name="Admin", is_admin=True)
+    upload = UploadFile(csv_file(
+        "Acme;11111111100011;FR1;FR761;a@acme.test;20;",
+        "Beta;55555555500055;FR5;FR765;e@test;20;",
+    ), filename="suppliers.csv")
+
+    async def scenario(database):
+        for keys, options in server.INDEXES["suppliers"]:
+            await database.suppliers.create_index(keys, **options)
+        # Another import inserts Acme between the dedupe query and this insert
+        insert_many = server.supplier_repo.insert_many
+
+        async def insert_after_race(documents, **kwargs):
+            await database.suppliers.insert_one({"id": str(uuid.uuid4()), "name": "Acme", "siret": "11111111100011"})
+            return await insert_many(documents, **kwargs)
+
+        monkeypatch.setattr(server.supplier_repo, "insert_many", insert_after_race)
+        report = await server.import_suppliers(upload, admin)
+        return report, await database.suppliers.count_documents({"siret": "11111111100011"})
+
+    report, acme_count = run_with_db(scenario)
+    assert report.inserted == 1
+    assert report.duplicates == 1
+    assert report.failed == 0
+    assert acme_count == 1
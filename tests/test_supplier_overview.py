@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+SUPPLIER_USER = server.User(email="billing@beta.test", name="Beta", supplier_id="supplier-2")
+
+
+async def seed(database):
+    await database.suppliers.insert_many([
+        {"id": "supplier-1", "name": "Acme", "siret": "12345678901234"},
+        {"id": "supplier-2", "name": "Beta", "siret": "98765432109876"},
+        {"id": "supplier-3", "name": "Gamma", "siret": "11111111111111"},
+    ])
+    await database.general_conditions.insert_many([
+        {"id": "gc-old", "version": "1", "content": "", "is_active": False},
+        {"id": "gc-current", "version": "2", "content": "", "is_active": True},
+    ])
+    await database.gc_acceptances.insert_many([
+        {"id": "a-1", "supplier_id": "supplier-1", "gc_id": "gc-current"},
+        # Accepting a superseded version does not count
+        {"id": "a-2", "supplier_id": "supplier-2", "gc_id": "gc-old"},
+    ])
+    await database.contracts.insert_many([
+        {"id": "c-1", "supplier_id": "supplier-1", "template_id": "t", "status": "signed"},
+        {"id": "c-2", "supplier_id": "supplier-1", "template_id": "t", "status": "draft"},
+        {"id": "c-3", "supplier_id": "supplier-2", "template_id": "t", "status": "signed"},
+    ])
+    await database.invoices.insert_many([
+        {"id": "i-1", "supplier_id": "supplier-2", "status": "pending", "amount": 100.0},
+        {"id": "i-2", "supplier_id": "supplier-2", "status": "pending", "amount": 50.5},
+        {"id": "i-3", "supplier_id": "supplier-3", "status": "paid", "amount": 10.0},
+    ])
+
+
+def overview(run_with_db, user=ADMIN, **params):
+    async def scenario(database):
+        await seed(database)
+        return await server.get_suppliers_overview(current_user=user, **params)
+
+    return run_with_db(scenario)
+
+
+def test_overview_counts_and_flags_per_supplier(run_with_db):
+    page = overview(run_with_db)
+    assert page.total == 3
+    rows = {item.supplier_id: item for item in page.items}
+    assert (rows["supplier-1"].gc_accepted, rows["supplier-2"].gc_accepted, rows["supplier-3"].gc_accepted) == (True, False, False)
+    assert (rows["supplier-1"].total_contracts, rows["supplier-1"].unsigned_contracts) == (2, 1)
+    assert rows["supplier-1"].has_unsigned_contracts is True
+    assert rows["supplier-2"].has_unsigned_contracts is False
+    assert (rows["supplier-2"].pending_invoices, rows["supplier-2"].pending_amount) == (2, 150.5)
+    assert rows["supplier-2"].has_pending_invoices is True
+    # Paid invoices and missing contracts count as zero
+    assert (rows["supplier-3"].pending_invoices, rows["supplier-3"].total_contracts) == (0, 0)
+
+
+def test_overview_sorts_by_a_flag_and_pages(run_with_db):
+    page = overview(run_with_db, sort_by="has_pending_invoices", sort_order="desc", skip=0, limit=2)
+    assert page.total == 3
+    # Ties keep a stable order by supplier id
+    assert [item.supplier_id for item in page.items] == ["supplier-2", "supplier-1"]
+
+    rest = overview(run_with_db, sort_by="has_pending_invoices", sort_order="desc", skip=2, limit=2)
+    assert [item.supplier_id for item in rest.items] == ["supplier-3"]
+
+
+def test_supplier_user_sees_only_its_own_row(run_with_db):
+    page = overview(run_with_db, user=SUPPLIER_USER)
+    assert page.total == 1
+    assert [item.supplier_id for item in page.items] == ["supplier-2"]
+
+
+@pytest.mark.parametrize("params", [{"sort_by": "iban"}, {"sort_order": "up"}])
+def test_overview_rejects_unknown_sorting(params):
+    with pytest.raises(server.HTTPException) as error:
+        asyncio.run(server.get_suppliers_overview(current_user=ADMIN, **params))
+    assert error.value.status_code == 400
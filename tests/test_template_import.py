@@ -0,0 +1,151 @@
+import asyncio
+import io
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import UploadFile
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def docx(text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as document:
+        document.writestr("[Content_Types].xml", CONTENT_TYPES)
+        document.writestr("_rels/.rels", RELS)
+        document.writestr("word/document.xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>'
+        ))
+    return buffer.getvalue()
+
+
+def archive(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        for name, data in files.items():
+            zip_file.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    storage = server.LocalStorage(tmp_path)
+    monkeypatch.setattr(server, "storage", storage)
+    monkeypatch.setattr(server, "UPLOAD_DIR", tmp_path)
+    return storage
+
+
+def test_archive_reading_skips_other_files_and_enforces_limits(monkeypatch):
+    monkeypatch.setattr(server, "TEMPLATE_IMPORT_MAX_FILES", 2)
+    monkeypatch.setattr(server, "TEMPLATE_IMPORT_MAX_FILE_BYTES", 100)
+    entries, skipped, errors = server.read_template_archive(archive({
+        "library/nda.docx": b"a" * 10,
+        "library/readme.txt": b"notes",
+        "__MACOSX/library/._nda.docx": b"x",
+        "library/.hidden.docx": b"x",
+        "library/huge.docx": b"b" * 101,
+        "library/framework.DOCX": b"c" * 10,
+        "library/third.docx": b"d" * 10,
+    }))
+    assert [(entry_name, filename) for entry_name, filename, _ in entries] == [
+        ("library/nda.docx", "nda.docx"), ("library/framework.DOCX", "framework.DOCX")
+    ]
+    assert skipped == ["library/readme.txt"]
+    assert {error.filename: error.error for error in errors} == {
+        "library/huge.docx": "File is too large",
+        "library/third.docx": "More than 2 templates in the archive",
+    }
+
+
+def test_archive_total_size_is_bounded(monkeypatch):
+    monkeypatch.setattr(server, "TEMPLATE_IMPORT_MAX_TOTAL_BYTES", 25)
+    entries, _, errors = server.read_template_archive(archive({"a.docx": b"a" * 10, "b.docx": b"b" * 10, "c.docx": b"c" * 10}))
+    assert [filename for _, filename, _ in entries] == ["a.docx", "b.docx"]
+    assert [error.filename for error in errors] == ["c.docx"]
+
+
+def test_invalid_archive_is_rejected():
+    with pytest.raises(server.HTTPException) as error:
+        server.read_template_archive(io.BytesIO(b"not a zip"))
+    assert error.value.status_code == 400
+
+
+def test_broken_pool_is_replaced_and_the_conversion_retried(monkeypatch):
+    class Pool:
+        def __init__(self, broken):
+            self.broken = broken
+            self.shut_down = False
+
+        def submit(self, func, *args):
+            if self.broken:
+                raise BrokenProcessPool("worker died")
+            future = asyncio.get_event_loop().create_future()
+            future.set_result(("converted", args))
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    broken = Pool(broken=True)
+    monkeypatch.setattr(server, "template_import_pool", broken)
+    monkeypatch.setattr(server, "ProcessPoolExecutor", lambda **options: Pool(broken=False))
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        monkeypatch.setattr(loop, "run_in_executor", lambda pool, func, *args: pool.submit(func, *args))
+        return await server.convert_in_pool(b"docx")
+
+    assert asyncio.run(main()) == ("converted", (b"docx",))
+    assert broken.shut_down
+    assert server.template_import_pool is not broken
+
+
+def test_import_converts_in_processes_and_reports_failures(run_with_db, local_storage, monkeypatch):
+    monkeypatch.setattr(server, "TEMPLATE_IMPORT_PROCESSES", 2)
+    monkeypatch.setattr(server, "template_import_pool", None)
+    upload = UploadFile(archive({
+        "nda.docx": docx("Between {{supplier_name}} and us"),
+        "framework.docx": docx("Signed on {{date}} by {{signatory}}"),
+        "broken.docx": b"not a docx",
+        "notes.txt": b"ignored",
+    }), filename="templates.zip")
+
+    async def scenario(database):
+        try:
+            report = await server.import_contract_templates(file=upload, current_user=ADMIN)
+        finally:
+            server.template_import_pool.shutdown(wait=True)
+        stored = await database.contract_templates.find({}, {"_id": 0}).to_list(None)
+        versions = await database.contract_template_versions.count_documents({})
+        return report, stored, versions
+
+    report, stored, versions = run_with_db(scenario)
+    assert (report.total_files, report.imported, report.failed) == (3, 2, 1)
+    assert report.skipped == ["notes.txt"]
+    assert report.errors[0].filename == "broken.docx"
+    variables = {template["name"]: sorted(template["variables"]) for template in stored}
+    assert variables == {"nda": ["supplier_name"], "framework": ["date", "signatory"]}
+    assert versions == 2
+    # Every stored record points at a file that was written
+    assert all(local_storage.exists(template["file_path"]) for template in stored)
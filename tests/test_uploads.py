@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.requests import Request
+
+import server
+
+ADMIN = server.User(email="admin@test.example", name="Admin", is_admin=True)
+DATA = b"%PDF-1.4 invoice body"
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    storage = server.LocalStorage(tmp_path)
+    monkeypatch.setattr(server, "storage", storage)
+    return storage
+
+
+def chunk_request(data, headers=(), released=None):
+    # A PUT whose body is only delivered once `released` is set, when given
+    async def receive():
+        if released is not None:
+            await released.wait()
+        return {"type": "http.request", "body": data, "more_body": False}
+
+    headers = [(b"content-length", str(len(data)).encode()), *headers]
+    return Request({"type": "http", "method": "PUT", "path": "/", "headers": headers}, receive)
+
+
+def finalize_request(upload_hash=None):
+    headers = [(b"x-upload-hash", upload_hash.encode())] if upload_hash else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers})
+
+
+def upload_hash(*chunks):
+    digests = b"".join(hashlib.sha256(chunk).digest() for chunk in chunks)
+    return f"{hashlib.sha256(digests).hexdigest()}-{len(chunks)}"
+
+
+async def open_upload(database, total_size=len(DATA)):
+    await database.suppliers.insert_one({"id": "supplier-1", "name": "Acme"})
+    return await server.create_upload_session(server.UploadSessionCreate(
+        kind="invoice", filename="f-1.pdf", total_size=total_size,
+        supplier_id="supplier-1", amount=120.0, due_date="2024-03-01",
+    ), ADMIN)
+
+
+async def put_chunk(session, offset, data, headers=()):
+    return await server.upload_chunk(session.id, offset, chunk_request(data, headers), ADMIN)
+
+
+def test_chunks_at_the_wrong_offset_are_refused(run_with_db, local_storage):
+    async def scenario(database):
+        session = await open_upload(database)
+        await put_chunk(session, 0, DATA[:8])
+        with pytest.raises(server.HTTPException) as replayed:
+            await put_chunk(session, 0, DATA[:8])
+        with pytest.raises(server.HTTPException) as skipped:
+            await put_chunk(session, 12, DATA[12:])
+        return replayed.value, skipped.value, await server.get_upload_status(session.id, ADMIN)
+
+    replayed, skipped, status = run_with_db(scenario)
+    for error in (replayed, skipped):
+        assert error.status_code == 409
+        # Tells the client where to resume
+        assert error.headers["Upload-Offset"] == "8"
+    assert status.offset == 8
+    assert len(status.parts) == 1
+
+
+def test_concurrent_chunk_is_rejected_by_the_chunk_lock(run_with_db, local_storage):
+    async def scenario(database):
+        session = await open_upload(database)
+        released = asyncio.Event()
+        first = asyncio.ensure_future(server.upload_chunk(session.id, 0, chunk_request(DATA, released=released), ADMIN))
+        # Wait until the first chunk holds the lock and is streaming its body
+        while (await database.upload_sessions.find_one({"id": session.id}))["lock_until"] < datetime.utcnow():
+            await asyncio.sleep(0.01)
+        with pytest.raises(server.HTTPException) as rejected:
+            await put_chunk(session, 0, DATA)
+        released.set()
+        return rejected.value, await first
+
+    rejected, written = run_with_db(scenario)
+    assert rejected.status_code == 409
+    assert rejected.detail == "Another chunk is being written to this upload"
+    assert written.offset == len(DATA)
+    assert len(written.parts) == 1
+
+
+def test_chunk_checksum_mismatch_leaves_the_offset_for_a_retry(run_with_db, local_storage):
+    async def scenario(database):
+        session = await open_upload(database)
+        with pytest.raises(server.HTTPException) as rejected:
+            await put_chunk(session, 0, DATA, [(b"x-chunk-sha256", b"0" * 64)])
+        retried = await put_chunk(session, 0, DATA, [(b"x-chunk-sha256", hashlib.sha256(DATA).hexdigest().encode())])
+        return rejected.value, retried
+
+    rejected, retried = run_with_db(scenario)
+    assert rejected.status_code == 400
+    assert retried.offset == len(DATA)
+
+
+def test_finalize_checks_the_upload_hash(run_with_db, local_storage):
+    async def scenario(database):
+        session = await open_upload(database)
+        await put_chunk(session, 0, DATA[:8])
+        await put_chunk(session, 8, DATA[8:])
+        with pytest.raises(server.HTTPException) as mismatch:
+            await server.finalize_upload(session.id, finalize_request(upload_hash(DATA)), ADMIN)
+        after_mismatch = await server.get_upload_status(session.id, ADMIN)
+        invoice = await server.finalize_upload(session.id, finalize_request(upload_hash(DATA[:8], DATA[8:])), ADMIN)
+        return mismatch.value, after_mismatch, invoice, await server.get_upload_status(session.id, ADMIN)
+
+    mismatch, after_mismatch, invoice, finalized = run_with_db(scenario)
+    assert mismatch.status_code == 400
+    assert after_mismatch.status == "open"
+    assert local_storage.read_bytes(invoice.file_path) == DATA
+    assert finalized.status == "finalized"
+    assert finalized.upload_hash == upload_hash(DATA[:8], DATA[8:])
+
+
+def test_finalize_lease_is_reclaimed_after_it_expires(run_with_db, local_storage):
+    async def scenario(database):
+        session = await open_upload(database)
+        await put_chunk(session, 0, DATA)
+        # Another worker is finalizing and its lease is still running
+        await database.upload_sessions.update_one({"id": session.id}, {"$set": {
+            "status": "finalizing", "lock_until": datetime.utcnow() + timedelta(minutes=5),
+        }})
+        with pytest.raises(server.HTTPException) as busy:
+            await server.finalize_upload(session.id, finalize_request(), ADMIN)
+        # That worker died: once the lease has run out the finalize can be retried
+        await database.upload_sessions.update_one({"id": session.id}, {"$set": {
+            "lock_until": datetime.utcnow() - timedelta(seconds=1),
+        }})
+        invoice = await server.finalize_upload(session.id, finalize_request(), ADMIN)
+        return busy.value, invoice, await database.invoices.count_documents({})
+
+    busy, invoice, invoice_count = run_with_db(scenario)
+    assert busy.status_code == 409
+    assert invoice.supplier_id == "supplier-1"
+    assert invoice_count == 1
+
+
+def test_sweep_removes_expired_sessions_and_their_parts(run_with_db, local_storage):
+    async def scenario(database):
+        expired = await open_upload(database)
+        await put_chunk(expired, 0, DATA[:8])
+        active = await server.create_upload_session(server.UploadSessionCreate(
+            kind="invoice", filename="f-2.pdf", total_size=len(DATA),
+            supplier_id="supplier-1", amount=10.0, due_date="2024-03-01",
+        ), ADMIN)
+        past = datetime.utcnow() - timedelta(seconds=1)
+        await database.upload_sessions.update_one({"id": expired.id}, {"$set": {"expires_at": past}})
+        # Stuck in finalizing with an expired lease, but not expired itself
+        await database.upload_sessions.update_one({"id": active.id}, {"$set": {"status": "finalizing", "lock_until": past}})
+        paths = {doc["id"]: doc["file_path"] for doc in await database.upload_sessions.find().to_list(None)}
+        await server.sweep_expired_uploads()
+        remaining = {doc["id"]: doc["status"] for doc in await database.upload_sessions.find().to_list(None)}
+        return paths[expired.id], paths[active.id], active.id, remaining
+
+    expired_path, active_path, active_id, remaining = run_with_db(scenario)
+    assert not local_storage.exists(expired_path)
+    assert local_storage.exists(active_path)
+    assert remaining == {active_id: "open"}